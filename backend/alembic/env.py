@@ -31,6 +31,13 @@ target_metadata = SQLModel.metadata
 config.set_main_option("sqlalchemy.url", app_settings.database_url)
 
 
+def include_name(name, type_, parent_names) -> bool:
+    """Skip FTS5 virtual and shadow tables, they are managed with raw DDL."""
+    if type_ == "table" and name and "_fts" in name:
+        return False
+    return True
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -49,6 +56,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_name=include_name,
     )
 
     with context.begin_transaction():
@@ -69,7 +77,11 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_name=include_name,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
@@ -0,0 +1,37 @@
+"""Media full-text search
+
+Revision ID: 4b8e2d9c6a71
+Revises: 1ce177ccafe4
+Create Date: 2026-10-18 17:55:21.503116
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+from core.base.database.utils.fts import (
+    get_fts_create_ddl,
+    get_fts_drop_ddl,
+    get_fts_rebuild_ddl,
+)
+
+# revision identifiers, used by Alembic.
+revision: str = "4b8e2d9c6a71"
+down_revision: Union[str, None] = "1ce177ccafe4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create FTS5 tables with sync triggers and index the existing media
+    for table_name in ("movie", "series"):
+        for statement in get_fts_create_ddl(table_name):
+            op.execute(statement)
+        op.execute(get_fts_rebuild_ddl(table_name))
+
+
+def downgrade() -> None:
+    for table_name in ("series", "movie"):
+        for statement in get_fts_drop_ddl(table_name):
+            op.execute(statement)
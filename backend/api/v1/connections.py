@@ -8,6 +8,7 @@ from core.base.database.models.connection import (
     ConnectionRead,
     ConnectionUpdate,
 )
+from core.base.database.utils.executor import run_db
 from core.tasks.api_refresh import api_refresh_by_id_job
 
 connections_router = APIRouter(prefix="/connections", tags=["Connections"])
@@ -16,7 +17,7 @@ connections_router = APIRouter(prefix="/connections", tags=["Connections"])
 @connections_router.get("/")
 async def get_connections() -> list[ConnectionRead]:
     db_handler = ConnectionDatabaseManager()
-    connections = db_handler.read_all()
+    connections = await run_db(db_handler.read_all)
     return connections
 
 
@@ -58,7 +59,7 @@ async def create_connection(connection: ConnectionCreate) -> str:
 async def get_connection(connection_id: int) -> ConnectionRead:
     db_handler = ConnectionDatabaseManager()
     try:
-        connection = db_handler.read(connection_id)
+        connection = await run_db(db_handler.read, connection_id)
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     return connection
@@ -104,7 +105,7 @@ async def update_connection(connection_id: int, connection: ConnectionUpdate) ->
 async def delete_connection(connection_id: int) -> str:
     db_handler = ConnectionDatabaseManager()
     try:
-        db_handler.delete(connection_id)
+        await run_db(db_handler.delete, connection_id)
     except Exception as e:
         await websockets.ws_manager.broadcast("Failed to delete Connection!", "Error")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -123,4 +124,4 @@ async def delete_connection(connection_id: int) -> str:
     },
 )
 async def refresh_connection(connection_id: int) -> str:
-    return api_refresh_by_id_job(connection_id)
+    return await run_db(api_refresh_by_id_job, connection_id)
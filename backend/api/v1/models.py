@@ -11,8 +11,8 @@ class SearchMedia(BaseModel):
     id: int
     title: str
     year: int
-    youtube_trailer_id: str
-    imdb_id: str
+    youtube_trailer_id: str | None
+    imdb_id: str | None
     txdb_id: str
     is_movie: bool
     poster_path: str | None
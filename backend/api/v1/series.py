@@ -1,9 +1,10 @@
 import logging
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Response, status
 
 from api.v1 import websockets
 from api.v1.models import ErrorResponse
+from core.base.database.utils.executor import run_db
 from core.files_handler import FilesHandler, FolderInfo
 from core.sonarr.database_manager import SeriesDatabaseManager
 from core.sonarr.models import SeriesRead, SeriesUpdate
@@ -13,10 +14,29 @@ from core.tasks.download_trailers import download_trailer_by_id
 series_router = APIRouter(prefix="/series", tags=["Series"])
 
 
-@series_router.get("/")
-async def get_recent_series(limit: int = 30, offset: int = 0) -> list[SeriesRead]:
+@series_router.get(
+    "/",
+    responses={
+        status.HTTP_400_BAD_REQUEST: {
+            "model": ErrorResponse,
+            "description": "Invalid cursor",
+        }
+    },
+)
+async def get_recent_series(
+    response: Response,
+    limit: int = 30,
+    offset: int = 0,
+    cursor: str | None = None,
+) -> list[SeriesRead]:
     db_handler = SeriesDatabaseManager()
-    all_series = db_handler.read_recent(limit, offset)
+    try:
+        all_series = await run_db(db_handler.read_recent, limit, offset, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    next_cursor = db_handler.get_next_cursor(all_series, limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return all_series
 
 
@@ -33,7 +53,7 @@ async def get_recent_series(limit: int = 30, offset: int = 0) -> list[SeriesRead
 async def get_series_by_id(series_id: int) -> SeriesRead:
     db_handler = SeriesDatabaseManager()
     try:
-        series = db_handler.read(series_id)
+        series = await run_db(db_handler.read, series_id)
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     return series
@@ -52,7 +72,7 @@ async def get_series_by_id(series_id: int) -> SeriesRead:
 async def get_series_files(series_id: int) -> FolderInfo | str:
     db_handler = SeriesDatabaseManager()
     try:
-        series = db_handler.read(series_id)
+        series = await run_db(db_handler.read, series_id)
         if not series.folder_path:
             return "Series has no folder path!"
         files_handler = FilesHandler()
@@ -79,7 +99,7 @@ async def download_series_trailer(series_id: int, yt_id: str = "") -> str:
     if yt_id:
         msg += f" from [{yt_id}]"
     logging.info(msg)
-    return download_trailer_by_id(series_id, is_movie=False, yt_id=yt_id)
+    return await run_db(download_trailer_by_id, series_id, is_movie=False, yt_id=yt_id)
 
 
 @series_router.post(
@@ -96,13 +116,13 @@ async def monitor_series(series_id: int, monitor: bool = True) -> str:
     logging.info(f"Updating monitor status for series with ID: {series_id}")
     db_handler = SeriesDatabaseManager()
     try:
-        series = db_handler.read(series_id)
+        series = await run_db(db_handler.read, series_id)
         if series.trailer_exists and monitor:
             msg = f"Series '{series.title}' [{series.id}] already has a trailer!"
             await websockets.ws_manager.broadcast(msg, "Error")
             return msg
         series_update = SeriesUpdate(monitor=monitor)
-        db_handler.update(series_id, series_update)
+        await run_db(db_handler.update, series_id, series_update)
         if monitor:
             msg = f"Series '{series.title}' [{series.id}] is now monitored"
         else:
@@ -131,7 +151,7 @@ async def delete_series_trailer(series_id: int) -> str:
     logging.info(f"Deleting trailer for series with ID: {series_id}")
     db_handler = SeriesDatabaseManager()
     try:
-        series = db_handler.read(series_id)
+        series = await run_db(db_handler.read, series_id)
         if not series.trailer_exists:
             msg = f"Series '{series.title}' [{series.id}] has no trailer to delete!"
             await websockets.ws_manager.broadcast(msg, "Error")
@@ -147,7 +167,7 @@ async def delete_series_trailer(series_id: int) -> str:
             await websockets.ws_manager.broadcast(msg, "Error")
             return msg
         series_update = SeriesUpdate(trailer_exists=False)
-        db_handler.update(series_id, series_update)
+        await run_db(db_handler.update, series_id, series_update)
         msg = f"Trailer for series '{series.title}' [{series.id}] has been deleted."
         logging.info(msg)
         await websockets.ws_manager.broadcast(msg, "Success")
@@ -160,5 +180,5 @@ async def delete_series_trailer(series_id: int) -> str:
 @series_router.get("/search/{query}")
 async def search_series(query: str) -> list[SeriesRead]:
     db_handler = SeriesDatabaseManager()
-    series = db_handler.search(query)
+    series = await run_db(db_handler.search, query)
     return series
@@ -3,6 +3,7 @@ from fastapi import APIRouter
 from api.v1.models import Settings, UpdateSetting
 from config.settings import app_settings
 from core.base.database.manager.general import GeneralDatabaseManager, ServerStats
+from core.base.database.utils.executor import run_db
 
 
 settings_router = APIRouter(prefix="/settings", tags=["Settings"])
@@ -15,7 +16,7 @@ async def get_settings() -> Settings:
 
 @settings_router.get("/stats")
 async def get_stats() -> ServerStats:
-    return GeneralDatabaseManager().get_stats()
+    return await run_db(GeneralDatabaseManager().get_stats)
 
 
 @settings_router.put("/update")
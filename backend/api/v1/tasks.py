@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 
+from core.base.database.utils.executor import run_db
 from core.tasks import task_logging
 from core.tasks import schedules
 
@@ -11,12 +12,12 @@ tasks_router = APIRouter(prefix="/tasks", tags=["tasks"])
 
 @tasks_router.get("/schedules")
 async def get_scheduled_tasks() -> list[task_logging.TaskInfo]:
-    return task_logging.get_all_tasks()
+    return await run_db(task_logging.get_all_tasks)
 
 
 @tasks_router.get("/queue")
 async def get_task_queue() -> list[task_logging.QueueInfo]:
-    return task_logging.get_all_queue()
+    return await run_db(task_logging.get_all_queue)
 
 
 @tasks_router.get("/run/{task_id}")
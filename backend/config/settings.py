@@ -47,6 +47,18 @@ class _Config:
     _VALID_SUBTITLES_FORMATS = ["srt", "vtt", "pgs"]
     _VALID_FILE_FORMATS = ["mp4", "mkv", "webm"]
     _VALID_RESOLUTIONS = [240, 360, 480, 720, 1080, 1440, 2160]
+    # ionice classes, 0 disables ionice. Realtime (1) is not allowed
+    _VALID_IONICE_CLASSES = [0, 2, 3]
+    _VALID_SQLITE_JOURNAL_MODES = [
+        "DELETE",
+        "TRUNCATE",
+        "PERSIST",
+        "MEMORY",
+        "WAL",
+        "OFF",
+    ]
+    _VALID_SQLITE_SYNCHRONOUS = ["OFF", "NORMAL", "FULL", "EXTRA"]
+    _VALID_SQLITE_TEMP_STORES = ["DEFAULT", "FILE", "MEMORY"]
 
     def __init__(self):
         # Some generic attributes for server
@@ -113,6 +125,34 @@ class _Config:
             "True",
         ).lower() in ["true", "1"]
 
+        # Advanced performance settings, only configurable with ENV variables
+        self.trailer_scan_concurrency = int(os.getenv("TRAILER_SCAN_CONCURRENCY", 10))
+        self.http_pool_limit = int(os.getenv("HTTP_POOL_LIMIT", 50))
+        self.http_pool_limit_per_host = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", 10))
+        self.http_keepalive_timeout = int(os.getenv("HTTP_KEEPALIVE_TIMEOUT", 60))
+        self.http_timeout = int(os.getenv("HTTP_TIMEOUT", 300))
+        self.api_refresh_concurrency = int(os.getenv("API_REFRESH_CONCURRENCY", 3))
+        self.trailer_download_workers = int(os.getenv("TRAILER_DOWNLOAD_WORKERS", 2))
+        self.db_thread_pool_size = int(os.getenv("DB_THREAD_POOL_SIZE", 4))
+        self.image_process_workers = int(os.getenv("IMAGE_PROCESS_WORKERS", 2))
+        # Download trailers to a staging folder on the same filesystem as the media
+        self.trailer_staging_enabled = os.getenv(
+            "TRAILER_STAGING_ENABLED", "True"
+        ).lower() in ["true", "1"]
+        # Trailer transcoding, 0 threads lets ffmpeg decide, 0 nice/ionice disables them
+        self.transcode_workers = int(os.getenv("TRANSCODE_WORKERS", 1))
+        self.transcode_threads = int(os.getenv("TRANSCODE_THREADS", 2))
+        self.transcode_nice = int(os.getenv("TRANSCODE_NICE", 10))
+        self.transcode_ionice_class = int(os.getenv("TRANSCODE_IONICE_CLASS", 2))
+        self.transcode_ionice_level = int(os.getenv("TRANSCODE_IONICE_LEVEL", 7))
+        # SQLite connection pragmas, applied to every new database connection
+        self.sqlite_journal_mode = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+        self.sqlite_synchronous = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+        self.sqlite_busy_timeout = int(os.getenv("SQLITE_BUSY_TIMEOUT", 5000))
+        self.sqlite_mmap_size = int(os.getenv("SQLITE_MMAP_SIZE", 268435456))
+        self.sqlite_cache_size = int(os.getenv("SQLITE_CACHE_SIZE", -65536))
+        self.sqlite_temp_store = os.getenv("SQLITE_TEMP_STORE", "MEMORY")
+
     def as_dict(self):
         return {
             "api_key": self.api_key,
@@ -411,6 +451,283 @@ class _Config:
         self._trailer_web_optimized = value
         self._save_to_env("TRAILER_WEB_OPTIMIZED", self._trailer_web_optimized)
 
+    @property
+    def trailer_scan_concurrency(self):
+        """Number of media folders to scan for trailers in parallel during refresh. \n
+        Default is 10. Minimum is 1 \n
+        Valid values are integers."""
+        return self._trailer_scan_concurrency
+
+    @trailer_scan_concurrency.setter
+    def trailer_scan_concurrency(self, value: int):
+        value = max(1, int(value))
+        self._trailer_scan_concurrency = value
+        self._save_to_env("TRAILER_SCAN_CONCURRENCY", self._trailer_scan_concurrency)
+
+    @property
+    def http_pool_limit(self):
+        """Maximum number of open HTTP connections in the shared connection pool. \n
+        Default is 50. Minimum is 1 \n
+        Valid values are integers."""
+        return self._http_pool_limit
+
+    @http_pool_limit.setter
+    def http_pool_limit(self, value: int):
+        value = max(1, int(value))
+        self._http_pool_limit = value
+        self._save_to_env("HTTP_POOL_LIMIT", self._http_pool_limit)
+
+    @property
+    def http_pool_limit_per_host(self):
+        """Maximum number of open HTTP connections to a single host. \n
+        Default is 10. Minimum is 1 \n
+        Valid values are integers."""
+        return self._http_pool_limit_per_host
+
+    @http_pool_limit_per_host.setter
+    def http_pool_limit_per_host(self, value: int):
+        value = max(1, int(value))
+        self._http_pool_limit_per_host = value
+        self._save_to_env("HTTP_POOL_LIMIT_PER_HOST", self._http_pool_limit_per_host)
+
+    @property
+    def http_keepalive_timeout(self):
+        """Seconds to keep idle HTTP connections open for reuse. \n
+        Default is 60. Minimum is 0 (disables keep-alive) \n
+        Valid values are integers."""
+        return self._http_keepalive_timeout
+
+    @http_keepalive_timeout.setter
+    def http_keepalive_timeout(self, value: int):
+        value = max(0, int(value))
+        self._http_keepalive_timeout = value
+        self._save_to_env("HTTP_KEEPALIVE_TIMEOUT", self._http_keepalive_timeout)
+
+    @property
+    def http_timeout(self):
+        """Total timeout in seconds for a single HTTP request. \n
+        Default is 300. Minimum is 10 \n
+        Valid values are integers."""
+        return self._http_timeout
+
+    @http_timeout.setter
+    def http_timeout(self, value: int):
+        value = max(10, int(value))
+        self._http_timeout = value
+        self._save_to_env("HTTP_TIMEOUT", self._http_timeout)
+
+    @property
+    def api_refresh_concurrency(self):
+        """Number of Arr connections refreshed at the same time. \n
+        Default is 3. Minimum is 1 \n
+        Valid values are integers."""
+        return self._api_refresh_concurrency
+
+    @api_refresh_concurrency.setter
+    def api_refresh_concurrency(self, value: int):
+        value = max(1, int(value))
+        self._api_refresh_concurrency = value
+        self._save_to_env("API_REFRESH_CONCURRENCY", self._api_refresh_concurrency)
+
+    @property
+    def trailer_download_workers(self):
+        """Number of trailers downloaded at the same time. \n
+        Default is 2. Minimum is 1 \n
+        Valid values are integers."""
+        return self._trailer_download_workers
+
+    @trailer_download_workers.setter
+    def trailer_download_workers(self, value: int):
+        value = max(1, int(value))
+        self._trailer_download_workers = value
+        self._save_to_env("TRAILER_DOWNLOAD_WORKERS", self._trailer_download_workers)
+
+    @property
+    def db_thread_pool_size(self):
+        """Number of threads running database queries for the API. \n
+        Default is 4. Minimum is 1 \n
+        Valid values are integers."""
+        return self._db_thread_pool_size
+
+    @db_thread_pool_size.setter
+    def db_thread_pool_size(self, value: int):
+        value = max(1, int(value))
+        self._db_thread_pool_size = value
+        self._save_to_env("DB_THREAD_POOL_SIZE", self._db_thread_pool_size)
+
+    @property
+    def image_process_workers(self):
+        """Number of images resized and converted at the same time. \n
+        Default is 2. Minimum is 1 \n
+        Valid values are integers."""
+        return self._image_process_workers
+
+    @image_process_workers.setter
+    def image_process_workers(self, value: int):
+        value = max(1, int(value))
+        self._image_process_workers = value
+        self._save_to_env("IMAGE_PROCESS_WORKERS", self._image_process_workers)
+
+    @property
+    def trailer_staging_enabled(self):
+        """Download trailers to a staging folder on the same filesystem as the media, \
+            so they are moved with a rename instead of a copy. \n
+        Default is True. \n
+        Valid values are True/False."""
+        return self._trailer_staging_enabled
+
+    @trailer_staging_enabled.setter
+    def trailer_staging_enabled(self, value: bool):
+        self._trailer_staging_enabled = value
+        self._save_to_env("TRAILER_STAGING_ENABLED", self._trailer_staging_enabled)
+
+    @property
+    def transcode_workers(self):
+        """Number of trailers transcoded at the same time. \n
+        Default is 1. Minimum is 1 \n
+        Valid values are integers."""
+        return self._transcode_workers
+
+    @transcode_workers.setter
+    def transcode_workers(self, value: int):
+        value = max(1, int(value))
+        self._transcode_workers = value
+        self._save_to_env("TRANSCODE_WORKERS", self._transcode_workers)
+
+    @property
+    def transcode_threads(self):
+        """Number of threads used by ffmpeg for each transcode. \n
+        Default is 2. Minimum is 0 (lets ffmpeg decide) \n
+        Valid values are integers."""
+        return self._transcode_threads
+
+    @transcode_threads.setter
+    def transcode_threads(self, value: int):
+        value = max(0, int(value))
+        self._transcode_threads = value
+        self._save_to_env("TRANSCODE_THREADS", self._transcode_threads)
+
+    @property
+    def transcode_nice(self):
+        """CPU niceness of the ffmpeg process when transcoding. \n
+        Default is 10. Minimum is 0 (disables nice), maximum is 19 \n
+        Valid values are integers."""
+        return self._transcode_nice
+
+    @transcode_nice.setter
+    def transcode_nice(self, value: int):
+        value = min(19, max(0, int(value)))
+        self._transcode_nice = value
+        self._save_to_env("TRANSCODE_NICE", self._transcode_nice)
+
+    @property
+    def transcode_ionice_class(self):
+        """I/O scheduling class of the ffmpeg process when transcoding. \n
+        Default is 2 (best-effort). \n
+        Valid values are 0 (disables ionice), 2 (best-effort) and 3 (idle)."""
+        return self._transcode_ionice_class
+
+    @transcode_ionice_class.setter
+    def transcode_ionice_class(self, value: int):
+        value = int(value)
+        if value not in self._VALID_IONICE_CLASSES:
+            value = 2
+        self._transcode_ionice_class = value
+        self._save_to_env("TRANSCODE_IONICE_CLASS", self._transcode_ionice_class)
+
+    @property
+    def transcode_ionice_level(self):
+        """I/O priority of the ffmpeg process in the best-effort class. \n
+        Default is 7. Minimum is 0 (highest), maximum is 7 (lowest) \n
+        Valid values are integers."""
+        return self._transcode_ionice_level
+
+    @transcode_ionice_level.setter
+    def transcode_ionice_level(self, value: int):
+        value = min(7, max(0, int(value)))
+        self._transcode_ionice_level = value
+        self._save_to_env("TRANSCODE_IONICE_LEVEL", self._transcode_ionice_level)
+
+    @property
+    def sqlite_journal_mode(self):
+        """SQLite journal mode of the database connections. \n
+        Default is 'WAL'. \n
+        Valid values are 'DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF'."""
+        return self._sqlite_journal_mode
+
+    @sqlite_journal_mode.setter
+    def sqlite_journal_mode(self, value: str):
+        self._sqlite_journal_mode = value.upper()
+        if self._sqlite_journal_mode not in self._VALID_SQLITE_JOURNAL_MODES:
+            self._sqlite_journal_mode = "WAL"
+        self._save_to_env("SQLITE_JOURNAL_MODE", self._sqlite_journal_mode)
+
+    @property
+    def sqlite_synchronous(self):
+        """SQLite synchronous mode of the database connections. \n
+        Default is 'NORMAL'. \n
+        Valid values are 'OFF', 'NORMAL', 'FULL', 'EXTRA'."""
+        return self._sqlite_synchronous
+
+    @sqlite_synchronous.setter
+    def sqlite_synchronous(self, value: str):
+        self._sqlite_synchronous = value.upper()
+        if self._sqlite_synchronous not in self._VALID_SQLITE_SYNCHRONOUS:
+            self._sqlite_synchronous = "NORMAL"
+        self._save_to_env("SQLITE_SYNCHRONOUS", self._sqlite_synchronous)
+
+    @property
+    def sqlite_busy_timeout(self):
+        """Milliseconds a database connection waits for a lock before failing. \n
+        Default is 5000. Minimum is 0 \n
+        Valid values are integers."""
+        return self._sqlite_busy_timeout
+
+    @sqlite_busy_timeout.setter
+    def sqlite_busy_timeout(self, value: int):
+        value = max(0, int(value))
+        self._sqlite_busy_timeout = value
+        self._save_to_env("SQLITE_BUSY_TIMEOUT", self._sqlite_busy_timeout)
+
+    @property
+    def sqlite_mmap_size(self):
+        """Bytes of the database file memory mapped by each connection. \n
+        Default is 268435456 (256 MiB). Minimum is 0 (disables memory mapping) \n
+        Valid values are integers."""
+        return self._sqlite_mmap_size
+
+    @sqlite_mmap_size.setter
+    def sqlite_mmap_size(self, value: int):
+        value = max(0, int(value))
+        self._sqlite_mmap_size = value
+        self._save_to_env("SQLITE_MMAP_SIZE", self._sqlite_mmap_size)
+
+    @property
+    def sqlite_cache_size(self):
+        """SQLite page cache size of each database connection. \n
+        Default is -65536 (64 MiB). Negative values are in KiB, positive in pages \n
+        Valid values are integers."""
+        return self._sqlite_cache_size
+
+    @sqlite_cache_size.setter
+    def sqlite_cache_size(self, value: int):
+        self._sqlite_cache_size = int(value)
+        self._save_to_env("SQLITE_CACHE_SIZE", self._sqlite_cache_size)
+
+    @property
+    def sqlite_temp_store(self):
+        """Where SQLite stores temporary tables and indices. \n
+        Default is 'MEMORY'. \n
+        Valid values are 'DEFAULT', 'FILE', 'MEMORY'."""
+        return self._sqlite_temp_store
+
+    @sqlite_temp_store.setter
+    def sqlite_temp_store(self, value: str):
+        self._sqlite_temp_store = value.upper()
+        if self._sqlite_temp_store not in self._VALID_SQLITE_TEMP_STORES:
+            self._sqlite_temp_store = "MEMORY"
+        self._save_to_env("SQLITE_TEMP_STORE", self._sqlite_temp_store)
+
     def _save_to_env(self, key: str, value: str | int | bool):
         """Save the given key-value pair to the environment variables."""
         os.environ[key.upper()] = str(value)
@@ -1,9 +1,72 @@
-from typing import Any
+import asyncio
+import codecs
+import json
+from typing import Any, AsyncIterator
 from urllib.parse import urlparse, urlunparse
 import aiohttp
 
+from core.base.http_session import get_session
 from exceptions import ConnectionTimeoutError, InvalidResponseError
 
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+
+async def iter_json_array(stream: aiohttp.StreamReader) -> AsyncIterator[Any]:
+    """Decode a JSON array from a byte stream and yield its items one by one. \n
+    Only the unparsed part of the stream is kept in memory, so memory usage \
+        depends on the size of a single item, not the size of the whole array. \n
+    Args:
+        stream (aiohttp.StreamReader): The stream with the JSON array.\n
+    Yields:
+        Any: Decoded items of the array.\n
+    Raises:
+        InvalidResponseError: If the stream is not a valid JSON array.
+    """
+    decoder = json.JSONDecoder()
+    utf8_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    started = False
+    finished = False
+    eof = False
+    chunks = stream.iter_chunked(_STREAM_CHUNK_SIZE)
+    while not finished:
+        try:
+            chunk = await anext(chunks)
+            buffer += utf8_decoder.decode(chunk)
+        except StopAsyncIteration:
+            buffer += utf8_decoder.decode(b"", final=True)
+            eof = True
+        pos = 0
+        while True:
+            # Skip whitespace and item separators
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(buffer):
+                break
+            if not started:
+                if buffer[pos] != "[":
+                    raise InvalidResponseError("Expected a JSON array in response")
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == "]":
+                finished = True
+                break
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Item is incomplete, wait for more data
+                break
+            if end >= len(buffer) and not eof:
+                # Value might continue in the next chunk (e.g. a number)
+                break
+            pos = end
+            yield item
+        buffer = buffer[pos:]
+        if eof and not finished:
+            raise InvalidResponseError("Incomplete JSON array in response")
+    return
+
 
 class AsyncRequestManager:
     """Base class for asynchronous requests to Arr API"""
@@ -47,24 +110,77 @@ class AsyncRequestManager:
         fixed_path = parsed_url.path.replace("//", "/").rstrip("/")
         url = urlunparse(parsed_url._replace(path=fixed_path))
         headers = {"X-Api-Key": self.api_key}
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.request(
-                    method, url, headers=headers, params=params, data=data
-                ) as client_response:
-                    # client_response.raise_for_status()
-                    response = await self._process_response(client_response)
-                    return response
-            except aiohttp.ServerTimeoutError:
-                raise ConnectionTimeoutError(
-                    "Timeout occurred while connecting to API."
-                )
-            except aiohttp.ClientConnectionError:
-                raise ConnectionError("Connection Refused while connecting to API.")
-            except Exception:
-                raise ConnectionError(
-                    "Unable to connect to API. Check your connection."
-                )
+        # Use the shared session to reuse pooled connections
+        session = get_session()
+        try:
+            async with session.request(
+                method, url, headers=headers, params=params, data=data
+            ) as client_response:
+                # client_response.raise_for_status()
+                response = await self._process_response(client_response)
+                return response
+        except (aiohttp.ServerTimeoutError, asyncio.TimeoutError):
+            raise ConnectionTimeoutError("Timeout occurred while connecting to API.")
+        except aiohttp.ClientConnectionError:
+            raise ConnectionError("Connection Refused while connecting to API.")
+        except Exception:
+            raise ConnectionError("Unable to connect to API. Check your connection.")
+
+    async def _request_stream(
+        self,
+        method: str,
+        path: str,
+        params: dict | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Send a request of HTTP method type to the Arr API and yield items of \
+            the JSON array response as they are received. \n
+        Use this for endpoints that return large lists, like all movies or series, \
+            to avoid loading the whole response in memory at once.
+
+        Args:
+            method (str): HTTP method type
+            path (str): Destination for specific call
+            params (dict | None): Parameters to send with the request
+
+        Yields:
+            dict[str, Any]: Items of the JSON array response from the API
+
+        Raises:
+            ConnectionError: If the connection is refused / response is not 200
+            ConnectionTimeoutError: If the connection times out
+            InvalidResponseError: If the API response is invalid
+        """
+        initial_url = f"{self.host_url}/{path}"
+        parsed_url = urlparse(initial_url)
+        fixed_path = parsed_url.path.replace("//", "/").rstrip("/")
+        url = urlunparse(parsed_url._replace(path=fixed_path))
+        headers = {"X-Api-Key": self.api_key}
+        session = get_session()
+        try:
+            async with session.request(
+                method, url, headers=headers, params=params
+            ) as client_response:
+                if client_response.status != 200:
+                    # Raises the appropriate error for the status code
+                    await self._process_response(client_response)
+                response_content_type = client_response.headers.get("content-type")
+                if response_content_type and "text" in response_content_type:
+                    raise InvalidResponseError(
+                        f"Invalid Response from server! Check if {self.host_url}"
+                        f" is a valid API endpoint."
+                    )
+                async for item in iter_json_array(client_response.content):
+                    if not isinstance(item, dict):
+                        raise InvalidResponseError("Invalid item in API response")
+                    yield item
+        except (InvalidResponseError, ConnectionError):
+            raise
+        except (aiohttp.ServerTimeoutError, asyncio.TimeoutError):
+            raise ConnectionTimeoutError("Timeout occurred while connecting to API.")
+        except aiohttp.ClientConnectionError:
+            raise ConnectionError("Connection Refused while connecting to API.")
+        except Exception:
+            raise ConnectionError("Unable to connect to API. Check your connection.")
 
     async def _process_response(
         self, response: aiohttp.ClientResponse
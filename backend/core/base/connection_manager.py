@@ -1,8 +1,14 @@
 from abc import ABC, abstractmethod
+import asyncio
+from dataclasses import dataclass
 from functools import cache
-from typing import Any, Callable, Protocol
+import hashlib
+import json
+import time
+from typing import Any, AsyncIterator, Callable, Protocol
 
 from app_logger import ModuleLogger
+from config.settings import app_settings
 from core.base.database.models.helpers import MediaReadDC, MediaUpdateDC
 from core.files_handler import FilesHandler
 from core.base.database.models.connection import ConnectionRead, MonitorType
@@ -19,13 +25,48 @@ class ArrManagerProtocol(Protocol):
             str: The system status from the Arr application."""
         raise NotImplementedError("Subclasses must implement this method")
 
-    async def get_all_media(self) -> list[dict[str, Any]]:
-        """Get all media from the Arr application. \n
-        Returns:
-            list[dict[str, Any]]: The media from the Arr application."""
+    def iter_all_media(self) -> AsyncIterator[dict[str, Any]]:
+        """Get all media from the Arr application, one by one as they are received. \n
+        Yields:
+            dict[str, Any]: The media from the Arr application."""
         raise NotImplementedError("Subclasses must implement this method")
 
 
+@dataclass(eq=False, repr=False, slots=True)
+class RefreshStats:
+    """Statistics of a single connection refresh."""
+
+    media_count: int = 0
+    skipped_count: int = 0
+    scan_duration: float = 0.0
+    error: str = ""
+
+
+# Number of parsed media saved to database at once while streaming from Arr API
+_UPSERT_BATCH_SIZE = 500
+
+# Bump this to force a full re-parse of all media on next refresh
+_FINGERPRINT_VERSION = "1"
+
+
+def get_media_fingerprint(media_data: dict[str, Any], keys: tuple[str, ...]) -> str:
+    """Get a compact fingerprint of the media data received from the Arr API.\n
+    Only the given keys are used, for images only cover type and remote url are used.\n
+    Args:
+        media_data (dict[str, Any]): The media data from the Arr API.
+        keys (tuple[str, ...]): The keys of the media data to include.\n
+    Returns:
+        str: The fingerprint of the media data as a hex string."""
+    data: list[Any] = [_FINGERPRINT_VERSION]
+    for key in keys:
+        value = media_data.get(key)
+        if key == "images" and isinstance(value, list):
+            value = [(img.get("coverType"), img.get("remoteUrl")) for img in value]
+        data.append(value)
+    data_bytes = json.dumps(data, separators=(",", ":"), default=str).encode()
+    return hashlib.blake2b(data_bytes, digest_size=8).hexdigest()
+
+
 class BaseConnectionManager[_MediaCreate](ABC):
     """Connection manager for working with the Arr applications.
     Abstract class that provides the base functionality for working with the Arr applications.
@@ -33,6 +74,7 @@ class BaseConnectionManager[_MediaCreate](ABC):
 
     arr_manager: ArrManagerProtocol
     connection_id: int
+    fingerprint_keys: tuple[str, ...]
     inline_trailer: bool
     monitor: MonitorType
     parse_media: Callable[[int, dict[str, Any]], _MediaCreate]
@@ -43,15 +85,22 @@ class BaseConnectionManager[_MediaCreate](ABC):
         arr_manager: ArrManagerProtocol,
         parse_media: Callable[[int, dict[str, Any]], _MediaCreate],
         inline_trailer: bool,
+        fingerprint_keys: tuple[str, ...],
     ):
         """Initialize the ArrConnectionManager. \n
         Args:
-            connection (ConnectionRead): The connection data."""
+            connection (ConnectionRead): The connection data.
+            arr_manager (ArrManagerProtocol): The Arr API manager.
+            parse_media (Callable): Function to parse the Arr API media data.
+            inline_trailer (bool): Flag to check for trailer files in the media folder.
+            fingerprint_keys (tuple[str, ...]): Keys of the Arr API media data used \
+                for change detection."""
         self.connection_id = connection.id
         self.monitor = connection.monitor
         self.arr_manager = arr_manager
         self.parse_media = parse_media
         self.inline_trailer = inline_trailer
+        self.fingerprint_keys = fingerprint_keys
 
     async def get_system_status(self):
         """Get the system status from the Arr application. \n
@@ -63,26 +112,48 @@ class BaseConnectionManager[_MediaCreate](ABC):
         except Exception:
             return None
 
-    async def get_media_data(self) -> list[dict[str, Any]]:
-        """Get the data from the Arr application. \n
-        Returns:
-            - list[dict[str, Any]]: The data from the Arr application.
-            - An empty list if the data could not be retrieved."""
-        try:
-            return await self.arr_manager.get_all_media()
-        except Exception:
-            logger.error("Failed to get media data from Arr application.")
-            return []
-
-    async def _parse_data(self) -> list[_MediaCreate]:
-        """Parse media received from the Arr API to objects that can be added to database.\n
+    async def _ingest_media(
+        self, stats: RefreshStats, incremental: bool = True
+    ) -> list[MediaReadDC]:
+        """Stream media from the Arr API, parse them to objects that can be added to \
+            database and save them in batches as they are received.\n
+        In incremental mode, media whose fingerprint didn't change since last refresh \
+            are not parsed and returned as stored in database instead.\n
+        Args:
+            stats (RefreshStats): Refresh statistics to update with skipped media count.
+            incremental (bool) [Optional]: Skip unchanged media. Default is True.\n
         Returns:
-            list[_MediaCreate]: list of parsed media objects."""
-        media_data = await self.get_media_data()
-        return [
-            self.parse_media(self.connection_id, each_media_data)
-            for each_media_data in media_data
-        ]
+            list[MediaReadDC]: List of all media objects, changed and unchanged.\n
+        Raises:
+            ConnectionError: If the connection is refused / response is not 200
+            ConnectionTimeoutError: If the connection times out
+            InvalidResponseError: If the API response is invalid"""
+        if incremental:
+            known_media = await asyncio.to_thread(self.read_media_fingerprints)
+        else:
+            known_media = {}
+        media_res: list[MediaReadDC] = []
+        parsed_batch: list[_MediaCreate] = []
+        async for each_media_data in self.arr_manager.iter_all_media():
+            fingerprint = get_media_fingerprint(each_media_data, self.fingerprint_keys)
+            known = known_media.get(each_media_data.get("id", 0))
+            if known and known[0] == fingerprint:
+                media_res.append(known[1])
+                stats.skipped_count += 1
+                continue
+            media_create = self.parse_media(self.connection_id, each_media_data)
+            media_create.arr_fingerprint = fingerprint  # type: ignore
+            parsed_batch.append(media_create)
+            if len(parsed_batch) >= _UPSERT_BATCH_SIZE:
+                media_res.extend(
+                    await asyncio.to_thread(self.create_or_update_bulk, parsed_batch)
+                )
+                parsed_batch = []
+        if parsed_batch:
+            media_res.extend(
+                await asyncio.to_thread(self.create_or_update_bulk, parsed_batch)
+            )
+        return media_res
 
     async def _check_trailer(self, folder_path: str) -> bool:
         """Check if a trailer exists for the media in the folder path.\n
@@ -96,6 +167,27 @@ class BaseConnectionManager[_MediaCreate](ABC):
         )
         return trailer_exists
 
+    async def _check_trailers_bulk(self, folder_paths: list[str | None]) -> list[bool]:
+        """Check if trailers exist for multiple media folders in parallel.\n
+        Number of folders scanned at once is limited by `trailer_scan_concurrency` setting.\n
+        Args:
+            folder_paths (list[str | None]): The folder paths to check for trailers.\n
+        Returns:
+            list[bool]: Trailer exists flags, in the same order as `folder_paths`."""
+        sem = asyncio.Semaphore(app_settings.trailer_scan_concurrency)
+
+        async def check(folder_path: str | None) -> bool:
+            if folder_path is None:
+                return False
+            async with sem:  # Wait for a free slot in the semaphore
+                try:
+                    return await self._check_trailer(folder_path)
+                except Exception:
+                    logger.error(f"Failed to check trailer in folder: {folder_path}")
+                    return False
+
+        return await asyncio.gather(*(check(path) for path in folder_paths))
+
     @cache
     def _check_monitoring(
         self, is_new: bool, trailer_exists: bool, arr_monitored: bool
@@ -136,6 +228,14 @@ class BaseConnectionManager[_MediaCreate](ABC):
             list[MediaReadProtocol]: The media objects that satisfy MediaReadProtocol."""
         raise NotImplementedError("Subclasses must implement this method")
 
+    @abstractmethod
+    def read_media_fingerprints(self) -> dict[int, tuple[str, MediaReadDC]]:
+        """Get the stored fingerprints of media for this connection from the database. \n
+        Returns:
+            dict[int, tuple[str, MediaReadDC]]: Fingerprint and media object keyed by arr id.
+        """
+        raise NotImplementedError("Subclasses must implement this method")
+
     @abstractmethod
     def remove_deleted_media(self, media_ids: list[int]) -> None:
         """Remove the media from the database that are not present in the Arr application. \n
@@ -150,25 +250,48 @@ class BaseConnectionManager[_MediaCreate](ABC):
             media_update_list (list[MediaUpdateDC]): List of media update data."""
         raise NotImplementedError("Subclasses must implement this method")
 
-    async def refresh(self):
-        """Gets new data from Arr API and saves it to the database."""
-        # Get the parsed data from the Arr API
-        parsed_media = await self._parse_data()
-        if len(parsed_media) == 0:
+    async def refresh(self, incremental: bool = True) -> RefreshStats:
+        """Gets new data from Arr API and saves it to the database.\n
+        Database operations run in a worker thread, so refreshes of multiple \
+            connections can run concurrently in the same event loop.\n
+        Args:
+            incremental (bool) [Optional]: Skip parsing and saving media that \
+                didn't change since last refresh. Default is True.\n
+        Returns:
+            RefreshStats: Statistics of the refresh."""
+        stats = RefreshStats()
+        # Get the data from the Arr API and save changed media to database
+        try:
+            media_res = await self._ingest_media(stats, incremental)
+        except Exception as e:
+            # Do not delete any media if the data could not be fully retrieved
+            logger.error(f"Failed to get media data from Arr application: {e}")
+            stats.error = str(e)
+            return stats
+        if len(media_res) == 0:
             logger.warning("No media found in the Arr application")
-            return
-        # Create or update the media in the database
-        media_res = self.create_or_update_bulk(parsed_media)
+            return stats
+        stats.media_count = len(media_res)
+        logger.info(
+            f"{stats.media_count - stats.skipped_count} media changed,"
+            f" {stats.skipped_count} media unchanged"
+        )
         # Delete any media that is not present in the Arr application
         media_ids = [media.id for media in media_res]
-        self.remove_deleted_media(media_ids)
-        # Check if media has trailer and should be monitored
+        await asyncio.to_thread(self.remove_deleted_media, media_ids)
+        # Check if media has trailer, scan folders in parallel
+        scan_start = time.perf_counter()
+        trailer_exists_list = await self._check_trailers_bulk(
+            [media_read.folder_path for media_read in media_res]
+        )
+        stats.scan_duration = time.perf_counter() - scan_start
+        logger.info(
+            f"Trailer scan for {len(media_res)} media folders took"
+            f" {stats.scan_duration:.2f} seconds"
+        )
+        # Check if media should be monitored
         update_list: list[MediaUpdateDC] = []
-        for media_read in media_res:
-            if media_read.folder_path is None:
-                trailer_exists = False
-            else:
-                trailer_exists = await self._check_trailer(media_read.folder_path)
+        for media_read, trailer_exists in zip(media_res, trailer_exists_list):
             # Check if monitor is already enabled
             if media_read.monitor:
                 monitor_media = True
@@ -179,6 +302,12 @@ class BaseConnectionManager[_MediaCreate](ABC):
                     trailer_exists,
                     media_read.arr_monitored,
                 )
+            # Skip media whose status didn't change
+            # New media are always updated, to clear their pending status
+            media_status = (monitor_media, trailer_exists)
+            current_status = (media_read.monitor, media_read.trailer_exists)
+            if not media_read.created and media_status == current_status:
+                continue
             update_list.append(
                 MediaUpdateDC(
                     id=media_read.id,
@@ -187,5 +316,5 @@ class BaseConnectionManager[_MediaCreate](ABC):
                 )
             )
         # Update the database with trailer and monitoring status
-        self.update_media_status_bulk(update_list)
-        return
+        await asyncio.to_thread(self.update_media_status_bulk, update_list)
+        return stats
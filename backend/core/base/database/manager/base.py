@@ -1,17 +1,39 @@
 from abc import ABC
+from dataclasses import fields
 from datetime import datetime, timezone
+from itertools import batched
 import re
-from typing import Optional, Protocol, Sequence
-from sqlmodel import Session, col, desc, select
+from typing import Any, Optional, Protocol, Sequence
+from sqlalchemy import column, table
+from sqlalchemy.exc import OperationalError
+from sqlmodel import (
+    Session,
+    col,
+    desc,
+    insert,
+    literal,
+    literal_column,
+    select,
+    tuple_,
+    union_all,
+    update,
+)
 
 from core.base.database.manager.connection import ConnectionDatabaseManager
+from core.base.database.models.helpers import MediaImage, MediaReadDC, MediaTrailer
 from core.base.database.models.media import (
     MediaDB,
     MediaCreate,
     MediaRead,
     MediaUpdate,
 )
+from core.base.database.utils.cursor import decode_cursor, encode_cursor
 from core.base.database.utils.engine import manage_session
+from core.base.database.utils.fts import (
+    build_fts_query,
+    get_fts_rank,
+    get_fts_table_name,
+)
 from exceptions import ItemNotFoundError
 from app_logger import logger
 
@@ -58,45 +80,6 @@ class DatabaseManager[
         self.__db_model = db_model
         self.__read_model = read_model
 
-    def _create_or_update(
-        self, media_create: _MediaCreate, session: Session
-    ) -> tuple[_Media, bool, bool]:
-        """-->>This is a private method<<-- \n
-        Create or update a media in the database. \n
-        If media already exists, it will be updated, otherwise it will be created.\n
-        Does not commit the changes to database. Only adds to session.\n
-        Args:
-            media_create (MediaCreate): The media to create or update.
-            _session (Session): A session to use for the database connection.\n
-        Returns:
-            tuple[Media, bool, bool]: Media object and flags indicating created and updated.\n
-            Example::\n
-                (<Media obj>, True)
-        """
-        db_media = self._read_if_exists(
-            media_create.connection_id, media_create.txdb_id, session
-        )
-        if db_media:
-            # Exists, update it
-            media_update_data = media_create.model_dump(
-                exclude_unset=True,
-                # exclude_defaults=True,
-                exclude_none=True,
-                exclude={"youtube_trailer_id", "downloaded_at"},
-            )
-            db_media.sqlmodel_update(media_update_data)
-            _updated = False
-            if session.is_modified(db_media):
-                db_media.updated_at = datetime.now(timezone.utc)
-                _updated = True
-            session.add(db_media)
-            return db_media, False, _updated
-        else:
-            # Doesn't exist, Create it
-            db_media = self.__db_model.model_validate(media_create)
-            session.add(db_media)
-            return db_media, True, False
-
     @manage_session
     def create_or_update_bulk(
         self,
@@ -106,6 +89,11 @@ class DatabaseManager[
     ) -> list[tuple[_MediaRead, bool]]:
         """Create or update multiple media objects in the database at once. \n
         If media already exists, it will be updated, otherwise it will be created.\n
+        Existing rows of the given media are loaded by `(connection_id, txdb_id)` \
+            and compared in memory, new and changed media are then written with one bulk \
+            `INSERT` and one bulk `UPDATE` (executemany).\n
+        New media are marked as `status_pending`, and are reported as created until \
+            their status is updated with `update_media_status_bulk`.\n
         Args:
             media_create_list (list[MediaCreate]): List of media objects to create or update.\n
             _session (Session) [Optional]: A session to use for the database connection.\n
@@ -118,25 +106,71 @@ class DatabaseManager[
             ItemNotFoundError: If any of the connections with provided connection_id's are invalid.
             ValidationError: If any of the media items are invalid.
         """
+        if not media_create_list:
+            return []
         self._check_connection_exists_bulk(media_create_list, session=_session)
-        db_media_list: list[tuple[_Media, bool]] = []
-        new_count: int = 0
-        updated_count: int = 0
+        existing_media = self._read_existing_bulk(media_create_list, _session)
+        # Diff incoming media against existing rows, keyed by (connection_id, txdb_id)
+        media_rows: dict[tuple[int, str], dict[str, Any]] = {}
+        created_keys: set[tuple[int, str]] = set()
+        insert_rows: list[dict[str, Any]] = []
+        update_rows: dict[tuple[int, str], dict[str, Any]] = {}
         for media_create in media_create_list:
-            db_media, created, updated = self._create_or_update(media_create, _session)
-            db_media_list.append((db_media, created))
-            if created:
-                new_count += 1
-            if updated:
-                updated_count += 1
+            key = (media_create.connection_id, media_create.txdb_id)
+            if key in created_keys:
+                # Duplicate of a media that is being created, update the pending row
+                media_rows[key].update(self._get_create_data(media_create))
+                continue
+            db_row = existing_media.get(key)
+            if db_row is None:
+                # Doesn't exist, Create it
+                db_media = self.__db_model.model_validate(media_create)
+                new_row = db_media.model_dump(exclude={"id"})
+                new_row["status_pending"] = True
+                media_rows[key] = new_row
+                insert_rows.append(new_row)
+                created_keys.add(key)
+                continue
+            # Exists, update it if anything changed
+            media_rows[key] = db_row
+            media_update_data = self._get_create_data(media_create)
+            changes = {
+                field: value
+                for field, value in media_update_data.items()
+                if db_row.get(field) != value
+            }
+            if not changes:
+                continue
+            if changes.keys() - {"arr_fingerprint"}:
+                # Only bump updated_at if media data changed, not just the fingerprint
+                changes["updated_at"] = datetime.now(timezone.utc)
+            db_row.update(changes)
+            update_rows.setdefault(key, {"id": db_row["id"]}).update(changes)
+
+        if insert_rows:
+            statement = insert(self.__db_model).returning(
+                self.__db_model.id, sort_by_parameter_order=True
+            )
+            new_ids = _session.scalars(statement, insert_rows).all()
+            for new_row, new_id in zip(insert_rows, new_ids):
+                new_row["id"] = new_id
+        if update_rows:
+            _session.execute(update(self.__db_model), list(update_rows.values()))
         _session.commit()
+        updated_count = sum(1 for row in update_rows.values() if "updated_at" in row)
         logger.info(
-            f"{self.__db_model.__name__}: {new_count} Created, {updated_count} Updated."
+            f"{self.__db_model.__name__}: {len(insert_rows)} Created, "
+            f"{updated_count} Updated."
         )
-        return [
-            (self.__read_model.model_validate(db_media), created)
-            for db_media, created in db_media_list
-        ]
+        media_read_list: list[tuple[_MediaRead, bool]] = []
+        for media_create in media_create_list:
+            key = (media_create.connection_id, media_create.txdb_id)
+            media_row = media_rows[key]
+            media_read = self.__read_model.model_validate(media_row)
+            # Media saved by an earlier refresh that failed before evaluating it
+            created = key in created_keys or bool(media_row["status_pending"])
+            media_read_list.append((media_read, created))
+        return media_read_list
 
     @manage_session
     def read(
@@ -206,11 +240,157 @@ class DatabaseManager[
         db_media_list = _session.exec(statement).all()
         return self._convert_to_read_list(db_media_list)
 
+    @manage_session
+    def read_fingerprints(
+        self,
+        connection_id: int,
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> dict[int, tuple[str, MediaReadDC]]:
+        """Get the stored Arr data fingerprints of all media for a given connection.\n
+        Only the columns needed for a refresh are loaded, media without a fingerprint \
+            or with a pending status are not returned, so they are parsed again.\n
+        Args:
+            connection_id (int): The id of the connection to get fingerprints for.
+            _session (Session) [Optional]: A session to use for the database connection.\n
+                Default is None, in which case a new session will be created.\n
+        Returns:
+            dict[int, tuple[str, MediaReadDC]]: Fingerprint and MediaReadDC object \
+                keyed by `arr_id`.
+        """
+        statement = (
+            select(
+                self.__db_model.arr_id,
+                self.__db_model.arr_fingerprint,
+                self.__db_model.id,
+                self.__db_model.folder_path,
+                self.__db_model.arr_monitored,
+                self.__db_model.monitor,
+                self.__db_model.trailer_exists,
+            )
+            .where(self.__db_model.connection_id == connection_id)
+            .where(col(self.__db_model.arr_fingerprint).is_not(None))
+            .where(col(self.__db_model.status_pending) == False)  # noqa: E712
+        )
+        fingerprints: dict[int, tuple[str, MediaReadDC]] = {}
+        for row in _session.exec(statement).all():
+            fingerprints[row.arr_id] = (
+                row.arr_fingerprint,
+                MediaReadDC(
+                    id=row.id,
+                    created=False,
+                    folder_path=row.folder_path,
+                    arr_monitored=row.arr_monitored,
+                    monitor=row.monitor,
+                    trailer_exists=row.trailer_exists,
+                ),
+            )
+        return fingerprints
+
+    @manage_session
+    def read_as[_DC](
+        self,
+        dc_type: type[_DC],
+        *filters: Any,
+        column_map: dict[str, str] | None = None,
+        order_by: Any = None,
+        limit: int | None = None,
+        _session: Session = None,  # type: ignore
+    ) -> list[_DC]:
+        """Get media from the database as lightweight dataclass objects.\n
+        Only the columns for the fields of `dc_type` are selected and rows are \
+            converted directly, skipping ORM objects and pydantic validation.\n
+        Args:
+            dc_type (type[dataclass]): The dataclass to create for each row, \
+                e.g. MediaTrailer.
+            *filters (Any): Filter expressions on the database model columns.
+            column_map (dict[str, str]) [Optional]: Column names for dataclass fields \
+                named differently from the database model columns.
+            order_by (Any) [Optional]: Column expression to order the results by.
+            limit (int) [Optional]: Maximum number of results.
+            _session (Session) [Optional]: A session to use for the database connection.\n
+                Default is None, in which case a new session will be created.\n
+        Returns:
+            list[dataclass]: List of `dc_type` objects.
+        """
+        column_map = column_map or {}
+        columns = [
+            getattr(self.__db_model, column_map.get(field.name, field.name))
+            for field in fields(dc_type)  # type: ignore
+        ]
+        statement = select(*columns).where(*filters)
+        if order_by is not None:
+            statement = statement.order_by(order_by)
+        if limit is not None:
+            statement = statement.limit(limit)
+        return [dc_type(*row) for row in _session.execute(statement)]
+
+    def read_trailer_needed(self) -> list[MediaTrailer]:
+        """Get the media that need a trailer download from the database.\n
+        Only monitored media without a trailer and with a folder path are returned, \
+            loading just the columns needed for a download. Backed by a partial index \
+            on these conditions, so only the matching rows are read.\n
+        Returns:
+            list[MediaTrailer]: List of MediaTrailer objects.
+        """
+        # Conditions must match the partial index 'ix_<table>_trailer_needed'
+        return self.read_as(
+            MediaTrailer,
+            col(self.__db_model.monitor) == True,  # noqa: E712
+            col(self.__db_model.trailer_exists) == False,  # noqa: E712
+            col(self.__db_model.folder_path).is_not(None),
+            column_map={"yt_id": "youtube_trailer_id"},
+            order_by=col(self.__db_model.id),
+        )
+
+    @manage_session
+    def read_images(
+        self,
+        recent_only: bool = False,
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> list[MediaImage]:
+        """Get the poster and fanart images of media from the database.\n
+        Only the image columns are selected, each media returns a poster \
+            and a fanart MediaImage object.\n
+        Args:
+            recent_only (bool) [Optional]: Get images only for the 100 most recently \
+                added media. Default is False.
+            _session (Session) [Optional]: A session to use for the database connection.\n
+                Default is None, in which case a new session will be created.\n
+        Returns:
+            list[MediaImage]: List of MediaImage objects.
+        """
+        media_ids = select(self.__db_model.id)
+        if recent_only:
+            media_ids = media_ids.order_by(desc(self.__db_model.added_at)).limit(100)
+        media_ids_subquery = media_ids.scalar_subquery()
+        posters = select(
+            self.__db_model.id,
+            literal(True),
+            self.__db_model.poster_url,
+            self.__db_model.poster_path,
+        ).where(col(self.__db_model.id).in_(media_ids_subquery))
+        fanarts = select(
+            self.__db_model.id,
+            literal(False),
+            self.__db_model.fanart_url,
+            self.__db_model.fanart_path,
+        ).where(col(self.__db_model.id).in_(media_ids_subquery))
+        statement = union_all(posters, fanarts)
+        return [
+            MediaImage(media_id, bool(is_poster), image_url, image_path)
+            for media_id, is_poster, image_url, image_path in _session.execute(
+                statement
+            )
+        ]
+
     @manage_session
     def read_recent(
         self,
         limit: int = 100,
         offset: int = 0,
+        cursor: str | None = None,
         *,
         _session: Session = None,  # type: ignore
     ) -> list[_MediaRead]:
@@ -218,18 +398,17 @@ class DatabaseManager[
         Args:
             limit (int) [Optional]: The number of recent media items to get. Max 100
             offset (int) [Optional]: The offset to start from. Default is 0.
+            cursor (str) [Optional]: Cursor to get the items after, \
+                see `get_next_cursor`. Default is None.
             _session (Session) [Optional]: A session to use for the database connection.\n
                 Default is None, in which case a new session will be created.\n
         Returns:
-            list[MediaRead]: List of MediaRead objects.
+            list[MediaRead]: List of MediaRead objects.\n
+        Raises:
+            ValueError: If the cursor is invalid.
         """
-        offset = max(0, offset)
-        limit = max(1, min(limit, 100))
-        statement = (
-            select(self.__db_model)
-            .order_by(desc(self.__db_model.added_at))
-            .offset(offset)
-            .limit(limit)
+        statement = self._get_page_statement(
+            self.__db_model.added_at, limit, offset, cursor
         )
         db_media_list = _session.exec(statement).all()
         return self._convert_to_read_list(db_media_list)
@@ -239,29 +418,52 @@ class DatabaseManager[
         self,
         limit: int = 100,
         offset: int = 0,
+        cursor: str | None = None,
         *,
         _session: Session = None,  # type: ignore
     ) -> list[_MediaRead]:
         """Get the most recently downloaded media objects from the database.\n
+        Media without a downloaded trailer are excluded.\n
         Args:
             limit (int) [Optional]: The number of recent media items to get. Max 100
             offset (int) [Optional]: The offset to start from. Default is 0.
+            cursor (str) [Optional]: Cursor to get the items after, \
+                see `get_next_cursor`. Default is None.
             _session (Session) [Optional]: A session to use for the database connection.\n
                 Default is None, in which case a new session will be created.\n
         Returns:
-            list[MediaRead]: List of MediaRead objects.
+            list[MediaRead]: List of MediaRead objects.\n
+        Raises:
+            ValueError: If the cursor is invalid.
         """
-        offset = max(0, offset)
-        limit = max(1, min(limit, 100))
-        statement = (
-            select(self.__db_model)
-            .order_by(desc(self.__db_model.downloaded_at))
-            .offset(offset)
-            .limit(limit)
-        )
+        statement = self._get_page_statement(
+            self.__db_model.downloaded_at, limit, offset, cursor
+        ).where(col(self.__db_model.downloaded_at).is_not(None))
         db_media_list = _session.exec(statement).all()
         return self._convert_to_read_list(db_media_list)
 
+    def get_next_cursor(
+        self,
+        media_list: Sequence[_MediaRead],
+        limit: int,
+        downloaded: bool = False,
+    ) -> str | None:
+        """Get the cursor for the page after `media_list`, \
+            returned by `read_recent` or `read_recently_downloaded`.\n
+        Args:
+            media_list (Sequence[MediaRead]): The media items of the current page.
+            limit (int): The limit used to get the current page.
+            downloaded (bool) [Optional]: True if the page was returned by \
+                `read_recently_downloaded`. Default is False.\n
+        Returns:
+            str | None: The cursor, or None if there are no more items.
+        """
+        if not media_list or len(media_list) < max(1, min(limit, 100)):
+            return None
+        last_media = media_list[-1]
+        sort_value = last_media.downloaded_at if downloaded else last_media.added_at
+        return encode_cursor([sort_value, last_media.id])
+
     @manage_session
     def search(
         self,
@@ -275,7 +477,9 @@ class DatabaseManager[
         If an exact match is found for `imdb id` or `txdb id`, it will return only that item.\n
         If a 4 digit number is found in the query, \
             it will only return list of media from that year [1900-2100].\n
-        Otherwise, it will return a list of [max 50 recently added] Media matching the query.\n
+        Otherwise, it will return a list of [max 50] Media matching the query, \
+            using the full-text search index with words matched as prefixes and \
+            best matches first.\n
         Args:
             query (str): The search query to search for in the media items.
             offset (int) [Optional]: The offset to start from. Default is 0.
@@ -289,10 +493,42 @@ class DatabaseManager[
         statement = self._get_search_statement(query, limit, offset)
         if statement is None:
             return []
-        db_media_list = _session.exec(statement).all()
+        try:
+            db_media_list = _session.exec(statement).all()
+        except OperationalError as e:
+            # Full-text search table is missing or query is invalid, use slow search
+            logger.warning(f"Full-text search failed, falling back to LIKE: {e}")
+            _session.rollback()
+            statement = self._get_search_statement(query, limit, offset, use_fts=False)
+            if statement is None:
+                return []
+            db_media_list = _session.exec(statement).all()
         # logger.info(f"Found {len(db_media_list)} media items.")
         return self._convert_to_read_list(db_media_list)
 
+    def get_search_statement(
+        self,
+        query: str,
+        columns: Sequence[Any],
+        *,
+        limit: int = 50,
+        use_fts: bool = True,
+    ):
+        """Get a statement to search media objects, same as `search` but \
+            selecting only the given `columns` and a `rank` column [lower is better].\n
+        Used to search Movie and Series together in a single query.\n
+        Args:
+            query (str): The search query to search for in the media items.
+            columns (Sequence[Any]): Columns of the media model to select.
+            limit (int) [Optional]: Maximum number of items to select. Default is 50.
+            use_fts (bool) [Optional]: Use the full-text search index. Default is True.\n
+        Returns:
+            Select | None: The statement, or None if the query is empty.
+        """
+        return self._get_search_statement(
+            query, limit, use_fts=use_fts, columns=columns
+        )
+
     @manage_session
     def update(
         self,
@@ -333,22 +569,57 @@ class DatabaseManager[
         media_updates: list[tuple[int, MediaUpdate]],
         *,
         _session: Session = None,  # type: ignore
-    ) -> None:
+    ) -> list[int]:
         """Update multiple media items in the database at once.\n
+        Updates are written with a single bulk `UPDATE` (executemany) by primary key.\n
         Args:
             media_updates (list[tuple[int, MediaUpdate]]): List of tuples with media id \
                 and update data.\n
             _session (Session) [Optional]: A session to use for the database connection.\n
                 Default is None, in which case a new session will be created.\n
         Returns:
-            None
-        Raises:
-            ItemNotFoundError: If any of the media items with provided id's don't exist.
+            list[int]: List of media id's that don't exist in the database, these are skipped.
         """
+        update_rows: list[dict[str, Any]] = []
         for media_id, media_update in media_updates:
-            self.update(media_id, media_update, _session=_session, _commit=False)
-        _session.commit()
-        return
+            media_update_data = media_update.model_dump(
+                exclude_unset=True,
+                exclude_defaults=True,
+                exclude_none=True,
+                exclude={"youtube_trailer_id", "downloaded_at"},
+            )
+            if not media_update_data:
+                continue
+            media_update_data["id"] = media_id
+            update_rows.append(media_update_data)
+        return self._update_rows_bulk(update_rows, _session)
+
+    @manage_session
+    def update_image_paths(
+        self,
+        media_images: list[MediaImage],
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> list[int]:
+        """Save the poster and fanart paths of media images to the database.\n
+        Paths are written with a single bulk `UPDATE` (executemany) by primary key.\n
+        Args:
+            media_images (list[MediaImage]): List of MediaImage objects.
+            _session (Session) [Optional]: A session to use for the database connection.\n
+                Default is None, in which case a new session will be created.\n
+        Returns:
+            list[int]: List of media id's that don't exist in the database, these are skipped.
+        """
+        update_rows: dict[int, dict[str, Any]] = {}
+        for media_image in media_images:
+            if media_image.image_path is None:
+                continue
+            update_row = update_rows.setdefault(media_image.id, {"id": media_image.id})
+            if media_image.is_poster:
+                update_row["poster_path"] = media_image.image_path
+            else:
+                update_row["fanart_path"] = media_image.image_path
+        return self._update_rows_bulk(list(update_rows.values()), _session)
 
     @manage_session
     def update_media_status(
@@ -387,21 +658,31 @@ class DatabaseManager[
         media_update_list: Sequence[MediaUpdateProtocol],
         *,
         _session: Session = None,  # type: ignore
-    ) -> None:
+    ) -> list[int]:
         """Update the monitoring status of multiple media items in the database at once.\n
+        Updates are written with a single bulk `UPDATE` (executemany) by primary key, \
+            and clear the `status_pending` flag of new media.\n
         Args:
             media_update_list (Sequence[MediaUpdateProtocol]): Sequence of media update objects.\n
             _session (Session) [Optional]: A session to use for the database connection.\n
                 Default is None, in which case a new session will be created.
         Returns:
-            None
-        Raises:
-            ItemNotFoundError: If any of the media items with provided id's don't exist.
+            list[int]: List of media id's that don't exist in the database, these are skipped.
         """
+        update_rows: list[dict[str, Any]] = []
         for media_update in media_update_list:
-            self.update_media_status(media_update, _session=_session, _commit=False)
-        _session.commit()
-        return
+            update_row: dict[str, Any] = {
+                "id": media_update.id,
+                "monitor": media_update.monitor,
+                "trailer_exists": media_update.trailer_exists,
+                "status_pending": False,
+            }
+            if media_update.downloaded_at:
+                update_row["downloaded_at"] = media_update.downloaded_at
+            if media_update.yt_id:
+                update_row["youtube_trailer_id"] = media_update.yt_id
+            update_rows.append(update_row)
+        return self._update_rows_bulk(update_rows, _session)
 
     @manage_session
     def delete(
@@ -515,6 +796,50 @@ class DatabaseManager[
             self._check_connection_exists(connection_id, session=session)
         return
 
+    def _get_missing_ids(self, media_ids: Sequence[int], session: Session) -> list[int]:
+        """-->>This is a private method<<-- \n
+        Get the media id's that don't exist in the database in a single query.\n
+        Args:
+            media_ids (Sequence[int]): List of media id's to check.
+            session (Session): A session to use for the database connection.\n
+        Returns:
+            list[int]: List of media id's that don't exist in the database.
+        """
+        if not media_ids:
+            return []
+        statement = select(self.__db_model.id).where(
+            col(self.__db_model.id).in_(set(media_ids))
+        )
+        existing_ids = set(session.exec(statement).all())
+        return [media_id for media_id in media_ids if media_id not in existing_ids]
+
+    def _update_rows_bulk(
+        self, update_rows: list[dict[str, Any]], session: Session
+    ) -> list[int]:
+        """-->>This is a private method<<-- \n
+        Update multiple media rows by primary key with a bulk `UPDATE` (executemany).\n
+        Rows for media that don't exist in the database are skipped.\n
+        Args:
+            update_rows (list[dict[str, Any]]): List of column values, each with an `id`.
+            session (Session): A session to use for the database connection.\n
+        Returns:
+            list[int]: List of media id's that don't exist in the database.
+        """
+        if not update_rows:
+            return []
+        missing_ids = self._get_missing_ids([row["id"] for row in update_rows], session)
+        if missing_ids:
+            logger.warning(
+                f"{self.__db_model.__name__} with id's {missing_ids} don't exist in "
+                "the database. Skipping!"
+            )
+            _missing = set(missing_ids)
+            update_rows = [row for row in update_rows if row["id"] not in _missing]
+        if update_rows:
+            session.execute(update(self.__db_model), update_rows)
+            session.commit()
+        return missing_ids
+
     def _convert_to_read_list(
         self, db_media_list: Sequence[_Media]
     ) -> list[_MediaRead]:
@@ -550,47 +875,87 @@ class DatabaseManager[
         last_match = matches[-1] if matches else None
         return last_match
 
-    def _get_txdb_statement(self, txdb_id: str):
+    def _get_select(self, columns: Sequence[Any] = ()):
+        """-->>This is a private method<<-- \n
+        Get a select statement for the given columns, or the whole model if empty.\n"""
+        if columns:
+            return select(*columns)
+        return select(self.__db_model)
+
+    def _get_txdb_statement(self, txdb_id: str, columns: Sequence[Any] = ()):
         """-->>This is a private method<<-- \n
         Get a statement for the database query with txdb id.\n"""
-        statement = select(self.__db_model).where(self.__db_model.txdb_id == txdb_id)
+        statement = self._get_select(columns).where(self.__db_model.txdb_id == txdb_id)
         return statement
 
-    def _get_imdb_statement(self, imdb_id: str):
+    def _get_imdb_statement(self, imdb_id: str, columns: Sequence[Any] = ()):
         """-->>This is a private method<<-- \n
         Get a statement for the database query with imdb id.\n"""
-        statement = select(self.__db_model).where(self.__db_model.imdb_id == imdb_id)
+        statement = self._get_select(columns).where(self.__db_model.imdb_id == imdb_id)
         return statement
 
-    def _get_year_statement(self, year: str):
+    def _get_year_statement(self, year: str, columns: Sequence[Any] = ()):
         """-->>This is a private method<<-- \n
         Get a statement for the database query with year.\n"""
-        statement = select(self.__db_model).where(self.__db_model.year == year)
+        statement = self._get_select(columns).where(self.__db_model.year == year)
         return statement
 
-    def _get_search_statement(self, query: str, limit: int = 50, offset: int = 0):
+    def _get_search_statement(
+        self,
+        query: str,
+        limit: int = 50,
+        offset: int = 0,
+        use_fts: bool = True,
+        columns: Sequence[Any] = (),
+    ):
         """-->>This is a private method<<-- \n
-        Get a search statement for the database query.\n"""
+        Get a search statement for the database query.\n
+        Uses the FTS5 full-text search table if `use_fts` is True, \
+            otherwise a `LIKE` match on title.\n
+        If `columns` are given, only those columns are selected along with a \
+            `rank` column [lower is better], so results of Movie and Series \
+            can be merged into a single query.\n"""
         # logger.info(f"Searching for: {query}")
         if not query:
             # logger.info("Empty query. Returning empty list.")
             return None
+        rank = literal(0.0).label("rank")
         imdb_id = self._extract_imdb_id(query)
         if imdb_id:
             # logger.info(f"Found imdb id: {imdb_id}")
-            return self._get_imdb_statement(imdb_id)
+            statement = self._get_imdb_statement(imdb_id, columns)
+            return statement.add_columns(rank) if columns else statement
         txdb_id = self._extract_txdb_id(query)
         if txdb_id:
             # logger.info(f"Found txdb id: {txdb_id}")
-            return self._get_txdb_statement(txdb_id)
+            statement = self._get_txdb_statement(txdb_id, columns)
+            return statement.add_columns(rank) if columns else statement
         # logger.info("No imdb or txdb id found. Building statement...")
-        statement = select(self.__db_model)
+        statement = self._get_select(columns)
         year = self._extract_four_digit_number(query)
         if year and int(year) > 1900 and int(year) < 2100:
             query = query.replace(year, "").strip().replace("  ", " ")
-            statement = self._get_year_statement(year)
+            statement = self._get_year_statement(year, columns)
             # logger.info(f"Found year: {year}")
 
+        fts_query = build_fts_query(query)
+        if use_fts and fts_query:
+            table_name = self.__db_model.__tablename__
+            fts_table = table(get_fts_table_name(table_name), column("rowid"))
+            fts_rank = literal_column(get_fts_rank(table_name))
+            if columns:
+                statement = statement.add_columns(fts_rank.label("rank"))
+            statement = (
+                statement.join(fts_table, fts_table.c.rowid == self.__db_model.id)
+                .where(literal_column(fts_table.name).op("MATCH")(fts_query))
+                .order_by(fts_rank)
+                .offset(offset)
+                .limit(limit)
+            )
+            return statement
+
+        if columns:
+            statement = statement.add_columns(rank)
         statement = (
             statement.where(
                 col(self.__db_model.title).ilike(f"%{query}%"),
@@ -606,6 +971,29 @@ class DatabaseManager[
         # logger.info(f"Final statement: {statement}")
         return statement
 
+    def _get_page_statement(
+        self, sort_column: Any, limit: int, offset: int, cursor: str | None
+    ):
+        """-->>This is a private method<<-- \n
+        Get a statement for a page of media sorted by `sort_column` and id, \
+            newest first.\n
+        If a cursor is given, only items after it are selected, \
+            using the index on `sort_column` instead of scanning `offset` rows.\n"""
+        offset = max(0, offset)
+        limit = max(1, min(limit, 100))
+        statement = select(self.__db_model)
+        if cursor:
+            last_value, last_id = decode_cursor(cursor, datetime, int)
+            statement = statement.where(
+                col(sort_column) <= last_value,
+                tuple_(sort_column, self.__db_model.id) < tuple_(last_value, last_id),
+            )
+        return (
+            statement.order_by(desc(sort_column), desc(self.__db_model.id))
+            .offset(offset)
+            .limit(limit)
+        )
+
     def _get_db_item(self, media_id: int, session: Session) -> _Media:
         """-->>This is a private method<<-- \n
         Get a media item from the database by id.\n
@@ -622,25 +1010,43 @@ class DatabaseManager[
             raise ItemNotFoundError(self.__db_model.__name__, media_id)
         return db_media
 
-    def _read_if_exists(
+    def _get_create_data(self, media_create: _MediaCreate) -> dict[str, Any]:
+        """-->>This is a private method<<-- \n
+        Get the MediaCreate fields that should be written to an existing media.\n"""
+        return media_create.model_dump(
+            exclude_unset=True,
+            # exclude_defaults=True,
+            exclude_none=True,
+            exclude={"youtube_trailer_id", "downloaded_at"},
+        )
+
+    def _read_existing_bulk(
         self,
-        connection_id: int,
-        txdb_id: str,
+        media_items: list[_MediaCreate],
         session: Session,
-    ) -> _Media | None:
+    ) -> dict[tuple[int, str], dict[str, Any]]:
         """-->>This is a private method<<-- \n
-        Check if a media item exists in the database for any given connection and arr ids.\n
+        Get the existing media rows of given media items, \
+            matched by `(connection_id, txdb_id)`.\n
+        Only the rows of given media items are loaded, so each batch of a refresh \
+            reads just its own rows instead of the whole connection.\n
         Args:
-            connection_id (int): The id of the connection to check.
-            txdb_id (str): The txdb id of the media item to check.
+            media_items (list[MediaCreate]): List of media items to check.
             session (Session): A session to use for the database connection.\n
         Returns:
-            Media | None: The media object if it exists, otherwise None.
+            dict[tuple[int, str], dict[str, Any]]: Existing media rows keyed by \
+                `(connection_id, txdb_id)`.
         """
-        statement = (
-            select(self.__db_model)
-            .where(self.__db_model.connection_id == connection_id)
-            .where(self.__db_model.txdb_id == txdb_id)
-        )
-        db_media = session.exec(statement).first()
-        return db_media
+        media_keys = {(media.connection_id, media.txdb_id) for media in media_items}
+        existing_media: dict[tuple[int, str], dict[str, Any]] = {}
+        # Keep the number of SQL variables per query well below the SQLite limit
+        for keys_batch in batched(media_keys, 400):
+            statement = select(*self.__db_model.__table__.columns).where(  # type: ignore
+                tuple_(
+                    col(self.__db_model.connection_id), col(self.__db_model.txdb_id)
+                ).in_(keys_batch)
+            )
+            for db_row in session.execute(statement).mappings():
+                key = (db_row["connection_id"], db_row["txdb_id"])
+                existing_media[key] = dict(db_row)
+        return existing_media
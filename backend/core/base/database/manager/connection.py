@@ -9,6 +9,7 @@ from core.base.database.models.connection import (
 )
 
 from core.base.database.utils.engine import manage_session
+from core.base.database.utils.executor import run_db
 from core.radarr.models import Movie
 from core.sonarr.models import Series
 from exceptions import ItemNotFoundError
@@ -19,18 +20,12 @@ from core.sonarr.api_manager import SonarrManager
 class ConnectionDatabaseManager:
     """CRUD operations for the Connection database table"""
 
-    @manage_session
-    async def create(
-        self,
-        connection: ConnectionCreate,
-        *,
-        _session: Session = None,  # type: ignore
-    ) -> str:
+    async def create(self, connection: ConnectionCreate) -> str:
         """Create a new connection in the database \n
+        The connection is validated first, then saved in the database thread pool, \
+            so the event loop isn't blocked while waiting for the database. \n
         Args:
-            connection (Connection): The connection to create
-            _session (optional): A session to use for the database connection. \
-                Defaults to None, in which case a new session is created. \n
+            connection (Connection): The connection to create \n
         Returns:
             str: The status message of the connection with version if created. \n
         Raises:
@@ -41,11 +36,28 @@ class ConnectionDatabaseManager:
         """
         # Validate the connection details, will raise an error if invalid
         status = await validate_connection(connection)
-        # Use the session to add the connection to the database
+        await run_db(self._insert, connection)
+        return status
+
+    @manage_session
+    def _insert(
+        self,
+        connection: ConnectionCreate,
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> ConnectionRead:
+        """Add a validated connection to the database. This is a private method. \n
+        Args:
+            connection (Connection): The connection to add
+            _session (optional): A session to use for the database connection. \
+                Defaults to None, in which case a new session is created. \n
+        Returns:
+            ConnectionRead: The created read-only connection object
+        """
         db_connection = Connection.model_validate(connection)
         _session.add(db_connection)
         _session.commit()
-        return status
+        return ConnectionRead.model_validate(db_connection)
 
     @manage_session
     def check_if_exists(
@@ -126,36 +138,53 @@ class ConnectionDatabaseManager:
         connection_read = ConnectionRead.model_validate(connection)
         return connection_read
 
-    @manage_session
     async def update(
+        self, connection_id: int, connection_update: ConnectionUpdate
+    ) -> ConnectionRead:
+        """Update an existing connection in the database\n
+        The updated connection is validated first, then saved in the database \
+            thread pool, so the event loop isn't blocked while waiting for the database. \n
+        Args:
+            connection_id (int): The id of the connection to update
+            connection (Connection): The connection to update \n
+        Returns:
+            ConnectionRead: The updated read-only connection object. \n
+        Raises:
+            ConnectionError: If the connection is refused / response is not 200
+            ConnectionTimeoutError: If the connection times out
+            InvalidResponseError: If API response is invalid
+            ItemNotFoundError: If a connection with provided id does not exist
+        """
+        # Get the connection from the database
+        connection = await run_db(self.read, connection_id)
+        # Validate the connection details with the updates applied
+        connection_update_data = connection_update.model_dump(exclude_unset=True)
+        await validate_connection(connection.model_copy(update=connection_update_data))
+        return await run_db(self._update, connection_id, connection_update)
+
+    @manage_session
+    def _update(
         self,
         connection_id: int,
         connection_update: ConnectionUpdate,
         *,
         _session: Session = None,  # type: ignore
     ) -> ConnectionRead:
-        """Update an existing connection in the database\n
+        """Save the validated updates of a connection. This is a private method. \n
         Args:
             connection_id (int): The id of the connection to update
-            connection (Connection): The connection to update
+            connection_update (ConnectionUpdate): The updates to save
             _session (optional): A session to use for the database connection. \
                 Defaults to None, in which case a new session is created. \n
         Returns:
             ConnectionRead: The updated read-only connection object. \n
         Raises:
-            ConnectionError: If the connection is refused / response is not 200
-            ConnectionTimeoutError: If the connection times out
-            InvalidResponseError: If API response is invalid
             ItemNotFoundError: If a connection with provided id does not exist
         """
-        # Get the connection from the database
         db_connection = self._get_db_item(connection_id, _session=_session)
         # Update the connection details from input
         connection_update_data = connection_update.model_dump(exclude_unset=True)
         db_connection.sqlmodel_update(connection_update_data)
-        # Validate the connection details
-        await validate_connection(db_connection)
-        # Commit the changes to the database
         _session.add(db_connection)
         _session.commit()
         return ConnectionRead.model_validate(db_connection)
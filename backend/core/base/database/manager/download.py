@@ -0,0 +1,338 @@
+from datetime import datetime, timedelta, timezone
+from itertools import batched
+from sqlmodel import Session, col, delete, desc, select, tuple_, update
+
+from core.base.database.models.download import (
+    IN_PROGRESS_STATUSES,
+    DownloadQueue,
+    DownloadQueueCreate,
+    DownloadQueueRead,
+    DownloadStatus,
+)
+from core.base.database.utils.engine import manage_session
+
+# Number of times a download is attempted before it is marked as failed
+MAX_ATTEMPTS = 3
+# Delay before retrying a failed download, doubled after each attempt
+RETRY_DELAY = timedelta(minutes=30)
+# Delay before a permanently failed download can be queued again automatically
+FAILED_RETRY_DELAY = timedelta(days=1)
+
+
+def get_current_time():
+    return datetime.now(timezone.utc)
+
+
+def _as_utc(dt: datetime) -> datetime:
+    """Convert a naive datetime read from database to an aware UTC datetime."""
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+class DownloadQueueDatabaseManager:
+    """CRUD operations for the DownloadQueue database table. \n
+    Download workers claim items from the queue, so queued downloads survive \
+        app restarts and the same media is never downloaded twice at once."""
+
+    @manage_session
+    def enqueue_bulk(
+        self,
+        queue_items: list[DownloadQueueCreate],
+        *,
+        force: bool = False,
+        _session: Session = None,  # type: ignore
+    ) -> list[int]:
+        """Add media to the download queue. \n
+        - Media not in the queue are added.
+        - Media already queued are updated, priority is never lowered.
+        - Media being downloaded are skipped.
+        - Finished or failed media are queued again once their \
+            `next_attempt_at` has passed, or right away if `force` is True. \n
+        Args:
+            queue_items (list[DownloadQueueCreate]): The media to add to the queue.
+            force (bool) [Optional]: Queue again and start right away, \
+                ignoring any retry backoff. Default is False.
+            _session (optional): A session to use for the database connection. \
+                Defaults to None, in which case a new session is created. \n
+        Returns:
+            list[int]: Ids of the queue items that are now queued.
+        """
+        if not queue_items:
+            return []
+        now = get_current_time()
+        keys = {(item.media_id, item.is_movie) for item in queue_items}
+        existing: dict[tuple[int, bool], DownloadQueue] = {}
+        # Keep the number of SQL variables per query well below the SQLite limit
+        for keys_batch in batched(keys, 400):
+            statement = select(DownloadQueue).where(
+                tuple_(col(DownloadQueue.media_id), col(DownloadQueue.is_movie)).in_(
+                    keys_batch
+                )
+            )
+            for db_item in _session.exec(statement).all():
+                existing[(db_item.media_id, db_item.is_movie)] = db_item
+        queued_items: list[DownloadQueue] = []
+        for item in queue_items:
+            db_item = existing.get((item.media_id, item.is_movie))
+            if db_item is None:
+                db_item = DownloadQueue.model_validate(item)
+                existing[(item.media_id, item.is_movie)] = db_item
+                _session.add(db_item)
+                queued_items.append(db_item)
+                continue
+            if db_item.status in IN_PROGRESS_STATUSES:
+                continue
+            if db_item.status != DownloadStatus.QUEUED:
+                if not force and _as_utc(db_item.next_attempt_at) > now:
+                    continue
+                db_item.status = DownloadStatus.QUEUED
+                db_item.attempts = 0
+                db_item.error = None
+                db_item.priority = item.priority
+            else:
+                db_item.priority = max(db_item.priority, item.priority)
+            if force:
+                db_item.next_attempt_at = now
+            db_item.title = item.title
+            db_item.year = item.year
+            db_item.folder_path = item.folder_path
+            if item.yt_id:
+                db_item.yt_id = item.yt_id
+            db_item.updated_at = now
+            _session.add(db_item)
+            queued_items.append(db_item)
+        _session.commit()
+        return [db_item.id for db_item in queued_items if db_item.id is not None]
+
+    @manage_session
+    def delete_queued_except(
+        self,
+        media_ids: list[int],
+        is_movie: bool,
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> None:
+        """Remove automatically queued items of media that no longer need a trailer. \n
+        Only items waiting in the queue with default priority are removed, \
+            items being downloaded and manually queued items are kept. \n
+        Args:
+            media_ids (list[int]): Ids of the media that still need a trailer.
+            is_movie (bool): Whether the media type is movie or show.
+            _session (optional): A session to use for the database connection. \
+                Defaults to None, in which case a new session is created. \n
+        Returns:
+            None
+        """
+        # Diff in memory, a `NOT IN` of all media ids can exceed the SQLite variable limit
+        select_statement = select(DownloadQueue.id, DownloadQueue.media_id).where(
+            DownloadQueue.is_movie == is_movie,
+            DownloadQueue.status == DownloadStatus.QUEUED,
+            col(DownloadQueue.priority) <= 0,
+        )
+        needed_ids = set(media_ids)
+        delete_ids = [
+            item_id
+            for item_id, media_id in _session.exec(select_statement).all()
+            if media_id not in needed_ids
+        ]
+        for ids_batch in batched(delete_ids, 400):
+            statement = delete(DownloadQueue).where(
+                col(DownloadQueue.id).in_(ids_batch),
+                # Skip items claimed by a worker since they were selected
+                DownloadQueue.status == DownloadStatus.QUEUED,
+            )
+            _session.exec(statement)  # type: ignore
+        _session.commit()
+        return
+
+    @manage_session
+    def claim_next(
+        self,
+        item_id: int | None = None,
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> DownloadQueueRead | None:
+        """Claim the next queued item that is due, with the highest priority first. \n
+        The item is marked as searching and its attempts are incremented in a single \
+            `UPDATE` statement, so concurrent workers never claim the same item. \n
+        Args:
+            item_id (int) [Optional]: Claim only the item with this id. \
+                Default is None, in which case any due item can be claimed.
+            _session (optional): A session to use for the database connection. \
+                Defaults to None, in which case a new session is created. \n
+        Returns:
+            DownloadQueueRead | None: The claimed item, None if no item is due.
+        """
+        now = get_current_time()
+        next_item = select(DownloadQueue.id).where(
+            DownloadQueue.status == DownloadStatus.QUEUED,
+            col(DownloadQueue.next_attempt_at) <= now,
+        )
+        if item_id is not None:
+            next_item = next_item.where(DownloadQueue.id == item_id)
+        next_item = next_item.order_by(
+            desc(DownloadQueue.priority),
+            col(DownloadQueue.added_at),
+            col(DownloadQueue.id),
+        ).limit(1)
+        statement = (
+            update(DownloadQueue)
+            .where(
+                col(DownloadQueue.id) == next_item.scalar_subquery(),
+                col(DownloadQueue.status) == DownloadStatus.QUEUED,
+            )
+            .values(
+                status=DownloadStatus.SEARCHING,
+                attempts=DownloadQueue.attempts + 1,
+                updated_at=now,
+            )
+            .returning(DownloadQueue)
+        )
+        db_item = _session.scalars(statement).first()
+        if db_item is None:
+            _session.rollback()
+            return None
+        queue_item = DownloadQueueRead.model_validate(db_item)
+        _session.commit()
+        return queue_item
+
+    @manage_session
+    def update_status(
+        self,
+        item_id: int,
+        status: DownloadStatus,
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> None:
+        """Update the status of a queue item that is being worked on. \n
+        Args:
+            item_id (int): The id of the queue item.
+            status (DownloadStatus): The new status.
+            _session (optional): A session to use for the database connection. \
+                Defaults to None, in which case a new session is created. \n
+        Returns:
+            None
+        """
+        statement = (
+            update(DownloadQueue)
+            .where(col(DownloadQueue.id) == item_id)
+            .values(status=status, updated_at=get_current_time())
+        )
+        _session.exec(statement)  # type: ignore
+        _session.commit()
+        return
+
+    @manage_session
+    def mark_done(
+        self,
+        item_id: int,
+        yt_id: str | None,
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> None:
+        """Mark a queue item as successfully downloaded. \n
+        Args:
+            item_id (int): The id of the queue item.
+            yt_id (str | None): The youtube id of the downloaded trailer.
+            _session (optional): A session to use for the database connection. \
+                Defaults to None, in which case a new session is created. \n
+        Returns:
+            None
+        """
+        now = get_current_time()
+        statement = (
+            update(DownloadQueue)
+            .where(col(DownloadQueue.id) == item_id)
+            .values(
+                status=DownloadStatus.DONE,
+                yt_id=yt_id,
+                error=None,
+                next_attempt_at=now,
+                updated_at=now,
+            )
+        )
+        _session.exec(statement)  # type: ignore
+        _session.commit()
+        return
+
+    @manage_session
+    def mark_failed(
+        self,
+        item_id: int,
+        error: str,
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> DownloadStatus | None:
+        """Mark a download attempt of a queue item as failed. \n
+        The item is queued again with an exponential backoff, until it has been \
+            attempted `MAX_ATTEMPTS` times, after which it is marked as failed. \n
+        Args:
+            item_id (int): The id of the queue item.
+            error (str): The reason of the failure.
+            _session (optional): A session to use for the database connection. \
+                Defaults to None, in which case a new session is created. \n
+        Returns:
+            DownloadStatus | None: The new status of the item, None if item not found.
+        """
+        db_item = _session.get(DownloadQueue, item_id)
+        if not db_item:
+            return None
+        now = get_current_time()
+        db_item.error = error
+        db_item.updated_at = now
+        if db_item.attempts >= MAX_ATTEMPTS:
+            db_item.status = DownloadStatus.FAILED
+            db_item.next_attempt_at = now + FAILED_RETRY_DELAY
+        else:
+            db_item.status = DownloadStatus.QUEUED
+            backoff = RETRY_DELAY * 2 ** max(db_item.attempts - 1, 0)
+            db_item.next_attempt_at = now + backoff
+        status = db_item.status
+        _session.add(db_item)
+        _session.commit()
+        return status
+
+    @manage_session
+    def reset_in_progress(
+        self,
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> int:
+        """Queue again the items that were being worked on, \
+            use on app startup to resume downloads interrupted by a restart. \n
+        Args:
+            _session (optional): A session to use for the database connection. \
+                Defaults to None, in which case a new session is created. \n
+        Returns:
+            int: Number of items queued again.
+        """
+        statement = (
+            update(DownloadQueue)
+            .where(col(DownloadQueue.status).in_(IN_PROGRESS_STATUSES))
+            .values(status=DownloadStatus.QUEUED, updated_at=get_current_time())
+        )
+        result = _session.exec(statement)  # type: ignore
+        _session.commit()
+        return result.rowcount
+
+    @manage_session
+    def read_all(
+        self,
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> list[DownloadQueueRead]:
+        """Read all items in the download queue, in the order they will be processed. \n
+        Args:
+            _session (optional): A session to use for the database connection. \
+                Defaults to None, in which case a new session is created. \n
+        Returns:
+            list[DownloadQueueRead]: A list of download queue items.
+        """
+        statement = select(DownloadQueue).order_by(
+            desc(DownloadQueue.priority),
+            col(DownloadQueue.added_at),
+            col(DownloadQueue.id),
+        )
+        db_items = _session.exec(statement).all()
+        return [DownloadQueueRead.model_validate(db_item) for db_item in db_items]
@@ -1,10 +1,33 @@
+from datetime import datetime
+from typing import Any
+
 from pydantic import BaseModel
-from sqlmodel import Session, col, select
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, col, desc, literal, select, tuple_, union_all
 
+from app_logger import logger
+from core.base.database.models.media import MediaDB, MediaRead
+from core.base.database.utils.cursor import decode_cursor, encode_cursor
 from core.base.database.utils.engine import manage_session
+from core.radarr.database_manager import MovieDatabaseManager
 from core.radarr.models import Movie
+from core.sonarr.database_manager import SeriesDatabaseManager
 from core.sonarr.models import Series
 
+# Columns selected by the unified media search
+_SEARCH_COLUMNS = (
+    "id",
+    "title",
+    "year",
+    "youtube_trailer_id",
+    "imdb_id",
+    "txdb_id",
+    "poster_path",
+    "added_at",
+)
+# Columns selected by the unified media listings, same as the read models
+_MEDIA_COLUMNS = tuple(MediaRead.model_fields)
+
 
 class ServerStats(BaseModel):
     trailers_downloaded: int
@@ -13,6 +36,15 @@ class ServerStats(BaseModel):
     monitored_count: int
 
 
+def _get_media_columns(
+    db_model: type[MediaDB], column_names: tuple[str, ...], is_movie: bool
+) -> list[Any]:
+    """Get the columns of a media model along with an `is_movie` column."""
+    columns: list[Any] = [getattr(db_model, name) for name in column_names]
+    columns.append(literal(is_movie).label("is_movie"))
+    return columns
+
+
 class GeneralDatabaseManager:
 
     @manage_session
@@ -47,3 +79,124 @@ class GeneralDatabaseManager:
             series_count=_series_count,
             monitored_count=_monitored_count,
         )
+
+    @manage_session
+    def search(
+        self,
+        query: str,
+        limit: int = 50,
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> list[dict[str, Any]]:
+        """Search for both movies and series in the database with a single query.\n
+        Matching rules are the same as `DatabaseManager.search`, \
+            results of both are merged and sorted by rank.\n
+        Args:
+            query (str): The search query to search for in the media items.
+            limit (int) [Optional]: The number of items to get. Max 50.
+            _session (Session) [Optional]: A session to use for the database connection.\n
+                Default is None, in which case a new session will be created.\n
+        Returns:
+            list[dict[str, Any]]: List of media data with `is_movie` key.
+        """
+        limit = max(1, min(limit, 50))
+        try:
+            return self._search(query, limit, True, _session)
+        except OperationalError as e:
+            # Full-text search table is missing or query is invalid, use slow search
+            logger.warning(f"Full-text search failed, falling back to LIKE: {e}")
+            _session.rollback()
+            return self._search(query, limit, False, _session)
+
+    @manage_session
+    def read_recently_downloaded(
+        self,
+        limit: int = 30,
+        cursor: str | None = None,
+        offset: int = 0,
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """Get the most recently downloaded movies and series with a single query.\n
+        Media without a downloaded trailer are excluded. Pass the returned cursor \
+            to get the next page.\n
+        Args:
+            limit (int) [Optional]: The number of items to get. Max 100
+            cursor (str) [Optional]: Cursor returned with the previous page.
+            offset (int) [Optional]: The offset to start from. Default is 0.
+            _session (Session) [Optional]: A session to use for the database connection.\n
+                Default is None, in which case a new session will be created.\n
+        Returns:
+            tuple[list[dict[str, Any]], str | None]: List of media data with \
+                `is_movie` key and the cursor for the next page, \
+                None if there are no more items.\n
+        Raises:
+            ValueError: If the cursor is invalid.
+        """
+        offset = max(0, offset)
+        limit = max(1, min(limit, 100))
+        last_key = decode_cursor(cursor, datetime, bool, int) if cursor else None
+        # Each table is read in index order up to the page end before merging,
+        # so the cost of a page does not grow with the size of the tables
+        statements = []
+        for db_model, is_movie in ((Movie, True), (Series, False)):
+            sort_key = (db_model.downloaded_at, literal(is_movie), db_model.id)
+            statement = select(
+                *_get_media_columns(db_model, _MEDIA_COLUMNS, is_movie)
+            ).where(col(db_model.downloaded_at).is_not(None))
+            if last_key:
+                statement = statement.where(
+                    col(db_model.downloaded_at) <= last_key[0],
+                    tuple_(*sort_key) < tuple_(*last_key),
+                )
+            statement = statement.order_by(
+                desc(db_model.downloaded_at), desc(db_model.id)
+            ).limit(offset + limit)
+            statements.append(select(statement.subquery()))
+        media_union = union_all(*statements).subquery()
+        statement = (
+            select(*media_union.c)
+            .order_by(
+                desc(media_union.c.downloaded_at),
+                desc(media_union.c.is_movie),
+                desc(media_union.c.id),
+            )
+            .offset(offset)
+            .limit(limit)
+        )
+        media_list = [row._asdict() for row in _session.exec(statement).all()]
+        next_cursor = None
+        if len(media_list) == limit:
+            last_media = media_list[-1]
+            next_cursor = encode_cursor(
+                [last_media["downloaded_at"], last_media["is_movie"], last_media["id"]]
+            )
+        return media_list, next_cursor
+
+    def _search(
+        self, query: str, limit: int, use_fts: bool, session: Session
+    ) -> list[dict[str, Any]]:
+        """-->>This is a private method<<-- \n
+        Search movies and series with a UNION of both search statements.\n"""
+        statements = []
+        for db_handler, db_model, is_movie in (
+            (MovieDatabaseManager(), Movie, True),
+            (SeriesDatabaseManager(), Series, False),
+        ):
+            statement = db_handler.get_search_statement(
+                query,
+                _get_media_columns(db_model, _SEARCH_COLUMNS, is_movie),
+                limit=limit,
+                use_fts=use_fts,
+            )
+            if statement is None:
+                return []
+            # Wrap in a subquery, SQLite does not allow ORDER BY/LIMIT in UNION parts
+            statements.append(select(statement.subquery()))
+        media_union = union_all(*statements).subquery()
+        statement = (
+            select(*media_union.c)
+            .order_by(media_union.c.rank, desc(media_union.c.added_at))
+            .limit(limit)
+        )
+        return [row._asdict() for row in session.exec(statement).all()]
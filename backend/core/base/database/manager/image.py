@@ -0,0 +1,154 @@
+from itertools import batched
+
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import Session, col, delete, func, select, tuple_, union_all
+
+from core.base.database.models.helpers import ImageSourceDC
+from core.base.database.models.image import ImageSource, get_current_time
+from core.base.database.utils.engine import manage_session
+from core.radarr.models import Movie
+from core.sonarr.models import Series
+
+
+class ImageDatabaseManager:
+    """CRUD operations for the image store. \n
+    Image files are shared by all media with the same content, \
+        media rows reference them through `poster_path` and `fanart_path`."""
+
+    @manage_session
+    def read_sources(
+        self,
+        images: list[tuple[str, bool]],
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> dict[tuple[str, bool], ImageSourceDC]:
+        """Get the content hashes and HTTP validators of already downloaded images. \n
+        Args:
+            images (list[tuple[str, bool]]): List of (url, is_poster) of images.
+            _session (optional): A session to use for the database connection. \
+                Defaults to None, in which case a new session is created. \n
+        Returns:
+            dict[tuple[str, bool], ImageSourceDC]: Image sources keyed by \
+                (url, is_poster), images that were never downloaded are not included.
+        """
+        image_sources: dict[tuple[str, bool], ImageSourceDC] = {}
+        # Keep the number of SQL variables per query well below the SQLite limit
+        for images_batch in batched(images, 400):
+            statement = select(
+                ImageSource.url,
+                ImageSource.is_poster,
+                ImageSource.content_hash,
+                ImageSource.etag,
+                ImageSource.last_modified,
+            ).where(
+                tuple_(col(ImageSource.url), col(ImageSource.is_poster)).in_(
+                    images_batch
+                )
+            )
+            for url, is_poster, *source in _session.exec(statement).all():
+                image_sources[(url, is_poster)] = ImageSourceDC(*source)
+        return image_sources
+
+    @manage_session
+    def save_sources(
+        self,
+        image_sources: dict[tuple[str, bool], ImageSourceDC],
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> None:
+        """Save the content hashes and HTTP validators of downloaded images, \
+            replacing existing ones. \n
+        Args:
+            image_sources (dict[tuple[str, bool], ImageSourceDC]): Image sources \
+                keyed by (url, is_poster).
+            _session (optional): A session to use for the database connection. \
+                Defaults to None, in which case a new session is created. \n
+        Returns:
+            None
+        """
+        if not image_sources:
+            return
+        now = get_current_time()
+        for sources_batch in batched(image_sources.items(), 500):
+            statement = insert(ImageSource).values(
+                [
+                    {
+                        "url": url,
+                        "is_poster": is_poster,
+                        "content_hash": source.content_hash,
+                        "etag": source.etag,
+                        "last_modified": source.last_modified,
+                        "updated_at": now,
+                    }
+                    for (url, is_poster), source in sources_batch
+                ]
+            )
+            statement = statement.on_conflict_do_update(
+                index_elements=["url", "is_poster"],
+                set_={
+                    "content_hash": statement.excluded.content_hash,
+                    "etag": statement.excluded.etag,
+                    "last_modified": statement.excluded.last_modified,
+                    "updated_at": statement.excluded.updated_at,
+                },
+            )
+            _session.execute(statement)
+        _session.commit()
+        return
+
+    @manage_session
+    def read_references(
+        self,
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> dict[str, int]:
+        """Get the number of media rows referencing each image path. \n
+        Args:
+            _session (optional): A session to use for the database connection. \
+                Defaults to None, in which case a new session is created. \n
+        Returns:
+            dict[str, int]: Reference count keyed by image path.
+        """
+        image_paths = union_all(
+            *(
+                select(col(image_path).label("image_path")).where(
+                    col(image_path).is_not(None)
+                )
+                for image_path in (
+                    Movie.poster_path,
+                    Movie.fanart_path,
+                    Series.poster_path,
+                    Series.fanart_path,
+                )
+            )
+        ).subquery()
+        statement = select(image_paths.c.image_path, func.count()).group_by(
+            image_paths.c.image_path
+        )
+        return {
+            image_path: count
+            for image_path, count in _session.exec(statement).all()  # type: ignore
+        }
+
+    @manage_session
+    def delete_hashes(
+        self,
+        content_hashes: list[str],
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> None:
+        """Delete the URL mappings of images removed from the image store. \n
+        Args:
+            content_hashes (list[str]): Content hashes of the removed images.
+            _session (optional): A session to use for the database connection. \
+                Defaults to None, in which case a new session is created. \n
+        Returns:
+            None
+        """
+        for hashes_batch in batched(content_hashes, 500):
+            statement = delete(ImageSource).where(
+                col(ImageSource.content_hash).in_(hashes_batch)
+            )
+            _session.exec(statement)  # type: ignore
+        _session.commit()
+        return
@@ -0,0 +1,134 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import Session, col, delete, select
+
+from core.base.database.models.trailer_search import TrailerSearch
+from core.base.database.utils.engine import manage_session
+
+# Time a search result is cached before YouTube is searched again
+SEARCH_CACHE_TTL = timedelta(days=7)
+# Time a search without any usable result is cached, shorter so it's retried sooner
+NEGATIVE_CACHE_TTL = timedelta(hours=12)
+
+
+def get_current_time():
+    return datetime.now(timezone.utc)
+
+
+class TrailerSearchDatabaseManager:
+    """CRUD operations for the TrailerSearch database table. \n
+    Caches ranked candidate video ids of YouTube trailer searches."""
+
+    @manage_session
+    def read(
+        self,
+        search_key: str,
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> list[str] | None:
+        """Get the cached candidate video ids of a search, if not expired. \n
+        Args:
+            search_key (str): The normalized search key.
+            _session (optional): A session to use for the database connection. \
+                Defaults to None, in which case a new session is created. \n
+        Returns:
+            list[str] | None: Ranked candidate video ids, empty if the search \
+                found nothing. None if the search is not cached or expired.
+        """
+        statement = select(TrailerSearch.video_ids).where(
+            TrailerSearch.search_key == search_key,
+            TrailerSearch.expires_at > get_current_time(),
+        )
+        video_ids = _session.exec(statement).first()
+        if video_ids is None:
+            return None
+        return video_ids.split(",") if video_ids else []
+
+    @manage_session
+    def save(
+        self,
+        search_key: str,
+        video_ids: list[str],
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> None:
+        """Save the candidate video ids of a search, replacing any cached result. \n
+        Args:
+            search_key (str): The normalized search key.
+            video_ids (list[str]): Ranked candidate video ids, empty if none found.
+            _session (optional): A session to use for the database connection. \
+                Defaults to None, in which case a new session is created. \n
+        Returns:
+            None
+        """
+        now = get_current_time()
+        ttl = SEARCH_CACHE_TTL if video_ids else NEGATIVE_CACHE_TTL
+        statement = insert(TrailerSearch).values(
+            search_key=search_key,
+            video_ids=",".join(video_ids),
+            expires_at=now + ttl,
+            updated_at=now,
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=["search_key"],
+            set_={
+                "video_ids": statement.excluded.video_ids,
+                "expires_at": statement.excluded.expires_at,
+                "updated_at": statement.excluded.updated_at,
+            },
+        )
+        _session.execute(statement)
+        _session.commit()
+        return
+
+    @manage_session
+    def discard(
+        self,
+        search_key: str,
+        video_id: str,
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> None:
+        """Remove a candidate that failed to download from a cached search. \n
+        If no candidates are left, the search is cached as not found. \n
+        Args:
+            search_key (str): The normalized search key.
+            video_id (str): The video id to remove.
+            _session (optional): A session to use for the database connection. \
+                Defaults to None, in which case a new session is created. \n
+        Returns:
+            None
+        """
+        db_search = _session.get(TrailerSearch, search_key)
+        if db_search is None or not db_search.video_ids:
+            return
+        video_ids = [_id for _id in db_search.video_ids.split(",") if _id != video_id]
+        now = get_current_time()
+        db_search.video_ids = ",".join(video_ids)
+        if not video_ids:
+            db_search.expires_at = now + NEGATIVE_CACHE_TTL
+        db_search.updated_at = now
+        _session.add(db_search)
+        _session.commit()
+        return
+
+    @manage_session
+    def delete_expired(
+        self,
+        *,
+        _session: Session = None,  # type: ignore
+    ) -> None:
+        """Delete all expired searches from the cache. \n
+        Args:
+            _session (optional): A session to use for the database connection. \
+                Defaults to None, in which case a new session is created. \n
+        Returns:
+            None
+        """
+        statement = delete(TrailerSearch).where(
+            col(TrailerSearch.expires_at) <= get_current_time()
+        )
+        _session.exec(statement)  # type: ignore
+        _session.commit()
+        return
@@ -0,0 +1,85 @@
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Optional
+
+from sqlmodel import Field, SQLModel, UniqueConstraint
+
+
+def get_current_time():
+    return datetime.now(timezone.utc)
+
+
+class DownloadStatus(Enum):
+    QUEUED = "queued"
+    SEARCHING = "searching"
+    DOWNLOADING = "downloading"
+    CONVERTING = "converting"
+    DONE = "done"
+    FAILED = "failed"
+
+
+# Statuses of items that are being worked on by a download worker
+IN_PROGRESS_STATUSES = (
+    DownloadStatus.SEARCHING,
+    DownloadStatus.DOWNLOADING,
+    DownloadStatus.CONVERTING,
+)
+
+
+class DownloadQueueBase(SQLModel):
+    """Base class for the DownloadQueue model
+
+    Note:
+
+        **DO NOT USE THIS CLASS DIRECTLY.**
+
+    Use DownloadQueueCreate or DownloadQueueRead instead.
+    """
+
+    media_id: int
+    is_movie: bool
+    title: str
+    year: int
+    folder_path: str
+    yt_id: Optional[str] = None
+    priority: int = 0
+
+
+class DownloadQueue(DownloadQueueBase, table=True):
+    """DownloadQueue model for the database. \n
+    Holds one row per media, so the same media is never queued twice.
+
+    Note:
+
+        **DO NOT USE THIS CLASS DIRECTLY.**
+
+    Use DownloadQueueCreate or DownloadQueueRead instead.
+    """
+
+    __table_args__ = (UniqueConstraint("media_id", "is_movie"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    status: DownloadStatus = Field(default=DownloadStatus.QUEUED, index=True)
+    attempts: int = 0
+    next_attempt_at: datetime = Field(default_factory=get_current_time)
+    error: Optional[str] = None
+    added_at: datetime = Field(default_factory=get_current_time)
+    updated_at: datetime = Field(default_factory=get_current_time)
+
+
+class DownloadQueueCreate(DownloadQueueBase):
+    """DownloadQueue model for adding a media to the download queue."""
+
+    pass
+
+
+class DownloadQueueRead(DownloadQueueBase):
+    """DownloadQueue model for reading a download queue item."""
+
+    id: int
+    status: DownloadStatus
+    attempts: int
+    next_attempt_at: datetime
+    error: Optional[str]
+    added_at: datetime
+    updated_at: datetime
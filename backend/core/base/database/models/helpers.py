@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from datetime import datetime
 
 
-@dataclass
+@dataclass(eq=False, slots=True)
 class MediaImage:
     """Class for working with media images."""
 
@@ -12,7 +12,16 @@ class MediaImage:
     image_path: str | None
 
 
-@dataclass
+@dataclass(eq=False, slots=True)
+class ImageSourceDC:
+    """Class for working with images downloaded to the image store."""
+
+    content_hash: str
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+@dataclass(eq=False, slots=True)
 class MediaTrailer:
     """Class for working with media trailers."""
 
@@ -31,6 +40,7 @@ class MediaReadDC:
     folder_path: str | None
     arr_monitored: bool
     monitor: bool
+    trailer_exists: bool = False
 
 
 @dataclass(eq=False, frozen=True, repr=False, slots=True)
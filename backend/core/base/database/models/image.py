@@ -0,0 +1,25 @@
+from datetime import datetime, timezone
+
+from sqlmodel import Field, SQLModel
+
+
+def get_current_time():
+    return datetime.now(timezone.utc)
+
+
+class ImageSource(SQLModel, table=True):
+    """ImageSource model for the database. \n
+    Maps an image URL to the hash of its resized content in the image store, \
+        so the same URL is not downloaded again for every media that uses it. \n
+    Posters and fanart of the same URL are resized differently, \
+        so `is_poster` is part of the key. \n
+    `etag` and `last_modified` are the validators sent by the server, \
+        used to check if the image changed without downloading it again.
+    """
+
+    url: str = Field(primary_key=True)
+    is_poster: bool = Field(primary_key=True)
+    content_hash: str = Field(index=True)
+    etag: str | None = None
+    last_modified: str | None = None
+    updated_at: datetime = Field(default_factory=get_current_time)
@@ -56,9 +56,12 @@ class MediaDB(MediaBase):
     id: int | None = Field(default=None, primary_key=True)
     connection_id: int = Field(foreign_key="connection.id", index=True)
 
-    added_at: datetime = Field(default_factory=get_current_time)
+    added_at: datetime = Field(default_factory=get_current_time, index=True)
     updated_at: datetime = Field(default_factory=get_current_time)
-    downloaded_at: datetime | None = Field(default=None)
+    downloaded_at: datetime | None = Field(default=None, index=True)
+    arr_fingerprint: str | None = Field(default=None)
+    # Set for new media until a refresh evaluates their monitor and trailer status
+    status_pending: bool = Field(default=False)
 
 
 class MediaCreate(MediaBase):
@@ -76,9 +79,10 @@ class MediaCreate(MediaBase):
     - trailer_exists: False
     - monitor: False
     - arr_monitored: False
+    - arr_fingerprint: None
     """
 
-    pass
+    arr_fingerprint: str | None = None
 
 
 class MediaRead(MediaBase):
@@ -0,0 +1,22 @@
+from datetime import datetime, timezone
+
+from sqlmodel import Field, SQLModel
+
+
+def get_current_time():
+    return datetime.now(timezone.utc)
+
+
+class TrailerSearch(SQLModel, table=True):
+    """TrailerSearch model for the database. \n
+    Caches the results of a YouTube trailer search, \
+        so retries and later runs don't search YouTube again. \n
+    `search_key` is the normalized media type, title and year. \n
+    `video_ids` are the ranked candidate video ids, separated by commas. \
+        Empty if the search found nothing, or all candidates failed to download.
+    """
+
+    search_key: str = Field(primary_key=True)
+    video_ids: str = ""
+    expires_at: datetime = Field(index=True)
+    updated_at: datetime = Field(default_factory=get_current_time)
@@ -0,0 +1,45 @@
+import base64
+from datetime import datetime
+import json
+from typing import Any, Sequence
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort key values of the last item in a page into an opaque cursor. \n
+    Args:
+        values (Sequence[Any]): Sort key values, datetimes are stored in ISO format. \n
+    Returns:
+        str: URL safe cursor string."""
+
+    def _default(value: Any) -> Any:
+        if isinstance(value, datetime):
+            return value.isoformat()
+        raise TypeError(f"Cannot encode {type(value).__name__} in cursor")
+
+    data = json.dumps(list(values), default=_default, separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: type) -> list[Any]:
+    """Decode a cursor created with `encode_cursor` back into sort key values. \n
+    Args:
+        cursor (str): The cursor string.
+        *types (type): Expected type of each value [datetime, bool, int, str]. \n
+    Returns:
+        list[Any]: Sort key values converted to the given types. \n
+    Raises:
+        ValueError: If the cursor is invalid."""
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(cursor + padding))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if not isinstance(values, list) or len(values) != len(types):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    try:
+        return [
+            datetime.fromisoformat(value) if _type is datetime else _type(value)
+            for value, _type in zip(values, types)
+        ]
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
@@ -1,11 +1,81 @@
 from contextlib import contextmanager
 from functools import wraps
 from typing import Any, Generator
-from sqlalchemy import StaticPool
+from sqlalchemy import Engine, StaticPool, event
 from sqlmodel import SQLModel, Session, create_engine
 
+from app_logger import ModuleLogger
 from config.settings import app_settings
 
+logger = ModuleLogger("Database")
+
+# Values returned by SQLite when reading the numeric pragmas back
+_PRAGMA_READ_VALUES = {
+    "synchronous": {"OFF": 0, "NORMAL": 1, "FULL": 2, "EXTRA": 3},
+    "temp_store": {"DEFAULT": 0, "FILE": 1, "MEMORY": 2},
+}
+
+
+def get_sqlite_pragmas() -> dict[str, str | int]:
+    """Get the SQLite pragmas to apply on each new connection from the settings. \n
+    Values are validated by the settings, invalid ones fall back to the defaults. \n
+    Returns:
+        dict[str, str | int]: Pragma names and values, in the order to apply them."""
+    pragmas: dict[str, str | int] = {
+        "journal_mode": app_settings.sqlite_journal_mode,
+        "synchronous": app_settings.sqlite_synchronous,
+        "busy_timeout": app_settings.sqlite_busy_timeout,
+        "mmap_size": app_settings.sqlite_mmap_size,
+        "cache_size": app_settings.sqlite_cache_size,
+        "temp_store": app_settings.sqlite_temp_store,
+    }
+    return pragmas
+
+
+def apply_sqlite_pragmas(dbapi_connection: Any, pragmas: dict[str, str | int]) -> None:
+    """Apply the pragmas to a DBAPI (sqlite3) connection. \n
+    Args:
+        dbapi_connection (Any): The sqlite3 connection.
+        pragmas (dict[str, str | int]): Pragma names and values to apply."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+    finally:
+        cursor.close()
+    return
+
+
+def check_sqlite_pragmas(
+    db_engine: Engine, pragmas: dict[str, str | int] | None = None
+) -> dict[str, Any]:
+    """Check that the pragmas are in effect on a connection of the engine. \n
+    Logs a warning for each pragma that SQLite did not apply, \
+        e.g. WAL journal mode is not supported on some network file systems. \n
+    Args:
+        db_engine (Engine): The engine to check.
+        pragmas (dict[str, str | int]) [Optional]: Expected pragmas. \
+            Default is the pragmas from settings. \n
+    Returns:
+        dict[str, Any]: Pragma names and their current values."""
+    if pragmas is None:
+        pragmas = get_sqlite_pragmas()
+    current: dict[str, Any] = {}
+    with db_engine.connect() as connection:
+        for name, value in pragmas.items():
+            result = connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+            current[name] = result
+            expected = _PRAGMA_READ_VALUES.get(name, {}).get(str(value), value)
+            if isinstance(result, str) and isinstance(expected, str):
+                result, expected = result.upper(), expected.upper()
+            if result != expected:
+                logger.warning(
+                    f"SQLite {name} is '{current[name]}', expected '{value}'"
+                )
+    logger.debug(f"SQLite pragmas: {current}")
+    return current
+
+
 # sqlite_file_name = "database.db"
 sqlite_url = app_settings.database_url
 if app_settings.testing:
@@ -21,6 +91,13 @@ if app_settings.testing:
     SQLModel.metadata.create_all(engine)
 else:
     engine = create_engine(sqlite_url, echo=False)  # pragma: no cover
+    _sqlite_pragmas = get_sqlite_pragmas()  # pragma: no cover
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):  # pragma: no cover
+        apply_sqlite_pragmas(dbapi_connection, _sqlite_pragmas)
+
+
 # * Not needed, Alembic will create the database tables
 # SQLModel.metadata.create_all(engine)
 
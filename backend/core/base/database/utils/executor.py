@@ -0,0 +1,56 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import threading
+from typing import Callable
+
+from config.settings import app_settings
+
+# SQLite calls are blocking, run them in a small dedicated thread pool so they
+# don't block the event loop or compete with other work in the default executor.
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Get the database thread pool, creating it if needed."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=app_settings.db_thread_pool_size,
+                thread_name_prefix="db",
+            )
+        return _executor
+
+
+async def run_db[**_P, _R](
+    func: Callable[_P, _R], *args: _P.args, **kwargs: _P.kwargs
+) -> _R:
+    """Run a blocking database function in the database thread pool and await it. \n
+    Use this to call `DatabaseManager` methods from async code. \n
+    Args:
+        func (Callable): The function to run.
+        *args: Positional arguments for the function.
+        **kwargs: Keyword arguments for the function. \n
+    Returns:
+        The return value of the function, exceptions raised by it are re-raised. \n
+    Example::
+
+        movie = await run_db(MovieDatabaseManager().read, movie_id)
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_executor(), functools.partial(func, *args, **kwargs)
+    )
+
+
+def shutdown_db_executor() -> None:
+    """Shutdown the database thread pool after running the pending calls. \n
+    A new pool is created if `run_db` is called again."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+    return
@@ -0,0 +1,87 @@
+import re
+
+from sqlalchemy import DDL, Table, event
+
+# Columns of the media tables indexed for full-text search, in FTS table order
+FTS_COLUMNS = ("title", "overview", "imdb_id", "txdb_id")
+# bm25 weights for the FTS columns, matches in title rank highest
+_BM25_WEIGHTS = "10.0, 1.0, 5.0, 5.0"
+
+
+def get_fts_table_name(table_name: str) -> str:
+    """Get the name of the full-text search table for a media table."""
+    return f"{table_name}_fts"
+
+
+def get_fts_rank(table_name: str) -> str:
+    """Get the SQL expression to rank full-text search results with bm25. \n
+    Lower values are better matches."""
+    return f"bm25({get_fts_table_name(table_name)}, {_BM25_WEIGHTS})"
+
+
+def get_fts_create_ddl(table_name: str) -> list[str]:
+    """Get the SQL statements to create the FTS5 table for a media table \
+        and the triggers that keep it in sync with the media table. \n
+    The FTS5 table is an external content table, so the text is not duplicated. \n
+    Args:
+        table_name (str): Name of the media table. \n
+    Returns:
+        list[str]: SQL statements to execute in order."""
+    fts_table = get_fts_table_name(table_name)
+    columns = ", ".join(FTS_COLUMNS)
+    new_values = ", ".join(f"new.{column}" for column in FTS_COLUMNS)
+    old_values = ", ".join(f"old.{column}" for column in FTS_COLUMNS)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5("
+        f"{columns}, content='{table_name}', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {table_name} "
+        f"BEGIN INSERT INTO {fts_table}(rowid, {columns}) "
+        f"VALUES (new.id, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {table_name} "
+        f"BEGIN INSERT INTO {fts_table}({fts_table}, rowid, {columns}) "
+        f"VALUES ('delete', old.id, {old_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE OF {columns} "
+        f"ON {table_name} "
+        f"BEGIN INSERT INTO {fts_table}({fts_table}, rowid, {columns}) "
+        f"VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts_table}(rowid, {columns}) "
+        f"VALUES (new.id, {new_values}); END",
+    ]
+
+
+def get_fts_rebuild_ddl(table_name: str) -> str:
+    """Get the SQL statement to rebuild the FTS5 index from the media table."""
+    fts_table = get_fts_table_name(table_name)
+    return f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')"
+
+
+def get_fts_drop_ddl(table_name: str) -> list[str]:
+    """Get the SQL statements to drop the FTS5 table and triggers of a media table."""
+    fts_table = get_fts_table_name(table_name)
+    return [
+        f"DROP TRIGGER IF EXISTS {fts_table}_au",
+        f"DROP TRIGGER IF EXISTS {fts_table}_ad",
+        f"DROP TRIGGER IF EXISTS {fts_table}_ai",
+        f"DROP TABLE IF EXISTS {fts_table}",
+    ]
+
+
+def add_fts_listeners(table: Table) -> None:
+    """Create the FTS5 table and triggers whenever the media table is created \
+        with `create_all`. Databases managed by Alembic create them in migrations."""
+    for statement in get_fts_create_ddl(table.name):
+        event.listen(table, "after_create", DDL(statement))
+    return
+
+
+def build_fts_query(query: str) -> str:
+    """Convert a user search query to an FTS5 MATCH expression. \n
+    Each word is quoted (so FTS5 syntax in the query is ignored) and \
+        matched as a prefix, all words must match. \n
+    Args:
+        query (str): The search query. \n
+    Returns:
+        str: The FTS5 MATCH expression, empty string if query has no words."""
+    words = re.findall(r"\w+", query)
+    return " ".join(f'"{word}"*' for word in words)
@@ -3,11 +3,13 @@ from sqlmodel import SQLModel
 # !!! IMPORTANT !!!
 # Import all the models that are used in the application so that SQLModel can create the tables
 from core.base.database.models.connection import Connection  # noqa: F401
+from core.base.database.models.download import DownloadQueue  # noqa: F401
+from core.base.database.models.image import ImageSource  # noqa: F401
+from core.base.database.models.trailer_search import TrailerSearch  # noqa: F401
 from core.radarr.models import Movie  # noqa: F401
 from core.sonarr.models import Series  # noqa: F401
 from core.base.database.utils.engine import engine
 
-
 #  make sure all SQLModel models are imported (database.models) before initializing DB
 #  otherwise, SQLModel might fail to initialize relationships properly
 
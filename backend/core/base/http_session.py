@@ -0,0 +1,64 @@
+import asyncio
+import threading
+import weakref
+
+import aiohttp
+
+from app_logger import ModuleLogger
+from config.settings import app_settings
+
+logger = ModuleLogger("HTTPSession")
+
+# aiohttp sessions are bound to an event loop, background tasks run in their own loops.
+# So, keep one pooled session per event loop and share it within that loop.
+_sessions: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]
+_sessions = weakref.WeakKeyDictionary()
+_sessions_lock = threading.Lock()
+
+
+def _create_session() -> aiohttp.ClientSession:
+    """Create a new aiohttp session with a pooled, keep-alive connector \
+        configured from app settings."""
+    connector = aiohttp.TCPConnector(
+        limit=app_settings.http_pool_limit,
+        limit_per_host=app_settings.http_pool_limit_per_host,
+        keepalive_timeout=app_settings.http_keepalive_timeout,
+        ttl_dns_cache=300,
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=app_settings.http_timeout,
+        sock_connect=30,
+    )
+    return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+
+def get_session() -> aiohttp.ClientSession:
+    """Get the shared aiohttp session for the running event loop. \n
+    A new session is created if one doesn't exist yet or if it was closed. \n
+    Connections are pooled and kept alive between requests, \
+        so do not close the returned session, use `close_session` instead. \n
+    Returns:
+        aiohttp.ClientSession: The shared session for the running event loop.
+    Raises:
+        RuntimeError: If called outside of a running event loop.
+    """
+    loop = asyncio.get_running_loop()
+    with _sessions_lock:
+        session = _sessions.get(loop)
+        if session is None or session.closed:
+            session = _create_session()
+            _sessions[loop] = session
+    return session
+
+
+async def close_session() -> None:
+    """Close the shared aiohttp session for the running event loop, if any. \n
+    Call this before closing an event loop that used `get_session`."""
+    loop = asyncio.get_running_loop()
+    with _sessions_lock:
+        session = _sessions.pop(loop, None)
+    if session is None or session.closed:
+        return
+    await session.close()
+    logger.debug("Closed shared HTTP session")
+    return
@@ -1,45 +1,56 @@
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import hashlib
 from io import BytesIO
-import aiohttp
+import os
+import threading
+import time
+from typing import Container
+import uuid
+import aiofiles
 import aiofiles.os
 from PIL import Image
-from async_lru import alru_cache
 
 from app_logger import logger
 from config.settings import app_settings
-from core.base.database.models.helpers import MediaImage
-
+from core.base.database.models.helpers import ImageSourceDC, MediaImage
+from core.base.http_session import get_session
 
 POSTER = (300, 450)
 FANART = (1280, 720)
-STATIC_PATH_MOVIES = f"{app_settings.app_data_dir}/web/images/movies/"
-STATIC_PATH_SHOWS = f"{app_settings.app_data_dir}/web/images/shows/"
+IMAGES_PATH = f"{app_settings.app_data_dir}/web/images/"
+# Images are stored once by the hash of their content, and shared by all media
+STORE_PATH = f"{IMAGES_PATH}store/"
+# Images are streamed to disk in chunks of this size
+_CHUNK_SIZE = 64 * 1024
+# Larger downloads are aborted, posters and fanart are a few MB at most
+_MAX_IMAGE_SIZE = 50 * 1024 * 1024
+# Unreferenced files newer than this are kept, they may belong to a running refresh
+_CLEANUP_GRACE_SECONDS = 60 * 60
 
+# Pillow decode/resize/encode is CPU bound, run it in a small thread pool
+# (Pillow releases the GIL while processing) to keep the event loop responsive.
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
 
-@alru_cache
-async def get_base_path(is_movie: bool, is_poster: bool) -> str:
-    """Get the base path for saving images. \n
-    Args:
-        is_movie (bool): Whether the media type is movie or show.
-        is_poster (bool): Whether the image is a poster or fanart."""
-    base_path = STATIC_PATH_MOVIES if is_movie else STATIC_PATH_SHOWS
-    base_path += "posters/" if is_poster else "fanart/"
-    # Create directories if they don't exist
-    try:
-        await aiofiles.os.makedirs(base_path, exist_ok=True)
-    except Exception:
-        logger.error(f"Unable to create images folder: '{base_path}'")
-        pass
-    return base_path
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Get the image processing thread pool, creating it if needed."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=app_settings.image_process_workers,
+                thread_name_prefix="image",
+            )
+        return _executor
 
 
-def get_md5_filename(url: str) -> str:
-    """Get the MD5 hash of the image URL. \n
+def get_store_path(content_hash: str) -> str:
+    """Get the path of an image in the image store. \n
     Args:
-        url (str): URL of the image."""
-    # Return the MD5 hash of the URL as the filename (str)
-    return hashlib.md5(url.encode()).hexdigest()
+        content_hash (str): SHA-256 hash of the image content."""
+    return f"{STORE_PATH}{content_hash[:2]}/{content_hash}.jpg"
 
 
 async def delete_image(image_path: str):
@@ -52,104 +63,230 @@ async def delete_image(image_path: str):
         pass
 
 
-async def download_needed(is_movie: bool, media: MediaImage) -> bool:
-    """Check if a poster or fanart needs to be downloaded. \n
-    If image URL updated, deletes old image and sets new path. \n
-    This modifies the `media` object's `image_path` if needed. \n
+async def download_image(
+    url: str, file_path: str, validators: ImageSourceDC | None = None
+) -> tuple[str | None, str | None] | None:
+    """Download an image from a URL, streaming it to disk. \n
+    If `validators` are given, a conditional request is made and \
+        nothing is downloaded if the image did not change since. \n
     Args:
-        is_movie (bool): Whether the media type is movie or show.
-        media (MediaImage): Media image object."""
-    if not media.image_url:
+        url (str): URL of the image.
+        file_path (str): Path to save the downloaded file.
+        validators (ImageSourceDC) [Optional]: ETag and Last-Modified of the \
+            previously downloaded image. Default is None. \n
+    Returns:
+        tuple[str | None, str | None] | None: ETag and Last-Modified of the \
+            downloaded image, None if the image was not modified. \n
+    Raises:
+        aiohttp.ClientResponseError: If the response status is not OK.
+        ValueError: If the image is larger than the maximum allowed size."""
+    headers: dict[str, str] = {}
+    if validators and validators.etag:
+        headers["If-None-Match"] = validators.etag
+    if validators and validators.last_modified:
+        headers["If-Modified-Since"] = validators.last_modified
+    session = get_session()
+    async with session.get(url, headers=headers) as response:
+        if response.status == 304:
+            return None
+        response.raise_for_status()
+        size = 0
+        async with aiofiles.open(file_path, "wb") as file:
+            async for chunk in response.content.iter_chunked(_CHUNK_SIZE):
+                size += len(chunk)
+                if size > _MAX_IMAGE_SIZE:
+                    raise ValueError(f"Image is too large: '{url}'")
+                await file.write(chunk)
+        return response.headers.get("ETag"), response.headers.get("Last-Modified")
+
+
+def resize_image(source_path: str, dimensions: tuple[int, int]) -> bytes:
+    """Resize an image to fit in the given dimensions and encode it as JPEG. \n
+    JPEG images are decoded at a reduced size with `draft` when possible, \
+        so large images use less memory and CPU. \n
+    This is CPU bound, run it in a thread pool from async code. \n
+    Args:
+        source_path (str): Path of the downloaded image.
+        dimensions (tuple[int, int]): Maximum width and height of the image. \n
+    Returns:
+        bytes: The resized JPEG image."""
+    with Image.open(source_path) as image:
+        # Only has an effect on JPEG, picks the smallest scale >= dimensions
+        image.draft("RGB", dimensions)
+        image.thumbnail(dimensions)
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        image_file = BytesIO()
+        image.save(image_file, format="JPEG", optimize=True)
+    return image_file.getvalue()
+
+
+def _touch_image(image_path: str) -> bool:
+    """-->>This is a private method<<-- \n
+    Update the modified time of a stored image that is reused, so cleanup of a \
+        concurrent job keeps it until the media referencing it are saved. \n
+    Returns False if the image doesn't exist."""
+    try:
+        os.utime(image_path)
+    except FileNotFoundError:
         return False
-    base_path = await get_base_path(is_movie, media.is_poster)
-    filename = get_md5_filename(media.image_url)
-    file_path = base_path + f"{filename}.jpg"
-    # Check if a poster/artwork already exists
-    if media.image_path:
-        # Check if the existing path matches with new path
-        if media.image_path != file_path:
-            logger.debug(
-                f"Image updated for media id: {media.id}, "
-                f"deleting old image! Path: '{media.image_path}'"
-            )
-            await delete_image(media.image_path)
-    # Update the image path
-    media.image_path = file_path
-    # Check if the file exists
-    if await aiofiles.os.path.exists(media.image_path):
-        return False  # Poster/Artwork already exist
     return True
 
 
-async def download_image(url: str) -> Image.Image:
-    """Download an image from a URL. \n
-    Args:
-        url (str): URL of the image."""
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as response:
-            response.raise_for_status()
-            image_data = await response.read()
-            image_file = BytesIO(image_data)
-            image = Image.open(image_file)
-            return image
-
-
-# ? Is the return value needed here?
-async def process_image(is_movie: bool, media: MediaImage, retries: int = 3) -> bool:
-    """Process a media image, download it if updated/doesn't exist, and save it to disk. \n
+def store_image(image_data: bytes) -> str:
+    """Save an image to the image store, unless the same content is already stored. \n
     Args:
-        is_movie (bool): Whether the media type is movie or show.
-        media (MediaImage): Media image object.
-        retries (int) [Optional]: Number of retries in case of failure. Default is 3."""
-    if not await download_needed(is_movie, media):
-        return False
-    # download_needed() checks if image_url is None and returns False,
-    # and sets image_path if empty/updated.
-    # We are checking them here to make sure nothing went wrong, also for type checking.
-    if media.image_url is None or media.image_path is None:
-        return False
+        image_data (bytes): The image content. \n
+    Returns:
+        str: SHA-256 hash of the image content."""
+    content_hash = hashlib.sha256(image_data).hexdigest()
+    image_path = get_store_path(content_hash)
+    if _touch_image(image_path):
+        return content_hash
+    os.makedirs(os.path.dirname(image_path), exist_ok=True)
+    # Save to a temporary file first, so a partial image is never served
+    temp_path = f"{image_path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(temp_path, "wb") as file:
+            file.write(image_data)
+        os.replace(temp_path, image_path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return content_hash
 
-    # Set the image type
-    image_dimensions = POSTER if media.is_poster else FANART
-    # Download image from URL and save it to disk
+
+def _resize_and_store(source_path: str, dimensions: tuple[int, int]) -> str:
+    """-->>This is a private method<<-- \n
+    Resize a downloaded image and save it to the image store, returns content hash."""
+    return store_image(resize_image(source_path, dimensions))
+
+
+async def process_image(
+    url: str,
+    is_poster: bool,
+    known_source: ImageSourceDC | None = None,
+    retries: int = 3,
+) -> ImageSourceDC | None:
+    """Download an image, resize it and save it to the image store. \n
+    If `known_source` is given, the image is revalidated with a conditional \
+        request and only downloaded again if it changed. \n
+    Args:
+        url (str): URL of the image.
+        is_poster (bool): Whether the image is a poster or fanart.
+        known_source (ImageSourceDC) [Optional]: The previously downloaded image. \
+            Default is None.
+        retries (int) [Optional]: Number of retries in case of failure. Default is 3. \n
+    Returns:
+        ImageSourceDC | None: The stored image, `known_source` itself if it \
+            was not modified, None if it failed."""
+    image_dimensions = POSTER if is_poster else FANART
+    await aiofiles.os.makedirs(STORE_PATH, exist_ok=True)
+    download_path = f"{STORE_PATH}{uuid.uuid4().hex}.part"
     try:
-        image = await download_image(media.image_url)
-        image.thumbnail(image_dimensions)
-        image.save(media.image_path, format="JPEG", optimize=True)
-        logger.debug(
-            f"Image downloaded for media id: {media.id}, "
-            f"URL: '{media.image_url}', path: '{media.image_path}'"
+        validators = await download_image(url, download_path, known_source)
+        if validators is None and known_source is not None:
+            return known_source
+        loop = asyncio.get_running_loop()
+        content_hash = await loop.run_in_executor(
+            _get_executor(), _resize_and_store, download_path, image_dimensions
         )
+        logger.debug(f"Image downloaded from URL: '{url}', hash: '{content_hash}'")
+        return ImageSourceDC(content_hash, *(validators or (None, None)))
     except Exception:
         if retries > 0:
-            return await process_image(is_movie, media, retries - 1)
-        else:
-            return False
-    return True
+            return await process_image(url, is_poster, known_source, retries - 1)
+        return None
+    finally:
+        await delete_image(download_path)
 
 
-async def refresh_media_images(is_movie: bool, media_list: list[MediaImage]) -> None:
-    """Refresh images in the disk. \n
-    New images will be downloaded if:
-    - The image URL is updated.
-    - The image doesn't exist in the disk.
-    - The existing image path doesn't match with md5 hash of URL. \n
-    If an image with the same URL already exists, image path will be set to existing image. \n
+async def refresh_media_images(
+    media_list: list[MediaImage],
+    known_sources: dict[tuple[str, bool], ImageSourceDC],
+    revalidate: bool = False,
+) -> dict[tuple[str, bool], ImageSourceDC]:
+    """Refresh images in the disk, and set image paths of media to the image store. \n
+    Each image URL is downloaded only once, even if used by multiple media, \
+        and not at all if it was downloaded before and is still in the store. \n
+    If `revalidate` is True, images downloaded before are checked for changes \
+        with conditional requests, unchanged images are not downloaded again. \n
+    Images with the same content are stored once, whatever their URL. \n
+    If an image fails to download, the image path of its media is not changed. \n
     Note: \n
         The `media_list` objects will be modified in place. \n
     Args:
-        is_movie (bool): Whether the media type is movie or show.
-        media_list (list[MediaImage]): List of media image objects. \n
+        media_list (list[MediaImage]): List of media image objects.
+        known_sources (dict[tuple[str, bool], ImageSourceDC]): Images \
+            downloaded before, keyed by (url, is_poster).
+        revalidate (bool) [Optional]: Check if images downloaded before changed. \
+            Default is False. \n
     Returns:
-        None
+        dict[tuple[str, bool], ImageSourceDC]: Newly downloaded images, \
+            keyed by (url, is_poster).
     """
+    # Group media by image, so each image is processed once
+    images: dict[tuple[str, bool], list[MediaImage]] = {}
+    for media in media_list:
+        if media.image_url:
+            images.setdefault((media.image_url, media.is_poster), []).append(media)
 
+    new_sources: dict[tuple[str, bool], ImageSourceDC] = {}
     sem = asyncio.Semaphore(5)  # Limit to 5 concurrent downloads
 
-    async def download(media_image: MediaImage):
-        async with sem:  # Wait for a free slot in the semaphore
-            return await process_image(is_movie, media_image)
+    async def refresh(image: tuple[str, bool], image_media_list: list[MediaImage]):
+        source = known_sources.get(image)
+        if source and await asyncio.to_thread(
+            _touch_image, get_store_path(source.content_hash)
+        ):
+            # Images without validators can't be checked without downloading them
+            if revalidate and (source.etag or source.last_modified):
+                async with sem:  # Wait for a free slot in the semaphore
+                    new_source = await process_image(*image, known_source=source)
+                if new_source is not None and new_source is not source:
+                    new_sources[image] = source = new_source
+        else:
+            async with sem:  # Wait for a free slot in the semaphore
+                source = await process_image(*image)
+            if source is None:
+                return
+            new_sources[image] = source
+        for media in image_media_list:
+            media.image_path = get_store_path(source.content_hash)
 
     # Start all downloads and wait for them to complete
-    await asyncio.gather(*(download(media) for media in media_list))
-    return
+    await asyncio.gather(*(refresh(image, group) for image, group in images.items()))
+    logger.info(
+        f"Images refreshed: {len(images)} checked, {len(new_sources)} downloaded"
+    )
+    return new_sources
+
+
+def remove_unreferenced_images(referenced_paths: Container[str]) -> list[str]:
+    """Delete image files that are not referenced by any media. \n
+    Scans the image store and the images folders of older versions. \
+        Files modified recently are kept, they may belong to a running refresh. \n
+    This does blocking file IO, run it in a thread from async code. \n
+    Args:
+        referenced_paths (Container[str]): Image paths referenced by media. \n
+    Returns:
+        list[str]: Content hashes of the images removed from the image store."""
+    removed_hashes: list[str] = []
+    cutoff = time.time() - _CLEANUP_GRACE_SECONDS
+    for dir_path, _, file_names in os.walk(IMAGES_PATH):
+        for file_name in file_names:
+            file_path = os.path.join(dir_path, file_name)
+            if file_path in referenced_paths:
+                continue
+            try:
+                if os.path.getmtime(file_path) > cutoff:
+                    continue
+                os.remove(file_path)
+            except OSError:
+                continue
+            if file_path.startswith(STORE_PATH) and file_name.endswith(".jpg"):
+                removed_hashes.append(file_name.removesuffix(".jpg"))
+    if removed_hashes:
+        logger.info(f"Removed {len(removed_hashes)} unused images")
+    return removed_hashes
@@ -0,0 +1,167 @@
+import errno
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from app_logger import ModuleLogger
+from config.settings import app_settings
+
+logger = ModuleLogger("TrailersDownloader")
+
+# Name of the staging folder created in the root of each library filesystem
+STAGING_DIR_NAME = ".trailarr-staging"
+# Files in staging folders not modified for this long are left from crashed runs
+STALE_FILE_AGE = 6 * 60 * 60
+# Part of the names of trailer files downloaded to the default temp folder
+_TEMP_FILE_MARKER = "-trailer."
+
+# Staging folder of each filesystem, keyed by device id
+_staging_dirs: dict[int, str] = {}
+_staging_lock = threading.Lock()
+
+
+def _get_existing_path(path: str) -> str:
+    """Get the path itself, or its closest parent folder that exists."""
+    path = os.path.abspath(path)
+    while not os.path.exists(path):
+        path = os.path.dirname(path)
+    return path
+
+
+def _get_filesystem_root(path: str) -> str:
+    """Get the topmost folder of a path that is on the same filesystem, \
+        i.e. the mount point of the library. \n
+    Args:
+        path (str): An existing path. \n
+    Returns:
+        str: The topmost folder on the same device as the path."""
+    device_id = os.stat(path).st_dev
+    while True:
+        parent = os.path.dirname(path)
+        if parent == path or os.stat(parent).st_dev != device_id:
+            return path
+        path = parent
+
+
+def _create_staging_dir(folder_path: str) -> str:
+    """-->>This is a private method<<-- \n
+    Create the staging folder in the root of the filesystem of a folder, \
+        returns the default temp folder if it can't be created."""
+    staging_dir = os.path.join(_get_filesystem_root(folder_path), STAGING_DIR_NAME)
+    try:
+        os.makedirs(staging_dir, exist_ok=True)
+    except OSError as e:
+        logger.warning(
+            f"Unable to create staging folder '{staging_dir}', "
+            f"trailers will be copied from temp folder: {e}"
+        )
+        return tempfile.gettempdir()
+    logger.info(f"Using staging folder '{staging_dir}' for trailers")
+    # Remove files left from previous runs, before any new download uses it
+    remove_stale_files(staging_dir)
+    return staging_dir
+
+
+def get_staging_dir(folder_path: str) -> str:
+    """Get the folder to download trailers to, before moving them to a media folder. \n
+    If the default temp folder is on the same filesystem as the media folder, \
+        it is used. Otherwise a staging folder is created in the root of \
+        the media folder's filesystem, so trailers can be moved with a rename \
+        instead of being copied. \n
+    Staging folders are detected by device id, and created only once per filesystem. \n
+    Args:
+        folder_path (str): Path of the media folder. \n
+    Returns:
+        str: Path of the staging folder."""
+    temp_dir = tempfile.gettempdir()
+    if not app_settings.trailer_staging_enabled:
+        return temp_dir
+    try:
+        device_id = os.stat(_get_existing_path(folder_path)).st_dev
+        if device_id == os.stat(temp_dir).st_dev:
+            return temp_dir
+        with _staging_lock:
+            if device_id not in _staging_dirs:
+                _staging_dirs[device_id] = _create_staging_dir(
+                    _get_existing_path(folder_path)
+                )
+            return _staging_dirs[device_id]
+    except OSError as e:
+        logger.debug(f"Unable to detect staging folder for '{folder_path}': {e}")
+        return temp_dir
+
+
+def place_file(src_path: str, dst_path: str) -> None:
+    """Move a file to its destination with an atomic rename. \n
+    If the source is on a different filesystem, the file is first copied \
+        next to the destination and then renamed, so a partial file is never \
+        visible at the destination. \n
+    Args:
+        src_path (str): Path of the file to move.
+        dst_path (str): Destination path of the file. \n
+    Raises:
+        OSError: If the file can't be moved."""
+    try:
+        os.replace(src_path, dst_path)
+        return
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+    logger.debug(f"'{src_path}' is on a different filesystem, copying it instead")
+    dst_dir, dst_name = os.path.split(dst_path)
+    temp_path = os.path.join(dst_dir, f".{dst_name}.part")
+    try:
+        shutil.copyfile(src_path, temp_path)
+        os.replace(temp_path, dst_path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    os.remove(src_path)
+    return
+
+
+def remove_stale_files(folder_path: str, max_age: int = STALE_FILE_AGE) -> int:
+    """Remove files not modified for `max_age` seconds from a staging folder. \n
+    These are partial downloads and conversions left by crashed or failed runs. \n
+    In the default temp folder, only trailer files are removed. \n
+    Args:
+        folder_path (str): Path of the staging folder.
+        max_age (int) [Optional]: Minimum age of files to remove, in seconds. \
+            Default is 6 hours. \n
+    Returns:
+        int: Number of files removed."""
+    is_temp_dir = folder_path == tempfile.gettempdir()
+    cutoff = time.time() - max_age
+    removed_count = 0
+    try:
+        entries = list(os.scandir(folder_path))
+    except OSError:
+        return 0
+    for entry in entries:
+        if is_temp_dir and _TEMP_FILE_MARKER not in entry.name:
+            continue
+        try:
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            if entry.stat(follow_symlinks=False).st_mtime > cutoff:
+                continue
+            os.remove(entry.path)
+            removed_count += 1
+        except OSError as e:
+            logger.debug(f"Unable to remove stale file '{entry.path}': {e}")
+    if removed_count:
+        logger.info(f"Removed {removed_count} stale files from '{folder_path}'")
+    return removed_count
+
+
+def cleanup_staging_dirs() -> int:
+    """Remove stale files from the default temp folder and all staging folders \
+        used since the app started. \n
+    Returns:
+        int: Number of files removed."""
+    with _staging_lock:
+        staging_dirs = {tempfile.gettempdir(), *_staging_dirs.values()}
+    return sum(remove_stale_files(staging_dir) for staging_dir in staging_dirs)
@@ -1,19 +1,57 @@
 # Extract youtube video id from url
-from datetime import datetime, timezone
 import os
 import re
-import shutil
-from threading import Semaphore
+from typing import Any, Callable
 
 from yt_dlp import YoutubeDL
 
 from app_logger import ModuleLogger
-from config.settings import app_settings
+from core.base.database.manager.trailer_search import TrailerSearchDatabaseManager
 from core.base.database.models.helpers import MediaTrailer
-from core.download.video import download_video
+from core.download.staging import get_staging_dir, place_file
+from core.download.video import DownloadContext, convert_video, download_video
 
 logger = ModuleLogger("TrailersDownloader")
 
+# Number of search results fetched in a single search, and ranked locally
+_SEARCH_RESULTS = 10
+# Durations (in seconds) of a typical trailer, and the longest video considered
+_TRAILER_DURATION = (45, 300)
+_MAX_DURATION = 900
+# Keywords in video titles that hint it's not an actual trailer
+_EXCLUDE_KEYWORDS = (
+    "reaction",
+    "review",
+    "breakdown",
+    "explained",
+    "fan made",
+    "fanmade",
+    "parody",
+    "concept",
+    "full movie",
+    "behind the scenes",
+)
+# Parts of yt-dlp error messages for videos that can never be downloaded
+_UNAVAILABLE_ERRORS = (
+    "video unavailable",
+    "this video is not available",
+    "this video has been removed",
+    "account associated with this video has been terminated",
+    "private video",
+    "video is private",
+    "not made this video available in your country",
+    "not available in your country",
+    "blocked it in your country",
+    "geo restriction",
+    "confirm your age",
+    "age-restricted",
+    "inappropriate for some users",
+    "members-only",
+    "join this channel",
+)
+# Keywords in channel names of studios and trailer channels
+_CHANNEL_KEYWORDS = ("trailer", "pictures", "studios", "films", "entertainment")
+
 
 def _get_youtube_id(url: str) -> str | None:
     """Extract youtube video id from url. \n
@@ -31,37 +69,126 @@ def _get_youtube_id(url: str) -> str | None:
         return None
 
 
-def _search_yt_for_trailer(
-    movie_title: str,
-    is_movie=True,
-    movie_year: int | None = None,
-    exclude: list[str] | None = None,
-):
-    """Search for trailer on youtube. \n
+def _get_search_key(title: str, is_movie: bool, year: int | None = None) -> str:
+    """Get the key of a trailer search in the search cache. \n
+    Title is normalized, so minor differences in punctuation or case \
+        share the same cached search. \n
     Args:
-        movie_title (str): Title of the movie or show.
+        title (str): Title of the movie or show.
         is_movie (bool): Whether the media type is movie or show.
-        movie_year (str): Year of the movie or show. \n
+        year (int) [Optional]: Year of the movie or show. \n
     Returns:
-        str | None: Youtube video id / None if not found."""
-    logger.debug(f"Searching youtube for trailer for '{movie_title}'...")
+        str: The search key."""
+    media_type = "movie" if is_movie else "series"
+    return f"{media_type}:{_normalize(title)}:{year or ''}"
+
+
+def _normalize(text: str) -> str:
+    """Lowercase the text and replace punctuation with single spaces."""
+    return " ".join(re.sub(r"[^\w]+", " ", text.casefold()).split())
+
+
+def _contains_phrase(text: str, phrase: str) -> bool:
+    """Check if a normalized text contains a phrase as whole words."""
+    return f" {phrase} " in f" {text} "
+
+
+def _score_search_result(
+    result: dict[str, Any], title: str, year: int | None = None
+) -> float:
+    """Score a youtube search result on how likely it is the trailer of a media. \n
+    Args:
+        result (dict[str, Any]): Flat extracted search result.
+        title (str): Title of the movie or show.
+        year (int) [Optional]: Year of the movie or show. \n
+    Returns:
+        float: Score of the result, higher is better."""
+    video_title = _normalize(result.get("title") or "")
+    video_words = set(video_title.split())
+    score = 0.0
+    # Title similarity, share of the media title words in the video title
+    media_title = _normalize(title)
+    title_words = media_title.split()
+    if title_words:
+        matched = sum(word in video_words for word in title_words)
+        score += 3 * matched / len(title_words)
+    if year and str(year) in video_words:
+        score += 0.5
+    # Trailer keywords
+    if "trailer" in video_words:
+        score += 1
+        if "official" in video_words:
+            score += 1
+    elif "teaser" in video_words:
+        score += 0.5
+    # Keywords are matched as whole words, ignoring those in the media title
+    # Ex: 'review' in 'Official Preview', 'reaction' for the movie 'Chain Reaction'
+    exclude_keywords = [
+        keyword
+        for keyword in _EXCLUDE_KEYWORDS
+        if not _contains_phrase(media_title, keyword)
+    ]
+    if any(_contains_phrase(video_title, keyword) for keyword in exclude_keywords):
+        score -= 3
+    # Duration window, unknown duration is not penalized
+    duration = result.get("duration")
+    if duration:
+        if _TRAILER_DURATION[0] <= duration <= _TRAILER_DURATION[1]:
+            score += 1
+        elif duration > _MAX_DURATION:
+            score -= 3
+    # Channel, verified channels and studios are preferred
+    if result.get("channel_is_verified"):
+        score += 1
+    channel = _normalize(result.get("channel") or result.get("uploader") or "")
+    if any(keyword in channel for keyword in _CHANNEL_KEYWORDS):
+        score += 0.5
+    return score
+
+
+def _rank_search_results(
+    results: list[dict[str, Any]], title: str, year: int | None = None
+) -> list[str]:
+    """Rank youtube search results by their score. \n
+    Results with the same score keep youtube's order. \n
+    Args:
+        results (list[dict[str, Any]]): Flat extracted search results.
+        title (str): Title of the movie or show.
+        year (int) [Optional]: Year of the movie or show. \n
+    Returns:
+        list[str]: Video ids of the results, best first."""
+    scored_results = [
+        (_score_search_result(result, title, year), str(result["id"]))
+        for result in results
+        if result and result.get("id")
+    ]
+    scored_results.sort(key=lambda scored: scored[0], reverse=True)
+    logger.debug(f"Ranked search results for '{title}': {scored_results}")
+    return [video_id for _, video_id in scored_results]
+
+
+def _search_youtube(title: str, is_movie: bool, year: int | None = None) -> list[str]:
+    """Search youtube for trailers of a media. \n
+    Results are flat extracted in a single search, and ranked locally. \n
+    Args:
+        title (str): Title of the movie or show.
+        is_movie (bool): Whether the media type is movie or show.
+        year (int) [Optional]: Year of the movie or show. \n
+    Returns:
+        list[str]: Video ids of the search results, best first."""
+    logger.debug(f"Searching youtube for trailer for '{title}'...")
     # Set options
+    # Flat extraction only reads the search page, without extracting each video
     options = {
-        "format": "bestvideo[height<=?1080]+bestaudio",
-        "noplaylist": True,
-        "extract_flat": "discard_in_playlist",
-        "fragment_retries": 10,
-        # Fix issue with youtube-dl not being able to download some videos
-        # See https://github.com/yt-dlp/yt-dlp/issues/9554
-        "extractor_args": {"youtube": {"player_client": ["ios", "web"]}},
+        "extract_flat": True,
         "noprogress": True,
         "no_warnings": True,
         "quiet": True,
     }
     # Construct search query with keywords
-    search_query = f"ytsearch: {movie_title}"
-    if movie_year:
-        search_query += f" ({movie_year})"
+    search_query = f"ytsearch{_SEARCH_RESULTS}: {title}"
+    if year:
+        search_query += f" ({year})"
     search_query += " movie" if is_movie else " series"
     search_query += " trailer"
 
@@ -69,39 +196,86 @@ def _search_yt_for_trailer(
     with YoutubeDL(options) as ydl:
         search_results = ydl.extract_info(search_query, download=False, process=True)
 
-    # If results are invalid, return None
+    # If results are invalid, return empty list
     if not search_results:
-        return None
+        return []
     if not isinstance(search_results, dict):
-        return None
+        return []
     if "entries" not in search_results:
-        return None
+        return []
+    return _rank_search_results(list(search_results["entries"]), title, year)
+
+
+def _search_yt_for_trailer(
+    movie_title: str,
+    is_movie=True,
+    movie_year: int | None = None,
+    exclude: list[str] | None = None,
+):
+    """Search for trailer on youtube. \n
+    Search results are cached, youtube is only searched if the search \
+        is not cached or the cached result expired. \n
+    Args:
+        movie_title (str): Title of the movie or show.
+        is_movie (bool): Whether the media type is movie or show.
+        movie_year (str): Year of the movie or show.
+        exclude (list[str]) [Optional]: Video ids to skip. \n
+    Returns:
+        str | None: Youtube video id / None if not found."""
+    search_key = _get_search_key(movie_title, is_movie, movie_year)
+    search_manager = TrailerSearchDatabaseManager()
+    video_ids = search_manager.read(search_key)
+    if video_ids is None:
+        video_ids = _search_youtube(movie_title, is_movie, movie_year)
+        search_manager.save(search_key, video_ids)
+    else:
+        logger.debug(f"Using cached search results for '{movie_title}'")
     # Return the first search result video id
     if not exclude:
         exclude = []
-    for result in search_results["entries"]:
-        if result["id"] in exclude:
+    for video_id in video_ids:
+        if video_id in exclude:
             continue
-        logger.debug(f"Found trailer for {movie_title}: {result['id']}")
-        return str(result["id"])
+        logger.debug(f"Found trailer for {movie_title}: {video_id}")
+        return video_id
+    return None
+
+
+def _is_video_unavailable(error: str) -> bool:
+    """Check if a download error is about the video itself, \
+        i.e. downloading it again later would fail the same way. \n
+    Args:
+        error (str): Error message of the failed download. \n
+    Returns:
+        bool: True if video is unavailable, private, geo-blocked or age-restricted."""
+    error = error.casefold()
+    # Bot checks also ask to sign in, but they are temporary
+    if "not a bot" in error:
+        return False
+    return any(keyword in error for keyword in _UNAVAILABLE_ERRORS)
 
 
 def download_trailer(
     media: MediaTrailer,
-    trailer_folder: bool,
     is_movie: bool,
     retry_count: int = 2,
     exclude: list[str] | None = None,
-) -> bool:
-    """Download trailer for a media object. \n
+    on_progress: Callable[[DownloadContext], None] | None = None,
+) -> DownloadContext | None:
+    """Download trailer for a media object, without converting it. \n
+    Use `place_trailer` to convert the downloaded trailer and move it to \
+        the media folder. \n
     Args:
         media (MediaTrailer): Media object.
-        trailer_folder (bool): Whether to move the trailer to a separate folder.
-        is_movie (bool): Whether the media type is movie or show. \n
+        is_movie (bool): Whether the media type is movie or show.
+        on_progress (Callable[[DownloadContext], None]) [Optional]: Function \
+            called with the download context whenever the progress is updated. \n
     Returns:
-        bool: True if trailer is downloaded successfully, False otherwise."""
+        DownloadContext | None: Context of the download, with the path and codecs \
+            of the downloaded file. None if trailer download failed."""
     if not exclude:
         exclude = []
+    is_searched = not media.yt_id
     if media.yt_id:
         if media.yt_id.startswith("http"):
             media.yt_id = _get_youtube_id(media.yt_id)
@@ -110,12 +284,26 @@ def download_trailer(
         # Search for trailer on youtube
         video_id = _search_yt_for_trailer(media.title, is_movie, media.year, exclude)
     if not video_id:
-        return False
+        return None
     # Download the trailer
     trailer_url = f"https://www.youtube.com/watch?v={video_id}"
     logger.debug(f"Downloading trailer for {media.title} from {trailer_url}")
-    output_file = download_video(trailer_url, f"/tmp/{media.id}-trailer.%(ext)s")
+    media_type = "movie" if is_movie else "series"
+    # Download to a folder on the same filesystem, so the trailer is just renamed
+    staging_dir = get_staging_dir(media.folder_path)
+    context = DownloadContext(trailer_url, on_progress)
+    output_file = download_video(
+        trailer_url,
+        os.path.join(staging_dir, f"{media_type}-{media.id}-trailer.%(ext)s"),
+        context,
+    )
     if not output_file:
+        if is_searched and _is_video_unavailable(context.error):
+            # Don't try the same candidate again in later runs
+            # Network, rate limit and local errors keep the candidate for next run
+            TrailerSearchDatabaseManager().discard(
+                _get_search_key(media.title, is_movie, media.year), video_id
+            )
         if retry_count > 0:
             logger.debug(
                 f"Trailer download failed for {media.title} from {trailer_url}, "
@@ -124,12 +312,32 @@ def download_trailer(
             media.yt_id = None
             exclude.append(video_id)
             return download_trailer(
-                media, trailer_folder, is_movie, retry_count - 1, exclude
+                media, is_movie, retry_count - 1, exclude, on_progress
             )
 
-        return False
-    logger.debug(f"Trailer downloaded for {media.title}, Moving to folder...")
+        return None
+    logger.debug(f"Trailer downloaded for {media.title}")
     media.yt_id = video_id
+    return context
+
+
+def place_trailer(
+    media: MediaTrailer, context: DownloadContext, trailer_folder: bool
+) -> bool:
+    """Convert a downloaded trailer and move it to the media folder. \n
+    Run it in the transcoding pool if `needs_transcode(context)` is True. \n
+    Args:
+        media (MediaTrailer): Media object.
+        context (DownloadContext): Context returned by `download_trailer`.
+        trailer_folder (bool): Whether to move the trailer to a separate folder. \n
+    Returns:
+        bool: True if trailer is placed in the media folder, False otherwise."""
+    if not convert_video(context):
+        # Remove the downloaded file, it can't be used
+        if os.path.exists(context.filepath):
+            os.remove(context.filepath)
+        return False
+    logger.debug(f"Trailer converted for {media.title}, Moving to folder...")
     # Move the trailer to the specified folder
     if trailer_folder:
         trailer_path = os.path.join(media.folder_path, "Trailers")
@@ -138,7 +346,7 @@ def download_trailer(
     try:
         if not os.path.exists(trailer_path):
             os.makedirs(trailer_path)
-        return move_trailer_to_folder(output_file, trailer_path, media.title)
+        return move_trailer_to_folder(context.filepath, trailer_path, media.title)
     except Exception as e:
         logger.error(f"Failed to move trailer to folder: {e}")
         return False
@@ -202,44 +410,8 @@ def move_trailer_to_folder(src_path: str, dst_folder_path: str, new_title: str)
 
     # Construct the new filename and move the file
     dst_file_path = get_trailer_path(src_path, dst_folder_path, new_title)
-    shutil.move(src_path, dst_file_path)
+    place_file(src_path, dst_file_path)
 
     # Set the moved file's permissions to match the destination folder's permissions
     os.chmod(dst_file_path, dst_permissions)
     return True
-
-
-def download_trailers(
-    media_list: list[MediaTrailer], is_movie: bool
-) -> list[MediaTrailer]:
-    """Download trailers for a list of media objects. \n
-    Args:
-        media_list (list[MediaTrailer]): List of media objects.
-        is_movie (bool): Whether the media type is movie or show. \n
-    Returns:
-        list[MediaTrailer]: List of media objects for which trailers are downloaded."""
-    media_type = "movies" if is_movie else "series"
-    logger.info(f"Downloading trailers for {len(media_list)} monitored {media_type}...")
-    trailer_folder = False
-    if is_movie:
-        if app_settings.trailer_folder_movie:
-            trailer_folder = True
-    else:
-        if app_settings.trailer_folder_series:
-            trailer_folder = True
-    sem = Semaphore(2)
-    download_list = []
-    for media in media_list:
-        sem.acquire()
-        logger.info(f"Downloading trailer for '[{media.id}]{media.title}'...")
-        if download_trailer(media, trailer_folder, is_movie):
-            media.downloaded_at = datetime.now(timezone.utc)
-            download_list.append(media)
-            logger.info(
-                f"Trailer downloaded for '[{media.id}]{media.title}' from [{media.yt_id}]"
-            )
-        else:
-            logger.info(f"Trailer download failed for '[{media.id}]{media.title}'")
-        sem.release()
-    logger.info(f"Downloaded trailers for {len(download_list)} {media_type}")
-    return download_list
@@ -0,0 +1,120 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+import os
+import shutil
+import subprocess
+import threading
+from typing import Callable
+
+from app_logger import ModuleLogger
+from config.settings import app_settings
+
+logger = ModuleLogger("TrailersDownloader")
+
+FFMPEG_PATH = "/usr/local/bin/ffmpeg"
+
+# Transcoding is CPU heavy, run it in a separate pool from downloads, so the
+# number of concurrent transcodes is limited regardless of the download workers.
+# Each worker waits on an ffmpeg process, so a thread pool is enough here.
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+# Downloaded videos waiting for a transcoding worker, per worker. Downloads wait
+# when there are more, so they don't fill the disk faster than videos are transcoded.
+_PENDING_PER_WORKER = 2
+_pending_slots: threading.BoundedSemaphore | None = None
+
+
+def _get_executor() -> tuple[ThreadPoolExecutor, threading.BoundedSemaphore]:
+    """Get the transcoding thread pool and its pending slots, creating them if needed."""
+    global _executor, _pending_slots
+    with _executor_lock:
+        if _executor is None or _pending_slots is None:
+            workers = app_settings.transcode_workers
+            _executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="transcode"
+            )
+            _pending_slots = threading.BoundedSemaphore(
+                workers * (1 + _PENDING_PER_WORKER)
+            )
+        return _executor, _pending_slots
+
+
+def _get_priority_command() -> list[str]:
+    """Get the command prefix to run ffmpeg with lower CPU and I/O priority, \
+        so it doesn't starve other apps like media servers on the same host."""
+    command: list[str] = []
+    if app_settings.transcode_nice and (nice_path := shutil.which("nice")):
+        command.extend([nice_path, "-n", str(app_settings.transcode_nice)])
+    if app_settings.transcode_ionice_class and (ionice_path := shutil.which("ionice")):
+        command.extend([ionice_path, "-c", str(app_settings.transcode_ionice_class)])
+        # Idle class (3) doesn't take a level
+        if app_settings.transcode_ionice_class == 2:
+            command.extend(["-n", str(app_settings.transcode_ionice_level)])
+    return command
+
+
+def run_ffmpeg(file_path: str, output_options: list[str], transcode: bool) -> bool:
+    """Run ffmpeg on a file with the given output options, replacing the file. \n
+    Args:
+        file_path (str): Path of the file to convert.
+        output_options (list[str]): ffmpeg output options.
+        transcode (bool): Whether any stream is re-encoded. \n
+    Returns:
+        bool: True if ffmpeg completed successfully, False otherwise."""
+    name, ext = os.path.splitext(file_path)
+    temp_path = f"{name}.temp{ext}"
+    command = [FFMPEG_PATH, "-y", "-loglevel", "error", "-i", file_path]
+    command.extend(output_options)
+    if transcode:
+        command = _get_priority_command() + command
+        if app_settings.transcode_threads:
+            command.extend(["-threads", str(app_settings.transcode_threads)])
+    command.append(temp_path)
+    try:
+        subprocess.run(command, check=True, capture_output=True, text=True)
+    except (OSError, subprocess.CalledProcessError) as e:
+        logger.error(f"'Trailers': ffmpeg failed for '{file_path}': {e}")
+        if isinstance(e, subprocess.CalledProcessError):
+            logger.debug(f"'Trailers': ffmpeg output: {e.stderr}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return False
+    os.replace(temp_path, file_path)
+    return True
+
+
+def submit_transcode[**_P, _R](
+    func: Callable[_P, _R], *args: _P.args, **kwargs: _P.kwargs
+) -> Future[_R]:
+    """Run a transcoding job in the transcoding pool, without waiting for it. \n
+    At most `transcode_workers` jobs run at once, ffmpeg should be run with \
+        `run_ffmpeg`, so it uses at most `transcode_threads` threads \
+        and runs with the configured nice and ionice levels. \n
+    Blocks while too many jobs are waiting for a worker. \n
+    Args:
+        func (Callable): The job to run, ex: transcode a video and move it to \
+            its folder.
+        *args: Positional arguments for the job.
+        **kwargs: Keyword arguments for the job. \n
+    Returns:
+        Future: Future of the job's return value."""
+    executor, pending_slots = _get_executor()
+    pending_slots.acquire()
+    try:
+        future = executor.submit(func, *args, **kwargs)
+    except Exception:
+        pending_slots.release()
+        raise
+    future.add_done_callback(lambda _: pending_slots.release())
+    return future
+
+
+def shutdown_transcode_executor() -> None:
+    """Shutdown the transcoding pool after running the pending transcodes. \n
+    A new pool is created if `submit_transcode` is called again."""
+    global _executor, _pending_slots
+    with _executor_lock:
+        executor, _executor = _executor, None
+        _pending_slots = None
+    if executor is not None:
+        executor.shutdown(wait=True)
+    return
@@ -1,11 +1,15 @@
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import Any
+import re
+from typing import Any, Callable
 
 from yt_dlp import YoutubeDL
+from yt_dlp.postprocessor.ffmpeg import FFmpegPostProcessor
 from yt_dlp.utils import YoutubeDLError
 
 from app_logger import ModuleLogger
 from config.settings import app_settings
+from core.download.transcode import FFMPEG_PATH, run_ffmpeg
 
 # For some reason, supplying a logger to YoutubeDL is not working with app_logger
 # So, we are instead logging progress using progress hooks.
@@ -13,49 +17,134 @@ from config.settings import app_settings
 logger = ModuleLogger("TrailersDownloader")
 
 
-def _progress_hook(d):
-    if d["status"] == "downloading":
-        if d["_percent_str"] in ["25.0%", "50.0%", "75.0%", "100.0%"]:
+@dataclass(eq=False, slots=True)
+class PostProcessorState:
+    """State of a single postprocessor run during a download."""
+
+    name: str
+    status: str = "started"
+    starttime: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    endtime: datetime | None = None
+    filepath: str = ""
+
+
+@dataclass(eq=False, slots=True)
+class DownloadContext:
+    """Progress and postprocessor state of a single video download. \n
+    The `progress_hook` and `postprocessor_hook` methods are passed to yt-dlp, \
+        so each download writes only to its own context and concurrent downloads \
+        do not interfere with each other. \n
+    Args:
+        url (str): URL of the video being downloaded.
+        on_progress (Callable[[DownloadContext], None]) [Optional]: Function \
+            called with the context whenever the progress is updated."""
+
+    url: str
+    on_progress: Callable[["DownloadContext"], None] | None = None
+    status: str = "queued"
+    downloaded_bytes: int = 0
+    total_bytes: int = 0
+    elapsed: float = 0.0
+    filepath: str = ""
+    vcodec: str | None = None
+    acodec: str | None = None
+    ext: str | None = None
+    error: str = ""
+    postprocessors: dict[str, PostProcessorState] = field(default_factory=dict)
+
+    @property
+    def percent(self) -> float:
+        """Download progress in percent, 0 if total size is unknown."""
+        if not self.total_bytes:
+            return 0.0
+        return min(100.0, self.downloaded_bytes * 100 / self.total_bytes)
+
+    def _notify(self) -> None:
+        """-->>This is a private method<<-- \n
+        Call the progress callback, if any, without failing the download."""
+        if self.on_progress is None:
+            return
+        try:
+            self.on_progress(self)
+        except Exception as e:
+            logger.debug(f"'Trailers': Progress callback failed: {e}")
+
+    def update_status(self, status: str) -> None:
+        """Update the status of the download, and call the progress callback."""
+        self.status = status
+        self._notify()
+
+    def progress_hook(self, d: dict[str, Any]) -> None:
+        """Progress hook for yt-dlp, updates the download progress."""
+        self.status = d["status"]
+        self.downloaded_bytes = d.get("downloaded_bytes") or self.downloaded_bytes
+        self.total_bytes = (
+            d.get("total_bytes") or d.get("total_bytes_estimate") or self.total_bytes
+        )
+        self.elapsed = d.get("elapsed") or self.elapsed
+        if d["status"] == "downloading":
+            if d["_percent_str"] in ["25.0%", "50.0%", "75.0%", "100.0%"]:
+                logger.debug(
+                    f"'Trailers': Downloading {d['_percent_str']} of"
+                    f" {d['_total_bytes_str']}"
+                )
+        if d["status"] == "error":
+            logger.info(f"'Trailers': Error downloading {d['filename']}")
+        if d["status"] == "finished":  # Guaranteed to call
+            timetook = timedelta(seconds=d["elapsed"])
+            self.filepath = d["filename"]
             logger.debug(
-                f"'Trailers': Downloading {d['_percent_str']} of {d['_total_bytes_str']}"
+                f"'Trailers': Download completed in {timetook}!"
+                f" Size: {d['_total_bytes_str']} "
+                f'Filepath: "{d["filename"]}"'
             )
-    if d["status"] == "error":
-        logger.info(f"'Trailers': Error downloading {d['filename']}")
-    if d["status"] == "finished":  # Guaranteed to call
-        timetook = timedelta(seconds=d["elapsed"])
-        data["filepath"] = d["filename"]
-        logger.debug(
-            f"'Trailers': Download completed in {timetook}! Size: {d['_total_bytes_str']} "
-            f'Filepath: "{d["filename"]}"'
-        )
+        self._notify()
+
+    def postprocessor_hook(self, d: dict[str, Any]) -> None:
+        """Postprocessor hook for yt-dlp, tracks the conversion state."""
+        pprocessor = d["postprocessor"]
+        if d["status"] == "started":  # Guaranteed to call
+            self.status = "converting"
+            self.postprocessors[pprocessor] = PostProcessorState(pprocessor)
+            logger.debug(f"'Trailers': [{pprocessor}] Converting downloaded file...")
+        if d["status"] == "processing":
+            logger.debug(f"'Trailers': [{pprocessor}] Conversion in progress...")
+        if d["status"] == "finished":  # Guaranteed to call
+            pp_state = self.postprocessors.setdefault(
+                pprocessor, PostProcessorState(pprocessor)
+            )
+            pp_state.status = "finished"
+            pp_state.endtime = datetime.now(timezone.utc)
+            timetook = pp_state.endtime - pp_state.starttime
+            logger.debug(f"'Trailers': [{pprocessor}] Done converting in {timetook}!")
+            if "filepath" in d["info_dict"]:
+                filepath = d["info_dict"]["filepath"]
+                pp_state.filepath = filepath
+                self.filepath = filepath
+                logger.debug(f"'Trailers': [{pprocessor}] Filepath: \"{filepath}\"")
+        self._notify()
+
+
+@dataclass(eq=False, slots=True)
+class _ErrorLogger:
+    """Logger for yt-dlp that only keeps the last error in the download context. \n
+    Errors don't raise exceptions with `ignoreerrors`, this is the only way \
+        to know why a download failed."""
+
+    context: DownloadContext
+
+    def debug(self, msg: str) -> None:
+        pass
+
+    def info(self, msg: str) -> None:
+        pass
+
+    def warning(self, msg: str) -> None:
+        pass
 
+    def error(self, msg: str) -> None:
+        self.context.error = msg
 
-def _postprocessor_hook(d):
-    pprocessor = d["postprocessor"]
-    if d["status"] == "started":  # Guaranteed to call
-        data[pprocessor] = {
-            "starttime": datetime.now(timezone.utc),
-            "status": "started",
-            "endtime": None,
-            "filepath": "",
-        }
-        logger.debug(f"'Trailers': [{pprocessor}] Converting downloaded file...")
-    if d["status"] == "processing":
-        logger.debug(f"'Trailers': [{pprocessor}] Conversion in progress...")
-    if d["status"] == "finished":  # Guaranteed to call
-        data[pprocessor]["status"] = "finished"
-        data[pprocessor]["endtime"] = datetime.now(timezone.utc)
-        timetook = data[pprocessor]["endtime"] - data[pprocessor]["starttime"]
-        logger.debug(f"'Trailers': [{pprocessor}] Done converting in {timetook}!")
-        if "filepath" in d["info_dict"]:
-            filepath = d["info_dict"]["filepath"]
-            data[pprocessor]["filepath"] = filepath
-            data["filepath"] = filepath
-            logger.debug(f"'Trailers': [{pprocessor}] Filepath: \"{filepath}\"")
-
-
-data: dict[str, Any] = {}
-data["filepath"] = ""
 
 _VIDEO_CODECS = {
     "h264": "libx264",
@@ -73,6 +162,113 @@ _AUDIO_CODECS = {
     "vorbis": "libvorbis",
     "opus": "libopus",
 }
+# Codec names used by yt-dlp for formats in each of the above codecs
+_VIDEO_CODEC_NAMES = {
+    "h264": r"avc|[hx]264",
+    "h265": r"he?vc|[hx]265",
+    "vp9": r"vp0?9",
+    "vp8": r"vp0?8",
+    "av1": r"av0?1",
+}
+_AUDIO_CODEC_NAMES = {
+    "aac": r"aac|mp4a",
+    "ac3": r"ac-?3",
+    "eac3": r"e-?a?c-?3",
+    "mp3": r"mp3",
+    "flac": r"flac",
+    "vorbis": r"vorbis",
+    "opus": r"opus",
+}
+
+
+def _codec_matches(codec: str | None, codec_names: str) -> bool:
+    """Check if a yt-dlp codec name (ex: 'avc1.640028') matches a codec."""
+    return bool(codec and re.match(codec_names, codec.lower()))
+
+
+def _needs_transcode(vcodec: str | None, acodec: str | None) -> bool:
+    """Check if a video needs to be transcoded to be in the configured codecs."""
+    video_names = _VIDEO_CODEC_NAMES[app_settings.trailer_video_format]
+    audio_names = _AUDIO_CODEC_NAMES[app_settings.trailer_audio_format]
+    return not (
+        _codec_matches(vcodec, video_names) and _codec_matches(acodec, audio_names)
+    )
+
+
+def _get_convert_options(vcodec: str | None, acodec: str | None) -> list[str]:
+    """Get the ffmpeg output options to convert a video to the configured codecs. \n
+    Streams already in the configured codec are copied, others are transcoded. \n
+    Args:
+        vcodec (str | None): Video codec of the downloaded video, as reported by yt-dlp.
+        acodec (str | None): Audio codec of the downloaded video, as reported by yt-dlp. \n
+    Returns:
+        list[str]: ffmpeg output options."""
+    output_options: list[str] = []
+    video_format = app_settings.trailer_video_format
+    if _codec_matches(vcodec, _VIDEO_CODEC_NAMES[video_format]):
+        output_options.extend(["-c:v", "copy"])
+    else:
+        output_options.extend(["-c:v", _VIDEO_CODECS[video_format]])
+        output_options.extend(["-preset", "veryfast", "-crf", "22"])
+        if app_settings.trailer_web_optimized:
+            output_options.extend(["-tune", "zerolatency"])
+    audio_format = app_settings.trailer_audio_format
+    if _codec_matches(acodec, _AUDIO_CODEC_NAMES[audio_format]):
+        output_options.extend(["-c:a", "copy"])
+    else:
+        output_options.extend(["-c:a", _AUDIO_CODECS[audio_format], "-b:a", "128k"])
+    if app_settings.trailer_web_optimized:
+        # Below option is for fast streaming, moves the index to start of the file
+        output_options.extend(["-movflags", "+faststart"])
+    return output_options
+
+
+def needs_transcode(context: DownloadContext) -> bool:
+    """Check if a downloaded video needs to be transcoded, \
+        i.e. it's not just remuxed by `convert_video`. \n
+    Args:
+        context (DownloadContext): Context of the finished download. \n
+    Returns:
+        bool: True if any stream is not in the configured codec."""
+    return _needs_transcode(context.vcodec, context.acodec)
+
+
+def convert_video(context: DownloadContext) -> bool:
+    """Convert a downloaded video to the configured codecs, replacing the file. \n
+    If the video is already in the configured codecs, it is just remuxed. \
+        Otherwise only the streams in other codecs are transcoded. \n
+    Transcoding is CPU heavy, run it in the transcoding pool with \
+        `submit_transcode` when `needs_transcode` is True. \n
+    Args:
+        context (DownloadContext): Context of the finished download. \n
+    Returns:
+        bool: True if video is converted successfully, False otherwise."""
+    vcodec, acodec = context.vcodec, context.acodec
+    output_options = [
+        *FFmpegPostProcessor.stream_copy_opts(ext=context.ext),
+        *_get_convert_options(vcodec, acodec),
+    ]
+    transcode = _needs_transcode(vcodec, acodec)
+    action = "Transcoding" if transcode else "Remuxing"
+    logger.debug(f"'Trailers': {action} {vcodec}/{acodec} streams")
+    context.update_status("converting")
+    if not run_ffmpeg(context.filepath, output_options, transcode):
+        context.status = "failed"
+        return False
+    context.status = "done"
+    return True
+
+
+def _get_format_sort() -> list[str]:
+    """Get the format sort order for yt-dlp. \n
+    Highest resolution up to the configured one is selected, and among those \
+        formats already in the configured codecs are preferred, \
+        so they don't need to be transcoded."""
+    return [
+        f"res:{app_settings.trailer_resolution}",
+        f"vcodec:{app_settings.trailer_video_format}",
+        f"acodec:{app_settings.trailer_audio_format}",
+    ]
 
 
 def _get_ytdl_options() -> dict[str, Any]:
@@ -80,7 +276,7 @@ def _get_ytdl_options() -> dict[str, Any]:
     # Set generic options for youtube-dl
     ydl_options = {
         "compat_opts": {"no-keep-subs"},
-        "ffmpeg_location": "/usr/local/bin/ffmpeg",
+        "ffmpeg_location": FFMPEG_PATH,
         "noplaylist": True,
         # "verbose": True,
         "extract_flat": "discard_in_playlist",
@@ -88,8 +284,6 @@ def _get_ytdl_options() -> dict[str, Any]:
         # Fix issue with youtube-dl not being able to download some videos
         # See https://github.com/yt-dlp/yt-dlp/issues/9554
         "extractor_args": {"youtube": {"player_client": ["ios", "web"]}},
-        "progress_hooks": [_progress_hook],
-        "postprocessor_hooks": [_postprocessor_hook],
         "restrictfilenames": True,
         "noprogress": True,
         "no_warnings": True,
@@ -98,30 +292,15 @@ def _get_ytdl_options() -> dict[str, Any]:
         "quiet": True,
         "merge_output_format": app_settings.trailer_file_format,
         "postprocessors": [],
-        "postprocessor_args": {},
     }
     postprocessors: list[dict] = []
-    output_options: list[str] = []
 
     # Set video specific options
     _format = f"bestvideo[height<=?{app_settings.trailer_resolution}]+bestaudio"
     ydl_options["format"] = _format
+    ydl_options["format_sort"] = _get_format_sort()
     if app_settings.trailer_embed_metadata:
         postprocessors.append({"key": "FFmpegMetadata", "add_metadata": True})
-    video_format = _VIDEO_CODECS[app_settings.trailer_video_format]
-    output_options.append("-c:v")
-    output_options.append(video_format)
-    output_options.append("-preset")
-    output_options.append("veryfast")
-    output_options.append("-crf")
-    output_options.append("22")
-
-    # Set audio specific options
-    audio_format = _AUDIO_CODECS[app_settings.trailer_audio_format]
-    output_options.append("-c:a")
-    output_options.append(audio_format)
-    output_options.append("-b:a")
-    output_options.append("128k")
 
     # Set subtitle specific options
     if app_settings.trailer_subtitles_enabled:
@@ -160,34 +339,49 @@ def _get_ytdl_options() -> dict[str, Any]:
             }
         )
 
-    # Set remaining options
-    if app_settings.trailer_web_optimized:
-        # Below options are for fast straming, but might increase filesize
-        output_options.append("-movflags")
-        output_options.append("+faststart")
-        output_options.append("-tune")
-        output_options.append("zerolatency")
-    postprocessors.append({"key": "FFmpegCopyStream"})
+    # Streams are converted to the configured codecs after the download,
+    # by `convert_video`, separately from the download
     if len(postprocessors) > 0:
         ydl_options["postprocessors"] = postprocessors
-    ydl_options["postprocessor_args"] = {"copystream": output_options}
     return ydl_options
 
 
-def download_video(url: str, file_path: str | None = None) -> str:
-    # Download the video from the given URL to the given path
-    global data
-    data = {}
+def download_video(
+    url: str,
+    file_path: str | None = None,
+    context: DownloadContext | None = None,
+) -> str:
+    """Download the video from the given URL to the given path. \n
+    Safe to call from multiple threads at once, each download keeps its \
+        progress in its own context. \n
+    Args:
+        url (str): URL of the video.
+        file_path (str) [Optional]: Output path template for yt-dlp.
+        context (DownloadContext) [Optional]: Context to track the download \
+            progress in, a new one is created if not provided. \n
+    Returns:
+        str: Path of the downloaded file, empty string if download failed. \
+            The file still needs to be converted with `convert_video`."""
+    if context is None:
+        context = DownloadContext(url)
     if not file_path:
         file_path = "/tmp/%(title)s.%(ext)s"
     ydl_opts = _get_ytdl_options()
     ydl_opts["outtmpl"] = file_path
+    ydl_opts["progress_hooks"] = [context.progress_hook]
+    ydl_opts["postprocessor_hooks"] = [context.postprocessor_hook]
+    ydl_opts["logger"] = _ErrorLogger(context)
     try:
         with YoutubeDL(ydl_opts) as ydl:
-            ydl.download([url])
-        if data and "filepath" in data:
-            return str(data["filepath"])
-    except (YoutubeDLError, Exception):
-        pass
+            info = ydl.extract_info(url)
+        if context.filepath and info:
+            # Codecs are needed to convert the video with `convert_video`
+            context.vcodec, context.acodec = info.get("vcodec"), info.get("acodec")
+            context.ext = info.get("ext")
+            context.status = "downloaded"
+            return context.filepath
+    except (YoutubeDLError, Exception) as e:
+        context.error = context.error or str(e)
+    context.status = "failed"
     logger.exception(f"Failed to download video from {url}")
     return ""
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, AsyncIterator
 from exceptions import InvalidResponseError
 from core.base.arr_manager.base import AsyncBaseArrManager
 
@@ -56,6 +56,22 @@ class RadarrManager(AsyncBaseArrManager):
             return movies
         raise InvalidResponseError("Invalid response from Radarr API")
 
+    async def iter_all_movies(self) -> AsyncIterator[dict[str, Any]]:
+        """Get all movies from the Arr API, one by one as they are received. \n
+        The response is decoded incrementally, so the whole list is never \
+            loaded in memory at once.
+
+        Yields:
+            dict[str, Any]: Movie from the Radarr API
+
+        Raises:
+            ConnectionError: If the connection is refused / response is not 200
+            ConnectionTimeoutError: If the connection times out
+            InvalidResponseError: If the API response is invalid
+        """
+        async for media in self._request_stream("GET", f"/api/{self.version}/movie"):
+            yield media
+
     async def get_movie(self, radarr_id: int) -> dict[str, Any]:
         """Get a movie from the Arr API
 
@@ -77,4 +93,5 @@ class RadarrManager(AsyncBaseArrManager):
 
     # Define Alias methods here!
     get_all_media = get_all_movies
+    iter_all_media = iter_all_movies
     get_media = get_movie
@@ -3,7 +3,7 @@ from core.base.connection_manager import (
     MediaUpdateDC,
 )
 from core.base.database.models.helpers import MediaReadDC
-from core.radarr.data_parser import parse_movie
+from core.radarr.data_parser import FINGERPRINT_KEYS, parse_movie
 from core.radarr.database_manager import MovieDatabaseManager
 from core.base.database.models.connection import ConnectionRead
 from core.radarr.models import MovieCreate
@@ -26,6 +26,7 @@ class RadarrConnectionManager(BaseConnectionManager[MovieCreate]):
             radarr_manager,
             parse_movie,
             inline_trailer=True,
+            fingerprint_keys=FINGERPRINT_KEYS,
         )
 
     def create_or_update_bulk(self, media_data: list[MovieCreate]) -> list[MediaReadDC]:
@@ -42,10 +43,18 @@ class RadarrConnectionManager(BaseConnectionManager[MovieCreate]):
                 movie_read.folder_path,
                 movie_read.arr_monitored,
                 movie_read.monitor,
+                movie_read.trailer_exists,
             )
             for movie_read, created in movie_read_list
         ]
 
+    def read_media_fingerprints(self) -> dict[int, tuple[str, MediaReadDC]]:
+        """Get the stored fingerprints of media for this connection from the database. \n
+        Returns:
+            dict[int, tuple[str, MediaReadDC]]: Fingerprint and media object keyed by arr id.
+        """
+        return MovieDatabaseManager().read_fingerprints(self.connection_id)
+
     def remove_deleted_media(self, media_ids: list[int]) -> None:
         """Remove the media from the database that are not present in the Radarr application. \n
         Args:
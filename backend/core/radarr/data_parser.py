@@ -4,6 +4,23 @@ from pydantic import AliasPath, BaseModel, Field, field_validator
 
 from core.radarr.models import MovieCreate
 
+# Keys of the Radarr API data that are used while parsing,
+# changes to any other keys do not need a database update
+FINGERPRINT_KEYS = (
+    "id",
+    "title",
+    "year",
+    "originalLanguage",
+    "overview",
+    "runtime",
+    "youTubeTrailerId",
+    "path",
+    "imdbId",
+    "tmdbId",
+    "images",
+    "monitored",
+)
+
 
 class RadarrDataParser(BaseModel):
     """Class to parse the data from Radarr."""
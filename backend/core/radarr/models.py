@@ -1,5 +1,6 @@
-from sqlmodel import Field
+from sqlmodel import Field, Index, text
 
+from core.base.database.utils.fts import add_fts_listeners
 from core.base.database.models.media import (
     MediaCreate,
     MediaDB,
@@ -18,6 +19,17 @@ class Movie(MediaDB, table=True):
     Use MovieCreate, MovieRead, or MovieUpdate instead.
     """
 
+    __table_args__ = (
+        # Partial index for finding movies that need a trailer download
+        Index(
+            "ix_movie_trailer_needed",
+            "id",
+            sqlite_where=text(
+                "monitor = 1 AND trailer_exists = 0 AND folder_path IS NOT NULL"
+            ),
+        ),
+    )
+
     id: int | None = Field(default=None, primary_key=True)
     connection_id: int = Field(foreign_key="connection.id", index=True)
     arr_id: int = Field(alias="radarr_id", index=True)
@@ -25,6 +37,10 @@ class Movie(MediaDB, table=True):
     arr_monitored: bool = Field(alias="radarr_monitored", default=False)
 
 
+# Keep full-text search table in sync with the movie table
+add_fts_listeners(Movie.__table__)  # type: ignore
+
+
 class MovieCreate(MediaCreate):
     """Movie model for creating a new movie. This is used in the API while creating.
 
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, AsyncIterator
 from exceptions import InvalidResponseError
 from core.base.arr_manager.base import AsyncBaseArrManager
 
@@ -57,6 +57,22 @@ class SonarrManager(AsyncBaseArrManager):
             return series
         raise InvalidResponseError("Invalid response from Sonarr API")
 
+    async def iter_all_series(self) -> AsyncIterator[dict[str, Any]]:
+        """Get all series from the Arr API, one by one as they are received. \n
+        The response is decoded incrementally, so the whole list is never \
+            loaded in memory at once.
+
+        Yields:
+            dict[str, Any]: Series from the Sonarr API
+
+        Raises:
+            ConnectionError: If the connection is refused / response is not 200
+            ConnectionTimeoutError: If the connection times out
+            InvalidResponseError: If the API response is invalid
+        """
+        async for media in self._request_stream("GET", f"/api/{self.version}/series"):
+            yield media
+
     async def get_series(self, sonarr_id: int) -> dict[str, Any]:
         """Get a series from the Sonarr API
 
@@ -78,4 +94,5 @@ class SonarrManager(AsyncBaseArrManager):
 
     # Define Alias methods here!
     get_all_media = get_all_series
+    iter_all_media = iter_all_series
     get_media = get_series
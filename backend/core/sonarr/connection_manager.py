@@ -3,7 +3,7 @@ from core.base.connection_manager import (
     MediaUpdateDC,
 )
 from core.base.database.models.helpers import MediaReadDC
-from core.sonarr.data_parser import parse_series
+from core.sonarr.data_parser import FINGERPRINT_KEYS, parse_series
 from core.sonarr.database_manager import SeriesDatabaseManager
 from core.base.database.models.connection import ConnectionRead
 from core.sonarr.models import SeriesCreate
@@ -26,6 +26,7 @@ class SonarrConnectionManager(BaseConnectionManager[SeriesCreate]):
             sonarr_manager,
             parse_series,
             inline_trailer=False,
+            fingerprint_keys=FINGERPRINT_KEYS,
         )
 
     def create_or_update_bulk(
@@ -44,10 +45,18 @@ class SonarrConnectionManager(BaseConnectionManager[SeriesCreate]):
                 folder_path=series_read.folder_path,
                 arr_monitored=series_read.arr_monitored,
                 monitor=series_read.monitor,
+                trailer_exists=series_read.trailer_exists,
             )
             for series_read, created in series_read_list
         ]
 
+    def read_media_fingerprints(self) -> dict[int, tuple[str, MediaReadDC]]:
+        """Get the stored fingerprints of media for this connection from the database. \n
+        Returns:
+            dict[int, tuple[str, MediaReadDC]]: Fingerprint and media object keyed by arr id.
+        """
+        return SeriesDatabaseManager().read_fingerprints(self.connection_id)
+
     def remove_deleted_media(self, media_ids: list[int]) -> None:
         """Remove the media from the database that are not present in the Sonarr application. \n
         Args:
@@ -4,6 +4,23 @@ from pydantic import AliasPath, BaseModel, Field, field_validator
 
 from core.sonarr.models import SeriesCreate
 
+# Keys of the Sonarr API data that are used while parsing,
+# changes to any other keys do not need a database update
+FINGERPRINT_KEYS = (
+    "id",
+    "title",
+    "year",
+    "originalLanguage",
+    "overview",
+    "runtime",
+    "youTubeTrailerId",
+    "path",
+    "imdbId",
+    "tvdbId",
+    "images",
+    "monitored",
+)
+
 
 class SonarrDataParser(BaseModel):
     """Class to parse the data from Sonarr."""
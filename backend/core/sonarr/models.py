@@ -1,5 +1,6 @@
-from sqlmodel import Field
+from sqlmodel import Field, Index, text
 
+from core.base.database.utils.fts import add_fts_listeners
 from core.base.database.models.media import (
     MediaCreate,
     MediaDB,
@@ -18,6 +19,17 @@ class Series(MediaDB, table=True):
     Use SeriesCreate, SeriesRead, or SeriesUpdate instead.
     """
 
+    __table_args__ = (
+        # Partial index for finding series that need a trailer download
+        Index(
+            "ix_series_trailer_needed",
+            "id",
+            sqlite_where=text(
+                "monitor = 1 AND trailer_exists = 0 AND folder_path IS NOT NULL"
+            ),
+        ),
+    )
+
     id: int | None = Field(default=None, primary_key=True)
     connection_id: int = Field(foreign_key="connection.id", index=True)
     arr_id: int = Field(alias="sonarr_id", index=True)
@@ -25,6 +37,10 @@ class Series(MediaDB, table=True):
     arr_monitored: bool = Field(alias="sonarr_monitored", default=False)
 
 
+# Keep full-text search table in sync with the series table
+add_fts_listeners(Series.__table__)  # type: ignore
+
+
 class SeriesCreate(MediaCreate):
     """Series model for creating a new series. This is used in the API while creating.
 
@@ -1,34 +1,88 @@
 import asyncio
 from datetime import datetime, timedelta
+import time
+from typing import Any
+from config.settings import app_settings
+from core.base.connection_manager import RefreshStats
 from core.base.database.manager.connection import ConnectionDatabaseManager
 from core.base.database.models.connection import ArrType, ConnectionRead
 from core.radarr.connection_manager import RadarrConnectionManager
 from core.sonarr.connection_manager import SonarrConnectionManager
 from app_logger import ModuleLogger
+from core.base.http_session import close_session
 from core.tasks.image_refresh import refresh_images
 from core.tasks import scheduler
 
 logger = ModuleLogger("APIRefreshTasks")
 
 
-async def api_refresh() -> None:
+async def _refresh_connection(
+    connection: ConnectionRead, sem: asyncio.Semaphore
+) -> dict[str, Any]:
+    """Refresh data from API for a connection, errors are logged and reported \
+        in the result instead of being raised.\n
+    Args:
+        connection (ConnectionRead): The connection to refresh.
+        sem (asyncio.Semaphore): Semaphore limiting the concurrent refreshes.\n
+    Returns:
+        dict[str, Any]: Details of the refresh for the connection."""
+    async with sem:  # Wait for a free slot in the semaphore
+        start = time.perf_counter()
+        status = "Finished"
+        stats = None
+        try:
+            stats = await api_refresh_by_id(connection, image_refresh=False)
+            if stats is None or stats.error:
+                status = "Error"
+        except Exception as e:
+            logger.exception(
+                f"Failed to refresh data for connection: {connection.name}. Error: {e}"
+            )
+            status = "Error"
+        duration = time.perf_counter() - start
+    logger.info(
+        f"Refresh for connection '{connection.name}' {status.lower()}"
+        f" in {duration:.2f} seconds"
+    )
+    return {
+        "connection_id": connection.id,
+        "name": connection.name,
+        "status": status,
+        "duration": round(duration, 2),
+        "media_count": stats.media_count if stats else 0,
+        "skipped_count": stats.skipped_count if stats else 0,
+    }
+
+
+async def api_refresh() -> list[dict[str, Any]]:
+    """Refresh data from API for all connections, \
+        multiple connections are refreshed concurrently.\n
+    Number of connections refreshed at once is limited by \
+        `api_refresh_concurrency` setting.\n
+    Returns:
+        list[dict[str, Any]]: Details of the refresh for each connection."""
     logger.info("Refreshing data from APIs")
     # Get all connections from database
     connnections = ConnectionDatabaseManager().read_all()
     if len(connnections) == 0:
         logger.warning("No connections found in the database")
-        return
+        return []
 
-    # Refresh data from API for each connection
-    for connection in connnections:
-        await api_refresh_by_id(connection, image_refresh=False)
+    # Refresh data from API for all connections concurrently
+    sem = asyncio.Semaphore(app_settings.api_refresh_concurrency)
+    refresh_details = await asyncio.gather(
+        *(_refresh_connection(connection, sem) for connection in connnections)
+    )
 
     # Refresh images after API refresh to download/update images for new media
     await refresh_images(recent_only=True)
     logger.info("API Refresh completed!")
+    return list(refresh_details)
 
 
-async def api_refresh_by_id(connection: ConnectionRead, image_refresh=True) -> None:
+async def api_refresh_by_id(
+    connection: ConnectionRead, image_refresh=True, incremental=True
+) -> RefreshStats | None:
     logger.info(f"Refreshing data from API for connection: {connection.name}")
     # Get connection manager based on connection type
     if connection.arr_type == ArrType.SONARR:
@@ -39,10 +93,10 @@ async def api_refresh_by_id(connection: ConnectionRead, image_refresh=True) -> N
         logger.warning(
             f"Invalid connection type: {connection.arr_type} for connection: {connection}"
         )
-        return
+        return None
 
     # Refresh data from API
-    await connection_db_manager.refresh()
+    stats = await connection_db_manager.refresh(incremental=incremental)
     logger.info(f"Data refreshed for connection: {connection.name}")
 
     # Refresh images after API refresh to download/update images for new media
@@ -50,6 +104,7 @@ async def api_refresh_by_id(connection: ConnectionRead, image_refresh=True) -> N
         await refresh_images(recent_only=True)
         logger.info("Images refreshed")
         logger.info("API Refresh completed!")
+    return stats
 
 
 def api_refresh_by_id_job(connection_id: int):
@@ -57,8 +112,13 @@ def api_refresh_by_id_job(connection_id: int):
         """Run the async task in a separate event loop."""
         new_loop = asyncio.new_event_loop()
         asyncio.set_event_loop(new_loop)
-        new_loop.run_until_complete(api_refresh_by_id(conn))
-        new_loop.close()
+        try:
+            # Manual refresh of a connection always does a full sync
+            new_loop.run_until_complete(api_refresh_by_id(conn, incremental=False))
+        finally:
+            # Close the loop's HTTP session even if the refresh failed
+            new_loop.run_until_complete(close_session())
+            new_loop.close()
         return
 
     logger.info(f"Refreshing data from API for connection ID: {connection_id}")
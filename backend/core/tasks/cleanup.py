@@ -1,5 +1,14 @@
+from app_logger import ModuleLogger
+from core.download.staging import cleanup_staging_dirs
+
+logger = ModuleLogger("CleanupTasks")
+
+
 def trailer_cleanup():
     """
-    Cleanup failed downloads and remove files older than 7 days.
+    Cleanup failed downloads, removes partial trailer files left by \
+        failed or crashed downloads from the staging folders.
     """
-    pass
+    removed_count = cleanup_staging_dirs()
+    logger.debug(f"Trailer cleanup removed {removed_count} stale files")
+    return
@@ -1,126 +1,265 @@
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from functools import partial
 
 from app_logger import ModuleLogger
 from config.settings import app_settings
+from core.base.database.manager.download import DownloadQueueDatabaseManager
+from core.base.database.manager.trailer_search import TrailerSearchDatabaseManager
+from core.base.database.models.download import (
+    DownloadQueueCreate,
+    DownloadQueueRead,
+    DownloadStatus,
+)
 from core.base.database.models.helpers import MediaTrailer, MediaUpdateDC
-from core.download.trailer import download_trailers
+from core.download.trailer import download_trailer, place_trailer
+from core.download.transcode import submit_transcode
+from core.download.video import DownloadContext, needs_transcode
 from core.files_handler import FilesHandler
 from core.radarr.database_manager import MovieDatabaseManager
 from core.sonarr.database_manager import SeriesDatabaseManager
 from core.tasks import scheduler
+from core.tasks.cleanup import trailer_cleanup
 
 logger = ModuleLogger("TrailerDownloadTasks")
 
 
-def _download_missing_media_trailers(is_movie: bool):
-    if not app_settings.monitor_enabled:
-        logger.warning("Monitoring is disabled, skipping download trailers")
-        return
+def _update_trailer_status(media: MediaTrailer, is_movie: bool) -> None:
+    """Update the trailer status of a downloaded media in database."""
+    if media.downloaded_at is None:
+        media.downloaded_at = datetime.now(timezone.utc)
+    media_update = MediaUpdateDC(
+        id=media.id,
+        monitor=False,
+        trailer_exists=True,
+        downloaded_at=media.downloaded_at,
+        yt_id=media.yt_id,
+    )
+    if is_movie:
+        db_manager = MovieDatabaseManager()
+    else:
+        db_manager = SeriesDatabaseManager()
+    logger.debug(f"Updating trailer status in database for '[{media.id}]{media.title}'")
+    db_manager.update_media_status_bulk([media_update])
+    return
+
+
+def _get_trailer_folder(is_movie: bool) -> bool:
+    """Check if trailers should be saved in a separate folder for the media type."""
+    if is_movie:
+        return app_settings.trailer_folder_movie
+    return app_settings.trailer_folder_series
+
+
+def _mark_queue_item_failed(
+    queue_item: DownloadQueueRead, media: MediaTrailer, error: str
+) -> None:
+    """Mark a download queue item as failed and log it."""
+    status = DownloadQueueDatabaseManager().mark_failed(queue_item.id, error)
+    msg = f"Trailer download failed for '[{media.id}]{media.title}'"
+    msg += f" [attempt {queue_item.attempts}]"
+    if status == DownloadStatus.QUEUED:
+        msg += ", will retry later"
+    logger.info(msg)
+    return
+
+
+def _finish_queue_item(
+    queue_item: DownloadQueueRead, media: MediaTrailer, context: DownloadContext
+) -> bool:
+    """Convert a downloaded trailer, move it to the media folder, \
+        and update the queue item and media status. \n
+    Runs in the transcoding pool if the trailer needs transcoding. \n
+    Args:
+        queue_item (DownloadQueueRead): The claimed download queue item.
+        media (MediaTrailer): Media of the queue item, with the downloaded `yt_id`.
+        context (DownloadContext): Context of the trailer download. \n
+    Returns:
+        bool: True if trailer is placed successfully, False otherwise."""
+    error = "Trailer conversion failed"
+    try:
+        placed = place_trailer(media, context, _get_trailer_folder(queue_item.is_movie))
+        if placed:
+            media.downloaded_at = datetime.now(timezone.utc)
+            _update_trailer_status(media, queue_item.is_movie)
+            DownloadQueueDatabaseManager().mark_done(queue_item.id, media.yt_id)
+    except Exception as e:
+        logger.exception(e)
+        placed = False
+        error = f"{error}: {e}"
+    if not placed:
+        _mark_queue_item_failed(queue_item, media, error)
+        return False
+    logger.info(
+        f"Trailer downloaded for '[{media.id}]{media.title}' from [{media.yt_id}]"
+    )
+    return True
+
+
+def _completed(result: bool) -> Future[bool]:
+    """-->>This is a private method<<-- \n
+    Wrap a result in an already completed future."""
+    future: Future[bool] = Future()
+    future.set_result(result)
+    return future
+
+
+def _download_queue_item(queue_item: DownloadQueueRead) -> Future[bool]:
+    """Download the trailer for a claimed download queue item, \
+        and update the queue item and media status as it progresses. \n
+    Only the download runs in the calling thread. If the trailer needs transcoding, \
+        conversion and placement are handed off to the transcoding pool, \
+        so the calling worker can download the next item. \n
+    Args:
+        queue_item (DownloadQueueRead): The claimed download queue item. \n
+    Returns:
+        Future[bool]: Resolves to True if trailer is downloaded and placed \
+            successfully, False otherwise."""
+    queue_manager = DownloadQueueDatabaseManager()
+    media = MediaTrailer(
+        id=queue_item.media_id,
+        title=queue_item.title,
+        year=queue_item.year,
+        folder_path=queue_item.folder_path,
+        yt_id=queue_item.yt_id,
+    )
+    current_status = DownloadStatus.SEARCHING
+
+    def on_progress(context: DownloadContext) -> None:
+        # Update the queue item status only when download stage changes
+        nonlocal current_status
+        status = DownloadStatus.DOWNLOADING
+        if context.status == "converting":
+            status = DownloadStatus.CONVERTING
+        if status == current_status:
+            return
+        current_status = status
+        queue_manager.update_status(queue_item.id, status)
+
+    logger.info(f"Downloading trailer for '[{media.id}]{media.title}'...")
+    error = "Trailer download failed"
+    try:
+        context = download_trailer(media, queue_item.is_movie, on_progress=on_progress)
+    except Exception as e:
+        logger.exception(e)
+        context = None
+        error = f"{error}: {e}"
+    if context is None:
+        _mark_queue_item_failed(queue_item, media, error)
+        return _completed(False)
+    finish = partial(_finish_queue_item, queue_item, media, context)
+    if not needs_transcode(context):
+        # Remuxing is cheap, place the trailer in the download worker
+        return _completed(finish())
+    # Shows as converting while it waits for a transcoding worker
+    context.update_status("converting")
+    return submit_transcode(finish)
+
+
+def _queue_worker() -> list[Future[bool]]:
+    """Claim and download items from the download queue until no item is due. \n
+    Returns:
+        list[Future[bool]]: Futures of the downloaded trailers, \
+            resolve when the trailers are placed in the media folders."""
+    queue_manager = DownloadQueueDatabaseManager()
+    futures: list[Future[bool]] = []
+    while (queue_item := queue_manager.claim_next()) is not None:
+        futures.append(_download_queue_item(queue_item))
+    return futures
+
+
+def process_download_queue() -> int:
+    """Download trailers for the due items in the download queue. \n
+    Items are claimed and downloaded by a pool of worker threads, \
+        size of the pool is set by `trailer_download_workers` setting. \
+        Trailers that need transcoding are handed off to the transcoding pool, \
+        so downloads and transcodes of different items overlap. \n
+    Returns:
+        int: Number of trailers downloaded."""
+    workers = app_settings.trailer_download_workers
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="TrailerDownload"
+    ) as executor:
+        worker_futures = [executor.submit(_queue_worker) for _ in range(workers)]
+    # Wait for the handed off transcodes to finish as well
+    downloaded_count = sum(
+        future.result()
+        for worker_future in worker_futures
+        for future in worker_future.result()
+    )
+    logger.info(f"Downloaded {downloaded_count} trailers from the download queue")
+    return downloaded_count
+
+
+def _queue_missing_media_trailers(is_movie: bool) -> None:
     if is_movie:
         db_manager = MovieDatabaseManager()
     else:
         db_manager = SeriesDatabaseManager()
     media_type = "movies" if is_movie else "series"
-    # Get all media from the database
-    db_media_list = db_manager.read_all()
-    media_trailer_list = []
-    logger.debug(f"Checking trailers for {len(db_media_list)} monitored {media_type}")
-    # Create MediaTrailer objects for each movie/series
+    # Get media that need a trailer from the database
+    media_list = db_manager.read_trailer_needed()
+    queue_items: list[DownloadQueueCreate] = []
+    logger.debug(f"Checking trailers for {len(media_list)} monitored {media_type}")
+    # Create download queue items for each movie/series
     skip_count = 0
-    for db_media in db_media_list:
-        if not db_media.monitor:
-            logger.debug(
-                f"Skipping {db_media.title} (id:{db_media.id}), monitoring disabled"
-            )
-            continue
-        if db_media.folder_path is None:
-            logger.debug(
-                f"Skipping {db_media.title} (id:{db_media.id}), folder path not found"
-            )
-            continue
-        if db_media.trailer_exists:
-            logger.debug(
-                f"Skipping {db_media.title} (id:{db_media.id}), trailer exists"
-            )
-            continue
+    for media in media_list:
         if app_settings.wait_for_media:
-            if not FilesHandler.check_media_exists(db_media.folder_path):
+            if not FilesHandler.check_media_exists(media.folder_path):
                 skip_count += 1
                 logger.debug(
-                    f"Skipping {db_media.title} (id:{db_media.id}), media file(s) not found"
+                    f"Skipping {media.title} (id:{media.id}), media file(s) not found"
                 )
                 continue
-        media_trailer = MediaTrailer(
-            id=db_media.id,
-            title=db_media.title,
-            year=db_media.year,
-            folder_path=db_media.folder_path,
-            yt_id=db_media.youtube_trailer_id,
+        queue_item = DownloadQueueCreate(
+            media_id=media.id,
+            is_movie=is_movie,
+            title=media.title,
+            year=media.year,
+            folder_path=media.folder_path,
+            yt_id=media.yt_id,
         )
-        media_trailer_list.append(media_trailer)
+        queue_items.append(queue_item)
     if skip_count:
         logger.info(f"Skipping trailer download for {skip_count} {media_type}")
 
-    if not media_trailer_list:
+    # Remove queued media that no longer need a trailer, and queue missing ones
+    queue_manager = DownloadQueueDatabaseManager()
+    queue_manager.delete_queued_except(
+        [queue_item.media_id for queue_item in queue_items], is_movie
+    )
+    if not queue_items:
         logger.info(f"No missing {media_type} trailers to download")
         return
-
-    # Download missing trailers
-    downloaded_media = download_trailers(media_trailer_list, is_movie)
-    if not downloaded_media:
-        logger.info(f"No {media_type} trailers downloaded")
-        return
-    logger.debug("Updating trailer status in database")
-    media_update_list = []
-    for media in downloaded_media:
-        media_update_list.append(
-            MediaUpdateDC(
-                id=media.id,
-                monitor=False,
-                trailer_exists=True,
-                downloaded_at=media.downloaded_at,
-                yt_id=media.yt_id,
-            )
-        )
-    # Update the trailer statuses in database
-    db_manager.update_media_status_bulk(media_update_list)
+    queued_ids = queue_manager.enqueue_bulk(queue_items)
+    logger.info(f"{len(queued_ids)} missing {media_type} trailers in download queue")
     return
 
 
 def download_missing_trailers():
-    """Download missing trailers for all movies and series."""
+    """Queue missing trailers for all movies and series and download them."""
+    if not app_settings.monitor_enabled:
+        logger.warning("Monitoring is disabled, skipping download trailers")
+        return
     logger.info("Downloading missing trailers")
-    _download_missing_media_trailers(is_movie=True)
-    _download_missing_media_trailers(is_movie=False)
-    # logger.info("Trailers download complete")
+    TrailerSearchDatabaseManager().delete_expired()
+    trailer_cleanup()
+    _queue_missing_media_trailers(is_movie=True)
+    _queue_missing_media_trailers(is_movie=False)
+    process_download_queue()
     return
 
 
-def _download_trailer_by_id(mediaT: MediaTrailer, is_movie: bool):
-    download_media = download_trailers([mediaT], is_movie)
-    if not download_media:
-        logger.info("No trailers downloaded")
+def _download_trailer_by_id(queue_item_id: int, title: str):
+    queue_manager = DownloadQueueDatabaseManager()
+    # Claim the item, fails if a download worker already picked it up
+    claimed_item = queue_manager.claim_next(queue_item_id)
+    if claimed_item is None:
+        logger.info(f"Trailer download already in progress for '{title}'")
         return
-    logger.debug("Updating trailer status in database")
-    media_update_list = []
-    for media in download_media:
-        if media.downloaded_at is None:
-            media.downloaded_at = datetime.now(timezone.utc)
-        media_update_list.append(
-            MediaUpdateDC(
-                id=media.id,
-                monitor=False,
-                trailer_exists=True,
-                yt_id=media.yt_id,
-                downloaded_at=media.downloaded_at,
-            )
-        )
-    if is_movie:
-        db_manager = MovieDatabaseManager()
-    else:
-        db_manager = SeriesDatabaseManager()
-    # Update the trailer statuses in database
-    db_manager.update_media_status_bulk(media_update_list)
+    if not _download_queue_item(claimed_item).result():
+        logger.info("No trailers downloaded")
+    return
 
 
 def download_trailer_by_id(media_id: int, is_movie: bool, yt_id: str = "") -> str:
@@ -145,18 +284,27 @@ def download_trailer_by_id(media_id: int, is_movie: bool, yt_id: str = "") -> st
         return msg
     if yt_id:
         media.youtube_trailer_id = yt_id
-    media_trailer = MediaTrailer(
-        id=media.id,
+    queue_item = DownloadQueueCreate(
+        media_id=media.id,
+        is_movie=is_movie,
         title=media.title,
         year=media.year,
         folder_path=media.folder_path,
         yt_id=media.youtube_trailer_id,
+        priority=1,
     )
+    # Queue it now, so the request fails if the trailer is already being downloaded
+    queued_ids = DownloadQueueDatabaseManager().enqueue_bulk([queue_item], force=True)
+    if not queued_ids:
+        msg = "Trailer download already in progress for "
+        msg += f"{'movie' if is_movie else 'series'}: '{media.title}' (ID: {media_id})"
+        logger.info(msg)
+        return msg
 
     # Add Job to scheduler to download trailer
     scheduler.add_job(
         func=_download_trailer_by_id,
-        args=(media_trailer, is_movie),
+        args=(queued_ids[0], media.title),
         trigger="date",
         run_date=datetime.now() + timedelta(seconds=1),
         id=f"download_trailer_by_id_{media_id}_{is_movie}",
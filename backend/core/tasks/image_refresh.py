@@ -1,6 +1,7 @@
-from core.base.database.models.helpers import MediaImage
-from core.base.database.models.media import MediaUpdate
-from core.download.image import refresh_media_images
+import asyncio
+
+from core.base.database.manager.image import ImageDatabaseManager
+from core.download.image import refresh_media_images, remove_unreferenced_images
 from core.radarr.database_manager import MovieDatabaseManager
 from core.sonarr.database_manager import SeriesDatabaseManager
 from app_logger import ModuleLogger
@@ -18,6 +19,8 @@ async def refresh_images(recent_only: bool = False):
     logger.debug("Refreshing series images")
     await refresh_and_save_media_images(is_movie=False, recent_only=recent_only)
     logger.info("Series Images refresh complete!")
+    # Remove images of deleted media and images replaced by new ones
+    await cleanup_images()
 
 
 async def refresh_and_save_media_images(is_movie: bool, recent_only: bool = False):
@@ -25,52 +28,41 @@ async def refresh_and_save_media_images(is_movie: bool, recent_only: bool = Fals
         db_manager = MovieDatabaseManager()
     else:
         db_manager = SeriesDatabaseManager()
+    image_manager = ImageDatabaseManager()
 
-    if recent_only:
-        # Get all media from the database that have been added/updated in the last 24 hours
-        db_media_list = db_manager.read_recent()
-    else:
-        # Get all media from the database
-        db_media_list = db_manager.read_all()
-    media_image_list: list[MediaImage] = []
+    # Get only the image columns of media from the database
+    media_image_list = db_manager.read_images(recent_only=recent_only)
     logger.debug(
-        f"Refreshing images for {len(db_media_list)} {'movies' if is_movie else 'series'}"
+        f"Refreshing {len(media_image_list)} images for"
+        f" {'movies' if is_movie else 'series'}"
     )
-    # Create MediaImage objects for each movie/series
-    for db_media in db_media_list:
-        poster_image = MediaImage(
-            id=db_media.id,
-            is_poster=True,
-            image_url=db_media.poster_url,
-            image_path=db_media.poster_path,
+    # Get the images that were already downloaded
+    known_sources = image_manager.read_sources(
+        list(
+            {
+                (media.image_url, media.is_poster)
+                for media in media_image_list
+                if media.image_url
+            }
         )
-        media_image_list.append(poster_image)
-        fanart_image = MediaImage(
-            id=db_media.id,
-            is_poster=False,
-            image_url=db_media.fanart_url,
-            image_path=db_media.fanart_path,
-        )
-        media_image_list.append(fanart_image)
+    )
     # Refresh images in the system, and/or get updated paths
     # refresh_media_images modifies the MediaImage objects in place
-    await refresh_media_images(is_movie, media_image_list)
+    # Full refresh also checks if downloaded images changed upstream
+    new_sources = await refresh_media_images(
+        media_image_list, known_sources, revalidate=not recent_only
+    )
 
-    # Update the database with new image paths
-    media_update_dict: dict[int, MediaUpdate] = {}
-    for media_image in media_image_list:
-        if media_image.id in media_update_dict:
-            media_update = media_update_dict[media_image.id]
-        else:
-            media_update = MediaUpdate()
-        if media_image.is_poster:
-            media_update.poster_path = media_image.image_path
-        else:
-            media_update.fanart_path = media_image.image_path
-        media_update_dict[media_image.id] = media_update
-    media_update_tuples = [
-        (id, update_obj) for id, update_obj in media_update_dict.items()
-    ]
     # Save changes to database
-    db_manager.update_bulk(media_update_tuples)
+    image_manager.save_sources(new_sources)
+    db_manager.update_image_paths(media_image_list)
+    return
+
+
+async def cleanup_images():
+    """Delete images that are no longer used by any media from the disk."""
+    image_manager = ImageDatabaseManager()
+    references = image_manager.read_references()
+    removed_hashes = await asyncio.to_thread(remove_unreferenced_images, references)
+    image_manager.delete_hashes(removed_hashes)
     return
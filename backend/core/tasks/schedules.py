@@ -1,9 +1,11 @@
 import asyncio
 from datetime import datetime, timedelta
+from typing import Any
 
 from app_logger import ModuleLogger
 from config.settings import app_settings
-from core.tasks import scheduler
+from core.base.http_session import close_session
+from core.tasks import scheduler, task_logging
 from core.tasks.api_refresh import api_refresh
 from core.tasks.download_trailers import download_missing_trailers
 from core.tasks.image_refresh import refresh_images
@@ -13,18 +15,23 @@ from core.tasks.image_refresh import refresh_images
 logger = ModuleLogger("BackgroundTasks")
 
 
-def run_async(task) -> None:
-    """Run the async task in a separate event loop."""
+def run_async(task) -> Any:
+    """Run the async task in a separate event loop and return its result."""
     new_loop = asyncio.new_event_loop()
     asyncio.set_event_loop(new_loop)
-    new_loop.run_until_complete(task())
-    new_loop.close()
-    return
+    try:
+        return new_loop.run_until_complete(task())
+    finally:
+        # Close the loop's HTTP session even if the task failed
+        new_loop.run_until_complete(close_session())
+        new_loop.close()
 
 
 def _refresh_api_data():
     """Refreshes data from Arr APIs."""
-    run_async(api_refresh)
+    refresh_details = run_async(api_refresh)
+    # Report per connection details in the task info
+    task_logging.update_task_details("hourly_refresh_api_data_job", refresh_details)
     return
 
 
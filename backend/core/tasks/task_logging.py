@@ -1,12 +1,12 @@
 from contextlib import contextmanager
 from datetime import datetime, timezone
-from typing import Generator, Sequence
+from typing import Any, Generator, Sequence
 
 from api.v1 import websockets
 from apscheduler import events
 from apscheduler.schedulers.base import BaseScheduler
 from apscheduler.job import Job
-from sqlalchemy import StaticPool
+from sqlalchemy import JSON, Column, StaticPool
 from sqlmodel import Field, SQLModel, Session, col, create_engine, select
 
 
@@ -23,6 +23,10 @@ class TaskInfo(SQLModel):
     last_run_status: str = Field(default="Not Run Yet")
     next_run: datetime | None = Field(default=None)
     scheduled: bool = Field(default=True)
+    # Additional details of last run reported by the task itself, if any
+    last_run_details: list[dict[str, Any]] = Field(
+        default_factory=list, sa_column=Column(JSON)
+    )
 
 
 class TaskInfoDB(TaskInfo, table=True):
@@ -125,6 +129,7 @@ def update_task(task: TaskInfo) -> None:
     _task_db.last_run_start = task.last_run_start
     _task_db.last_run_status = task.last_run_status
     _task_db.next_run = task.next_run
+    _task_db.last_run_details = task.last_run_details
 
     # Save to the database
     with _get_session() as session:
@@ -133,6 +138,24 @@ def update_task(task: TaskInfo) -> None:
     return None
 
 
+def update_task_details(task_id: str, details: list[dict[str, Any]]) -> None:
+    """Update the details of the last run of a task in the in-memory database. \n
+    Args:
+        task_id (str): Task ID to update.
+        details (list[dict[str, Any]]): Details of the last run. \n
+    Returns:
+        None \n
+    """
+    _task_db = _get_task(task_id)
+    if not _task_db:
+        return None
+    _task_db.last_run_details = details
+    with _get_session() as session:
+        session.add(_task_db)
+        session.commit()
+    return None
+
+
 def _get_queue(queue_id: str) -> QueueInfoDB | None:
     """Get a task from the in-memory database. \n
     Args:
@@ -322,6 +345,7 @@ def task_started_event(event: events.JobEvent) -> None:
         task.last_run_start = _now
         task.last_run_duration = 0
         task.last_run_status = "Running"
+        task.last_run_details = []
         task.next_run = _get_task_next_run(_task_id)
         update_task(task)
         _task_name = task.name
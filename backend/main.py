@@ -10,6 +10,11 @@ from app_logger import ModuleLogger
 from api.v1.routes import api_v1_router
 from api.v1.websockets import ws_manager
 from config.settings import app_settings
+from core.base.database.manager.download import DownloadQueueDatabaseManager
+from core.base.database.utils.engine import check_sqlite_pragmas, engine
+from core.base.database.utils.executor import shutdown_db_executor
+from core.base.http_session import close_session
+from core.download.transcode import shutdown_transcode_executor
 from core.tasks import scheduler
 from core.tasks.schedules import schedule_all_tasks
 
@@ -23,6 +28,13 @@ logging = ModuleLogger("Main")
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Before startup
+    # Check the database connection settings are in effect
+    if not app_settings.testing:
+        check_sqlite_pragmas(engine)
+    # Resume trailer downloads that were interrupted by a restart
+    resumed_count = DownloadQueueDatabaseManager().reset_in_progress()
+    if resumed_count:
+        logging.info(f"Resuming {resumed_count} interrupted trailer downloads")
     # Schedule all tasks
     logging.info("Scheduling tasks")
     schedule_all_tasks()
@@ -33,6 +45,9 @@ async def lifespan(app: FastAPI):
 
     # Before shutdown
     scheduler.shutdown()
+    await close_session()
+    shutdown_db_executor()
+    shutdown_transcode_executor()
 
 
 # Get APP_NAME and APP_VERSION from environment variables
@@ -69,6 +84,7 @@ trailarr_api.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Register API routes
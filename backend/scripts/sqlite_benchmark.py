@@ -0,0 +1,181 @@
+"""Benchmark SQLite read/write concurrency with and without the connection pragmas. \n
+Simulates the API refresh job, a writer thread upserting media in batches, \
+    while reader threads keep reading pages of recent media like the frontend does. \n
+Development tool, not part of the app. Run it from the `backend` folder::
+
+    python -m scripts.sqlite_benchmark [media_count] [reader_count] [batch_size]
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+from sqlalchemy import Engine, event
+from sqlalchemy.exc import OperationalError
+from sqlmodel import SQLModel, create_engine, desc, insert, select, update
+
+import core.base.database.utils.init_db  # noqa: F401
+from config.settings import APP_DATA_DIR
+from core.base.database.models.connection import ArrType, Connection, MonitorType
+from core.base.database.utils.engine import apply_sqlite_pragmas, get_sqlite_pragmas
+from core.radarr.models import Movie
+
+
+@dataclass(slots=True)
+class BenchmarkResult:
+    profile: str
+    write_seconds: float = 0.0
+    commit_latencies: list[float] = field(default_factory=list)
+    read_latencies: list[float] = field(default_factory=list)
+    lock_errors: int = 0
+
+    def __str__(self) -> str:
+        def _ms(values: list[float], percentile: int) -> float:
+            if len(values) < 2:
+                return sum(values) * 1000
+            return statistics.quantiles(values, n=100)[percentile - 1] * 1000
+
+        return (
+            f"{self.profile:>8}: writes {self.write_seconds:6.2f}s, "
+            f"commit p50 {_ms(self.commit_latencies, 50):7.2f}ms "
+            f"p99 {_ms(self.commit_latencies, 99):7.2f}ms | "
+            f"reads {len(self.read_latencies):6d}, "
+            f"p50 {_ms(self.read_latencies, 50):7.2f}ms "
+            f"p99 {_ms(self.read_latencies, 99):7.2f}ms | "
+            f"lock errors {self.lock_errors}"
+        )
+
+
+def _create_engine(db_path: str, pragmas: dict[str, str | int]) -> Engine:
+    db_engine = create_engine(f"sqlite:///{db_path}")
+    if pragmas:
+        event.listen(
+            db_engine,
+            "connect",
+            lambda dbapi_connection, _: apply_sqlite_pragmas(dbapi_connection, pragmas),
+        )
+    SQLModel.metadata.create_all(db_engine)
+    with db_engine.begin() as connection:
+        connection.execute(
+            insert(Connection).values(
+                id=1,
+                name="Benchmark",
+                arr_type=ArrType.RADARR,
+                url="http://localhost",
+                api_key="API_KEY",
+                monitor=MonitorType.MONITOR_NEW,
+                added_at=datetime.now(timezone.utc),
+            )
+        )
+    return db_engine
+
+
+def _write_media(
+    db_engine: Engine, media_count: int, batch_size: int, result: BenchmarkResult
+):
+    """Insert all media in batches, then update them all, like two refreshes."""
+    added_at = datetime.now(timezone.utc)
+    start = time.perf_counter()
+    for offset in range(0, media_count, batch_size):
+        rows = [
+            {
+                "connection_id": 1,
+                "arr_id": arr_id,
+                "title": f"Movie {arr_id}",
+                "txdb_id": str(arr_id),
+                "overview": "Benchmark movie " * 20,
+                "added_at": added_at + timedelta(seconds=arr_id),
+            }
+            for arr_id in range(offset, min(offset + batch_size, media_count))
+        ]
+        _commit(db_engine, insert(Movie), rows, result)
+    for offset in range(0, media_count, batch_size):
+        statement = (
+            update(Movie)
+            .where(Movie.arr_id >= offset, Movie.arr_id < offset + batch_size)  # type: ignore
+            .values(monitor=True, updated_at=datetime.now(timezone.utc))
+        )
+        _commit(db_engine, statement, None, result)
+    result.write_seconds = time.perf_counter() - start
+
+
+def _commit(db_engine: Engine, statement, rows, result: BenchmarkResult) -> None:
+    start = time.perf_counter()
+    try:
+        with db_engine.begin() as connection:
+            connection.execute(statement, rows)
+    except OperationalError:
+        result.lock_errors += 1
+        return
+    result.commit_latencies.append(time.perf_counter() - start)
+
+
+def _read_media(db_engine: Engine, stop: threading.Event, result: BenchmarkResult):
+    """Read pages of recent media until the writer is done."""
+    statement = select(Movie).order_by(desc(Movie.added_at)).limit(30)
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            with db_engine.connect() as connection:
+                connection.execute(statement).all()
+        except OperationalError:
+            result.lock_errors += 1
+            continue
+        result.read_latencies.append(time.perf_counter() - start)
+
+
+def run_benchmark(
+    profile: str,
+    pragmas: dict[str, str | int],
+    media_count: int = 20000,
+    reader_count: int = 4,
+    batch_size: int = 500,
+) -> BenchmarkResult:
+    """Run the benchmark on a new temporary database. \n
+    Args:
+        profile (str): Name of the profile, used in the result.
+        pragmas (dict[str, str | int]): Pragmas to apply on each connection.
+        media_count (int) [Optional]: Number of media to write. Default is 20000.
+        reader_count (int) [Optional]: Number of reader threads. Default is 4.
+        batch_size (int) [Optional]: Number of media written per commit. \
+            Default is 500, same as the API refresh. \n
+    Returns:
+        BenchmarkResult: The write and read timings."""
+    result = BenchmarkResult(profile)
+    # Use the app data folder, so the database is on the same disk as the real one
+    with tempfile.TemporaryDirectory(dir=APP_DATA_DIR) as temp_dir:
+        db_engine = _create_engine(os.path.join(temp_dir, "benchmark.db"), pragmas)
+        stop = threading.Event()
+        readers = [
+            threading.Thread(target=_read_media, args=(db_engine, stop, result))
+            for _ in range(reader_count)
+        ]
+        for reader in readers:
+            reader.start()
+        try:
+            _write_media(db_engine, media_count, batch_size, result)
+        finally:
+            stop.set()
+            for reader in readers:
+                reader.join()
+            db_engine.dispose()
+    return result
+
+
+if __name__ == "__main__":
+    _media_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    _reader_count = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    _batch_size = int(sys.argv[3]) if len(sys.argv) > 3 else 500
+    print(
+        f"Writing {_media_count} media in batches of {_batch_size} "
+        f"with {_reader_count} concurrent readers"
+    )
+    for _profile, _pragmas in (("default", {}), ("tuned", get_sqlite_pragmas())):
+        print(
+            run_benchmark(_profile, _pragmas, _media_count, _reader_count, _batch_size)
+        )
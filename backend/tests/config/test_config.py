@@ -34,3 +34,40 @@ class TestConfig:
     def test_trailer_file_format(self):
         app_settings.trailer_file_format = "some format"  # Invalid value
         assert app_settings.trailer_file_format == "mkv"
+
+    def test_transcode_priority_limits(self):
+        app_settings.transcode_nice = -5  # Below minimum
+        assert app_settings.transcode_nice == 0
+        app_settings.transcode_nice = 25  # Above maximum
+        assert app_settings.transcode_nice == 19
+        app_settings.transcode_ionice_class = 1  # Realtime, not allowed
+        assert app_settings.transcode_ionice_class == 2
+        app_settings.transcode_ionice_class = 3
+        assert app_settings.transcode_ionice_class == 3
+        app_settings.transcode_ionice_level = 9  # Above maximum
+        assert app_settings.transcode_ionice_level == 7
+        app_settings.transcode_nice = 10
+        app_settings.transcode_ionice_class = 2
+
+    def test_sqlite_settings(self):
+        app_settings.sqlite_journal_mode = "delete"  # Lowercase value
+        assert app_settings.sqlite_journal_mode == "DELETE"
+        app_settings.sqlite_journal_mode = "WAL; DROP TABLE media"  # Invalid value
+        assert app_settings.sqlite_journal_mode == "WAL"
+        app_settings.sqlite_synchronous = "some mode"  # Invalid value
+        assert app_settings.sqlite_synchronous == "NORMAL"
+        app_settings.sqlite_temp_store = "some store"  # Invalid value
+        assert app_settings.sqlite_temp_store == "MEMORY"
+        app_settings.sqlite_busy_timeout = -1  # Below minimum
+        assert app_settings.sqlite_busy_timeout == 0
+        app_settings.sqlite_busy_timeout = 5000
+
+    def test_db_thread_pool_size(self):
+        app_settings.db_thread_pool_size = 0  # Below minimum
+        assert app_settings.db_thread_pool_size == 1
+        app_settings.db_thread_pool_size = 4
+
+    def test_image_process_workers(self):
+        app_settings.image_process_workers = -1  # Below minimum
+        assert app_settings.image_process_workers == 1
+        app_settings.image_process_workers = 2
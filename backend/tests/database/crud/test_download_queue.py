@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta, timezone
+import sqlite3
+
+import pytest
+from sqlmodel import delete
+
+from core.base.database.manager.download import (
+    MAX_ATTEMPTS,
+    DownloadQueueDatabaseManager,
+)
+from core.base.database.models.download import (
+    DownloadQueue,
+    DownloadQueueCreate,
+    DownloadStatus,
+)
+from core.base.database.utils.engine import get_session
+
+
+def _queue_item(media_id: int, priority: int = 0) -> DownloadQueueCreate:
+    return DownloadQueueCreate(
+        media_id=media_id,
+        is_movie=True,
+        title=f"Movie {media_id}",
+        year=2021,
+        folder_path=f"/media/movie_{media_id}",
+        priority=priority,
+    )
+
+
+class TestDownloadQueueDatabaseManager:
+    queue_manager = DownloadQueueDatabaseManager()
+
+    @pytest.fixture(autouse=True, scope="function")
+    def queue_fixture(self):
+        with get_session() as session:
+            session.exec(delete(DownloadQueue))  # type: ignore
+            session.commit()
+
+    def test_enqueue_no_duplicates(self):
+        self.queue_manager.enqueue_bulk([_queue_item(1), _queue_item(2)])
+        self.queue_manager.enqueue_bulk([_queue_item(1), _queue_item(3)])
+        queue_items = self.queue_manager.read_all()
+        assert sorted(item.media_id for item in queue_items) == [1, 2, 3]
+
+    def test_claim_by_priority(self):
+        self.queue_manager.enqueue_bulk([_queue_item(1), _queue_item(2, priority=1)])
+        first = self.queue_manager.claim_next()
+        second = self.queue_manager.claim_next()
+        assert first and first.media_id == 2
+        assert first.status == DownloadStatus.SEARCHING
+        assert first.attempts == 1
+        assert second and second.media_id == 1
+        assert self.queue_manager.claim_next() is None
+
+    def test_in_progress_not_queued_again(self):
+        queued_ids = self.queue_manager.enqueue_bulk([_queue_item(1)])
+        self.queue_manager.claim_next()
+        assert self.queue_manager.enqueue_bulk([_queue_item(1)], force=True) == []
+        assert self.queue_manager.claim_next(queued_ids[0]) is None
+        # Interrupted downloads are resumed after restart
+        assert self.queue_manager.reset_in_progress() == 1
+        assert self.queue_manager.claim_next(queued_ids[0]) is not None
+
+    def test_mark_failed_backoff(self):
+        queued_ids = self.queue_manager.enqueue_bulk([_queue_item(1)])
+        for _ in range(MAX_ATTEMPTS - 1):
+            item = self.queue_manager.claim_next()
+            assert item is not None
+            status = self.queue_manager.mark_failed(item.id, "error")
+            assert status == DownloadStatus.QUEUED
+            # Not due until backoff delay has passed
+            assert self.queue_manager.claim_next() is None
+            with get_session() as session:
+                db_item = session.get(DownloadQueue, queued_ids[0])
+                assert db_item
+                db_item.next_attempt_at = datetime.now(timezone.utc) - timedelta(1)
+                session.add(db_item)
+                session.commit()
+        item = self.queue_manager.claim_next()
+        assert item is not None
+        assert self.queue_manager.mark_failed(item.id, "error") == DownloadStatus.FAILED
+        # Failed item is queued again only when forced
+        assert self.queue_manager.enqueue_bulk([_queue_item(1)]) == []
+        assert (
+            self.queue_manager.enqueue_bulk([_queue_item(1)], force=True) == queued_ids
+        )
+
+    def test_delete_queued_except(self):
+        self.queue_manager.enqueue_bulk(
+            [_queue_item(1), _queue_item(2), _queue_item(3, priority=1)]
+        )
+        self.queue_manager.delete_queued_except([1], is_movie=True)
+        queue_items = self.queue_manager.read_all()
+        assert sorted(item.media_id for item in queue_items) == [1, 3]
+
+    @pytest.fixture
+    def variable_limit(self):
+        # Use the default SQLite limit, some builds allow many more variables
+        with get_session() as session:
+            dbapi_connection = session.connection().connection.dbapi_connection
+            limit = sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER
+            default_limit = dbapi_connection.setlimit(limit, 32766)  # type: ignore
+        yield
+        dbapi_connection.setlimit(limit, default_limit)  # type: ignore
+
+    def test_delete_queued_except_many_media(self, variable_limit):
+        # More media ids than SQLite allows variables in a single query
+        self.queue_manager.enqueue_bulk([_queue_item(1), _queue_item(50_001)])
+        self.queue_manager.delete_queued_except(list(range(50_000)), is_movie=True)
+        queue_items = self.queue_manager.read_all()
+        assert [item.media_id for item in queue_items] == [1]
@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import delete
+
+from core.base.database.manager.general import GeneralDatabaseManager
+from core.base.database.models.connection import ArrType, Connection, MonitorType
+from core.base.database.models.helpers import MediaUpdateDC
+from core.base.database.utils.engine import get_session
+from core.radarr.database_manager import MovieDatabaseManager
+from core.radarr.models import Movie, MovieCreate
+from core.sonarr.database_manager import SeriesDatabaseManager
+from core.sonarr.models import Series, SeriesCreate
+
+
+class TestGeneralDatabaseManager:
+    general_handler = GeneralDatabaseManager()
+    movie_handler = MovieDatabaseManager()
+    series_handler = SeriesDatabaseManager()
+
+    @pytest.fixture(autouse=True, scope="function")
+    def connection_fixture(self):
+        with get_session() as session:
+            session.exec(delete(Movie))  # type: ignore
+            session.exec(delete(Series))  # type: ignore
+            for connection_id, arr_type in ((1, ArrType.RADARR), (2, ArrType.SONARR)):
+                if not session.get(Connection, connection_id):
+                    session.add(
+                        Connection(
+                            id=connection_id,
+                            name=arr_type.value,
+                            arr_type=arr_type,
+                            url="http://example.com",
+                            api_key="API_KEY",
+                            monitor=MonitorType.MONITOR_NEW,
+                        )
+                    )
+            session.commit()
+
+    def _create_media(self, titles: list[str]) -> list[tuple[int, bool]]:
+        """Create movies and series with alternating titles, \
+            returns (id, is_movie) for each title."""
+        media_ids: list[tuple[int, bool]] = []
+        for index, title in enumerate(titles):
+            arr_id = index + 1
+            if index % 2 == 0:
+                movie = MovieCreate(
+                    connection_id=1, arr_id=arr_id, title=title, txdb_id=str(arr_id)
+                )
+                result = self.movie_handler.create_or_update_bulk([movie])
+                media_ids.append((result[0][0].id, True))
+            else:
+                series = SeriesCreate(
+                    connection_id=2, arr_id=arr_id, title=title, txdb_id=str(arr_id)
+                )
+                result = self.series_handler.create_or_update_bulk([series])
+                media_ids.append((result[0][0].id, False))
+        return media_ids
+
+    def test_search(self):
+        self._create_media(["Star Wars", "Star Trek", "Stargate", "Dune"])
+        media_list = self.general_handler.search("star")
+        assert {(media["title"], media["is_movie"]) for media in media_list} == {
+            ("Star Wars", True),
+            ("Star Trek", False),
+            ("Stargate", True),
+        }
+        assert self.general_handler.search("dune")[0]["is_movie"] is False
+        assert self.general_handler.search("missing") == []
+
+    def test_read_recently_downloaded(self):
+        media_ids = self._create_media([f"Media {index}" for index in range(5)])
+        downloaded_at = datetime(2024, 1, 1)
+        # Last media is not downloaded
+        for index, (media_id, is_movie) in enumerate(media_ids[:4]):
+            db_handler = self.movie_handler if is_movie else self.series_handler
+            db_handler.update_media_status_bulk(
+                [
+                    MediaUpdateDC(
+                        id=media_id,
+                        monitor=False,
+                        trailer_exists=True,
+                        downloaded_at=downloaded_at + timedelta(days=index),
+                    )
+                ]
+            )
+
+        titles: list[str] = []
+        media_list, cursor = self.general_handler.read_recently_downloaded(limit=3)
+        titles.extend(media["title"] for media in media_list)
+        assert cursor is not None
+        media_list, cursor = self.general_handler.read_recently_downloaded(
+            limit=3, cursor=cursor
+        )
+        titles.extend(media["title"] for media in media_list)
+        assert cursor is None
+        assert titles == ["Media 3", "Media 2", "Media 1", "Media 0"]
+
+    def test_read_recently_downloaded_invalid_cursor(self):
+        with pytest.raises(ValueError):
+            self.general_handler.read_recently_downloaded(cursor="invalid")
@@ -0,0 +1,80 @@
+import pytest
+from sqlmodel import delete
+
+from core.base.database.manager.image import ImageDatabaseManager
+from core.base.database.models.connection import ArrType, Connection, MonitorType
+from core.base.database.models.helpers import ImageSourceDC
+from core.base.database.models.image import ImageSource
+from core.base.database.models.media import MediaUpdate
+from core.base.database.utils.engine import get_session
+from core.radarr.database_manager import MovieDatabaseManager
+from core.radarr.models import Movie, MovieCreate
+
+
+class TestImageDatabaseManager:
+    image_handler = ImageDatabaseManager()
+    movie_handler = MovieDatabaseManager()
+
+    @pytest.fixture(autouse=True, scope="function")
+    def connection_fixture(self):
+        with get_session() as session:
+            session.exec(delete(Movie))  # type: ignore
+            session.exec(delete(ImageSource))  # type: ignore
+            if not session.get(Connection, 1):
+                session.add(
+                    Connection(
+                        id=1,
+                        name="Radarr",
+                        arr_type=ArrType.RADARR,
+                        url="http://example.com",
+                        api_key="API_KEY",
+                        monitor=MonitorType.MONITOR_NEW,
+                    )
+                )
+            session.commit()
+
+    def test_save_and_read_sources(self):
+        self.image_handler.save_sources(
+            {
+                ("http://a.jpg", True): ImageSourceDC("hash_a", '"v1"'),
+                ("http://a.jpg", False): ImageSourceDC("hash_b"),
+            }
+        )
+        self.image_handler.save_sources(
+            {("http://a.jpg", True): ImageSourceDC("hash_c", None, "Wed, 01 Jan 2025")}
+        )
+        image_sources = self.image_handler.read_sources(
+            [("http://a.jpg", True), ("http://a.jpg", False), ("http://b.jpg", True)]
+        )
+        assert {
+            image: (source.content_hash, source.etag, source.last_modified)
+            for image, source in image_sources.items()
+        } == {
+            ("http://a.jpg", True): ("hash_c", None, "Wed, 01 Jan 2025"),
+            ("http://a.jpg", False): ("hash_b", None, None),
+        }
+        self.image_handler.delete_hashes(["hash_c"])
+        assert self.image_handler.read_sources([("http://a.jpg", True)]) == {}
+
+    def test_read_references(self):
+        result = self.movie_handler.create_or_update_bulk(
+            [
+                MovieCreate(
+                    connection_id=1, arr_id=arr_id, title="Movie", txdb_id=str(arr_id)
+                )
+                for arr_id in (1, 2)
+            ]
+        )
+        self.movie_handler.update_bulk(
+            [
+                (
+                    movie_read.id,
+                    MediaUpdate(poster_path="/store/a.jpg", fanart_path="/store/b.jpg"),
+                )
+                for movie_read, _ in result
+            ]
+        )
+        assert self.image_handler.read_references() == {
+            "/store/a.jpg": 2,
+            "/store/b.jpg": 2,
+        }
@@ -0,0 +1,192 @@
+import pytest
+from sqlmodel import delete
+
+from core.base.database.models.connection import ArrType, Connection, MonitorType
+from core.base.database.models.helpers import MediaUpdateDC
+from core.base.database.models.media import MediaUpdate
+from core.base.database.utils.engine import get_session
+from core.radarr.database_manager import MovieDatabaseManager
+from core.radarr.models import Movie, MovieCreate
+from exceptions import ItemNotFoundError
+
+
+def _movie(arr_id: int, title: str, connection_id: int = 1) -> MovieCreate:
+    return MovieCreate(
+        connection_id=connection_id,
+        arr_id=arr_id,
+        title=title,
+        year=2021,
+        txdb_id=f"{arr_id}00",
+    )
+
+
+class TestMediaBulkUpsert:
+    movie_handler = MovieDatabaseManager()
+
+    @pytest.fixture(autouse=True, scope="function")
+    def connection_fixture(self):
+        with get_session() as session:
+            session.exec(delete(Movie))  # type: ignore
+            if not session.get(Connection, 1):
+                session.add(
+                    Connection(
+                        id=1,
+                        name="Radarr",
+                        arr_type=ArrType.RADARR,
+                        url="http://example.com",
+                        api_key="API_KEY",
+                        monitor=MonitorType.MONITOR_NEW,
+                    )
+                )
+            session.commit()
+
+    def test_create_or_update_bulk_creates(self):
+        result = self.movie_handler.create_or_update_bulk(
+            [_movie(1, "Movie 1"), _movie(2, "Movie 2")]
+        )
+        assert [created for _, created in result] == [True, True]
+        assert all(movie_read.id for movie_read, _ in result)
+        assert [movie_read.title for movie_read, _ in result] == ["Movie 1", "Movie 2"]
+
+    def test_create_or_update_bulk_updates(self):
+        first = self.movie_handler.create_or_update_bulk([_movie(1, "Movie 1")])
+        self.movie_handler.update_media_status_bulk(
+            [MediaUpdateDC(id=first[0][0].id, monitor=False, trailer_exists=False)]
+        )
+        result = self.movie_handler.create_or_update_bulk(
+            [_movie(1, "Movie 1 Updated"), _movie(2, "Movie 2")]
+        )
+        assert [created for _, created in result] == [False, True]
+        assert result[0][0].id == first[0][0].id
+        assert self.movie_handler.read(first[0][0].id).title == "Movie 1 Updated"
+
+    def test_create_or_update_bulk_status_pending(self):
+        # Created media are reported as created until their status is updated
+        first = self.movie_handler.create_or_update_bulk([_movie(1, "Movie 1")])
+        result = self.movie_handler.create_or_update_bulk([_movie(1, "Movie 1")])
+        assert [created for _, created in result] == [True]
+        self.movie_handler.update_media_status_bulk(
+            [MediaUpdateDC(id=first[0][0].id, monitor=True, trailer_exists=False)]
+        )
+        result = self.movie_handler.create_or_update_bulk([_movie(1, "Movie 1")])
+        assert [created for _, created in result] == [False]
+
+    def test_create_or_update_bulk_duplicates(self):
+        result = self.movie_handler.create_or_update_bulk(
+            [_movie(1, "Movie 1"), _movie(1, "Movie 1 Again")]
+        )
+        assert result[0][0].id == result[1][0].id
+        assert len(self.movie_handler.read_all()) == 1
+
+    def test_create_or_update_bulk_invalid_connection(self):
+        with pytest.raises(ItemNotFoundError):
+            self.movie_handler.create_or_update_bulk([_movie(1, "Movie 1", 200)])
+
+    def test_update_media_status_bulk(self):
+        result = self.movie_handler.create_or_update_bulk(
+            [_movie(1, "Movie 1"), _movie(2, "Movie 2")]
+        )
+        media_ids = [movie_read.id for movie_read, _ in result]
+        missing_ids = self.movie_handler.update_media_status_bulk(
+            [
+                MediaUpdateDC(id=media_ids[0], monitor=True, trailer_exists=False),
+                MediaUpdateDC(
+                    id=media_ids[1], monitor=False, trailer_exists=True, yt_id="abc"
+                ),
+                MediaUpdateDC(id=9999, monitor=True, trailer_exists=False),
+            ]
+        )
+        assert missing_ids == [9999]
+        movie_1 = self.movie_handler.read(media_ids[0])
+        movie_2 = self.movie_handler.read(media_ids[1])
+        assert movie_1.monitor is True and movie_1.trailer_exists is False
+        assert movie_2.trailer_exists is True
+        assert movie_2.youtube_trailer_id == "abc"
+
+    def test_update_bulk(self):
+        result = self.movie_handler.create_or_update_bulk([_movie(1, "Movie 1")])
+        media_id = result[0][0].id
+        missing_ids = self.movie_handler.update_bulk(
+            [
+                (media_id, MediaUpdate(poster_path="/poster.jpg")),
+                (9999, MediaUpdate(poster_path="/missing.jpg")),
+            ]
+        )
+        assert missing_ids == [9999]
+        assert self.movie_handler.read(media_id).poster_path == "/poster.jpg"
+
+    def test_read_trailer_needed(self):
+        result = self.movie_handler.create_or_update_bulk(
+            [_movie(1, "Movie 1"), _movie(2, "Movie 2"), _movie(3, "Movie 3")]
+        )
+        media_ids = [movie_read.id for movie_read, _ in result]
+        self.movie_handler.update_bulk(
+            [
+                (media_id, MediaUpdate(folder_path=f"/movies/{media_id}"))
+                for media_id in media_ids[:2]
+            ]
+        )
+        self.movie_handler.update_media_status_bulk(
+            [
+                MediaUpdateDC(id=media_ids[0], monitor=True, trailer_exists=False),
+                MediaUpdateDC(id=media_ids[1], monitor=True, trailer_exists=True),
+                MediaUpdateDC(id=media_ids[2], monitor=True, trailer_exists=False),
+            ]
+        )
+        media_list = self.movie_handler.read_trailer_needed()
+        assert [media.id for media in media_list] == [media_ids[0]]
+        assert media_list[0].folder_path == f"/movies/{media_ids[0]}"
+
+    def test_read_images_and_update_paths(self):
+        movie = _movie(1, "Movie 1")
+        movie.poster_url = "http://example.com/poster.jpg"
+        movie.fanart_url = "http://example.com/fanart.jpg"
+        result = self.movie_handler.create_or_update_bulk([movie])
+        media_id = result[0][0].id
+        media_images = self.movie_handler.read_images(recent_only=True)
+        assert [(image.is_poster, image.image_url) for image in media_images] == [
+            (True, "http://example.com/poster.jpg"),
+            (False, "http://example.com/fanart.jpg"),
+        ]
+        media_images[0].image_path = "/images/poster.jpg"
+        media_images[1].image_path = "/images/fanart.jpg"
+        assert self.movie_handler.update_image_paths(media_images) == []
+        movie_read = self.movie_handler.read(media_id)
+        assert movie_read.poster_path == "/images/poster.jpg"
+        assert movie_read.fanart_path == "/images/fanart.jpg"
+
+    def test_search_fts(self):
+        movie_1 = _movie(1, "The Matrix")
+        movie_2 = _movie(2, "Matrix Reloaded")
+        movie_3 = _movie(3, "Inception")
+        movie_3.overview = "A thief who steals corporate secrets through dream-sharing"
+        self.movie_handler.create_or_update_bulk([movie_1, movie_2, movie_3])
+        # Prefix match on title
+        titles = {movie.title for movie in self.movie_handler.search("matr")}
+        assert titles == {"The Matrix", "Matrix Reloaded"}
+        # All words must match, overview is searched too
+        assert [movie.title for movie in self.movie_handler.search("thief dream")] == [
+            "Inception"
+        ]
+        # Index is updated along with the media
+        self.movie_handler.create_or_update_bulk([_movie(3, "Interstellar")])
+        assert [movie.title for movie in self.movie_handler.search("interst")] == [
+            "Interstellar"
+        ]
+        assert self.movie_handler.search("incep") == []
+
+    def test_read_recent_cursor(self):
+        self.movie_handler.create_or_update_bulk(
+            [_movie(arr_id, f"Movie {arr_id}") for arr_id in range(1, 6)]
+        )
+        titles: list[str] = []
+        cursor = None
+        for _ in range(3):
+            media_list = self.movie_handler.read_recent(2, cursor=cursor)
+            titles.extend(movie.title for movie in media_list)
+            cursor = self.movie_handler.get_next_cursor(media_list, 2)
+        assert cursor is None
+        # Newest first, id breaks ties between movies added at the same time
+        assert titles == [f"Movie {arr_id}" for arr_id in range(5, 0, -1)]
+        with pytest.raises(ValueError):
+            self.movie_handler.read_recent(2, cursor="invalid")
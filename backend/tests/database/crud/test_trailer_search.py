@@ -0,0 +1,42 @@
+from datetime import timedelta
+
+import pytest
+from sqlmodel import delete
+
+from core.base.database.manager import trailer_search
+from core.base.database.manager.trailer_search import TrailerSearchDatabaseManager
+from core.base.database.models.trailer_search import TrailerSearch
+from core.base.database.utils.engine import get_session
+
+
+class TestTrailerSearchDatabaseManager:
+    search_handler = TrailerSearchDatabaseManager()
+
+    @pytest.fixture(autouse=True, scope="function")
+    def search_fixture(self):
+        with get_session() as session:
+            session.exec(delete(TrailerSearch))  # type: ignore
+            session.commit()
+
+    def test_save_and_read(self):
+        assert self.search_handler.read("movie:dune:2021") is None
+        self.search_handler.save("movie:dune:2021", ["id_1", "id_2"])
+        self.search_handler.save("movie:missing:", [])
+        assert self.search_handler.read("movie:dune:2021") == ["id_1", "id_2"]
+        # Negative result is cached too
+        assert self.search_handler.read("movie:missing:") == []
+
+    def test_discard(self):
+        self.search_handler.save("movie:dune:2021", ["id_1", "id_2"])
+        self.search_handler.discard("movie:dune:2021", "id_1")
+        assert self.search_handler.read("movie:dune:2021") == ["id_2"]
+        self.search_handler.discard("movie:dune:2021", "id_2")
+        assert self.search_handler.read("movie:dune:2021") == []
+
+    def test_expired(self, monkeypatch):
+        monkeypatch.setattr(trailer_search, "SEARCH_CACHE_TTL", timedelta(hours=-1))
+        self.search_handler.save("movie:dune:2021", ["id_1"])
+        assert self.search_handler.read("movie:dune:2021") is None
+        self.search_handler.delete_expired()
+        with get_session() as session:
+            assert session.get(TrailerSearch, "movie:dune:2021") is None
@@ -0,0 +1,34 @@
+from sqlalchemy import event
+from sqlmodel import create_engine
+
+from core.base.database.utils.engine import (
+    apply_sqlite_pragmas,
+    check_sqlite_pragmas,
+    get_sqlite_pragmas,
+)
+
+
+class TestSQLitePragmas:
+
+    def test_get_sqlite_pragmas(self, monkeypatch):
+        monkeypatch.setattr(
+            "config.settings.app_settings._sqlite_journal_mode", "TRUNCATE"
+        )
+        pragmas = get_sqlite_pragmas()
+        assert pragmas["journal_mode"] == "TRUNCATE"
+        assert pragmas["synchronous"] == "NORMAL"
+
+    def test_apply_and_check_sqlite_pragmas(self, tmp_path):
+        pragmas = get_sqlite_pragmas()
+        db_engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+        event.listen(
+            db_engine,
+            "connect",
+            lambda dbapi_connection, _: apply_sqlite_pragmas(dbapi_connection, pragmas),
+        )
+        current = check_sqlite_pragmas(db_engine, pragmas)
+        db_engine.dispose()
+        assert current["journal_mode"] == "wal"
+        assert current["synchronous"] == 1
+        assert current["busy_timeout"] == pragmas["busy_timeout"]
+        assert current["temp_store"] == 2
@@ -0,0 +1,34 @@
+import threading
+
+import pytest
+
+from core.base.database.utils.executor import run_db, shutdown_db_executor
+from exceptions import ItemNotFoundError
+
+
+def _get_thread_name(prefix: str, *, suffix: str = "") -> str:
+    return f"{prefix}{threading.current_thread().name}{suffix}"
+
+
+def _raise_error():
+    raise ItemNotFoundError("Movie", 1)
+
+
+class TestRunDB:
+
+    @pytest.mark.asyncio
+    async def test_run_db_in_thread_pool(self):
+        result = await run_db(_get_thread_name, "thread: ", suffix="!")
+        assert result.startswith("thread: db_")
+        assert result.endswith("!")
+
+    @pytest.mark.asyncio
+    async def test_run_db_raises(self):
+        with pytest.raises(ItemNotFoundError):
+            await run_db(_raise_error)
+
+    @pytest.mark.asyncio
+    async def test_run_db_after_shutdown(self):
+        await run_db(_get_thread_name, "")
+        shutdown_db_executor()
+        assert (await run_db(_get_thread_name, "")).startswith("db_")
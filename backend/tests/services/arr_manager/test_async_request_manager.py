@@ -1,11 +1,51 @@
+from io import BytesIO
 from unittest.mock import AsyncMock, Mock
 from aiohttp import ClientConnectionError, ServerTimeoutError
 import pytest
 from exceptions import ConnectionTimeoutError, InvalidResponseError
-from core.base.arr_manager.request_manager import AsyncRequestManager
+from core.base.arr_manager.request_manager import (
+    AsyncRequestManager,
+    iter_json_array,
+)
 import tests.conftest as conftest
 
 
+class _ChunkedStream:
+    """Fake stream that returns the data in small chunks"""
+
+    def __init__(self, data: bytes, chunk_size: int):
+        self.data = data
+        self.chunk_size = chunk_size
+
+    async def iter_chunked(self, n: int):
+        stream = BytesIO(self.data)
+        while chunk := stream.read(self.chunk_size):
+            yield chunk
+
+
+class TestIterJsonArray:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("chunk_size", [1, 3, 1024])
+    async def test_iter_json_array(self, chunk_size):
+        data = ' [{"id": 1, "title": "Amélie"}, {"id": 2, "tags": [1, 2]}, 345 ]'
+        stream = _ChunkedStream(data.encode(), chunk_size)
+        items = [item async for item in iter_json_array(stream)]  # type: ignore
+        assert items == [{"id": 1, "title": "Amélie"}, {"id": 2, "tags": [1, 2]}, 345]
+
+    @pytest.mark.asyncio
+    async def test_iter_json_array_empty(self):
+        stream = _ChunkedStream(b"[]", 1)
+        items = [item async for item in iter_json_array(stream)]  # type: ignore
+        assert items == []
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("data", [b'[{"id": 1}, {"id": 2', b'{"id": 1}'])
+    async def test_iter_json_array_invalid(self, data):
+        stream = _ChunkedStream(data, 4)
+        with pytest.raises(InvalidResponseError):
+            [item async for item in iter_json_array(stream)]  # type: ignore
+
+
 class TestAsyncRequestManager:
     # Set up the expected url, path, parameters and data
     url = conftest.TEST_AIOHTTP_URL
@@ -70,6 +110,32 @@ class TestAsyncRequestManager:
         assert e.type == exception_raised
         assert str(e.value) == message
 
+    @pytest.mark.asyncio
+    async def test_request_stream(
+        self, request_manager: AsyncRequestManager, debug_aiohttp
+    ):
+        payload = [{"id": 1}, {"id": 2}]
+        debug_aiohttp.get(self.final_url, status=200, payload=payload)
+        items = [
+            item
+            async for item in request_manager._request_stream(
+                "GET", self.path, self.params
+            )
+        ]
+        assert items == payload
+
+    @pytest.mark.asyncio
+    async def test_request_stream_not_200(
+        self, request_manager: AsyncRequestManager, debug_aiohttp
+    ):
+        debug_aiohttp.get(self.final_url, status=401)
+        with pytest.raises(ConnectionError) as e:
+            async for _ in request_manager._request_stream(
+                "GET", self.path, self.params
+            ):
+                pass
+        assert str(e.value).startswith("Unauthorized.")
+
     @pytest.mark.asyncio
     async def test_process_response_200_json(
         self, request_manager: AsyncRequestManager, debug_aiohttp_200
@@ -0,0 +1,111 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlmodel import delete, select
+
+from core.base.database.models.connection import (
+    ArrType,
+    Connection,
+    ConnectionRead,
+    MonitorType,
+)
+from core.base.database.utils.engine import get_session
+import core.base.connection_manager as connection_manager_module
+from core.radarr.connection_manager import RadarrConnectionManager
+from core.radarr.models import Movie
+from tests import conftest
+
+
+def _movie_data(arr_id: int, title: str) -> dict:
+    return {
+        "id": arr_id,
+        "title": title,
+        "year": 2021,
+        "tmdbId": arr_id * 100,
+        "monitored": True,
+        "images": [],
+        "popularity": 1.5,
+    }
+
+
+class TestRadarrConnectionManager:
+    connection = ConnectionRead(
+        id=1,
+        name="Radarr",
+        arr_type=ArrType.RADARR,
+        url=conftest.TEST_AIOHTTP_URL,
+        api_key=conftest.TEST_AIOHTTP_APIKEY,
+        monitor=MonitorType.MONITOR_MISSING,
+        added_at=datetime.now(timezone.utc),
+    )
+
+    @pytest.fixture(autouse=True, scope="function")
+    def connection_fixture(self):
+        with get_session() as session:
+            session.exec(delete(Movie))  # type: ignore
+            if not session.get(Connection, 1):
+                session.add(Connection.model_validate(self.connection))
+            session.commit()
+
+    def _get_manager(
+        self,
+        media_data: list[dict],
+        fail_after: int | None = None,
+        monitor: MonitorType = MonitorType.MONITOR_MISSING,
+    ) -> RadarrConnectionManager:
+        async def iter_all_media():
+            for index, each_media_data in enumerate(media_data):
+                if index == fail_after:
+                    raise ConnectionError("Connection lost")
+                yield each_media_data
+
+        connection = self.connection.model_copy(update={"monitor": monitor})
+        manager = RadarrConnectionManager(connection)
+        manager.arr_manager.iter_all_media = iter_all_media  # type: ignore
+        return manager
+
+    @pytest.mark.asyncio
+    async def test_refresh_incremental_skips_unchanged(self):
+        media_data = [_movie_data(1, "Movie 1"), _movie_data(2, "Movie 2")]
+        stats = await self._get_manager(media_data).refresh()
+        assert stats.media_count == 2
+        assert stats.skipped_count == 0
+
+        # Keys that are not parsed should not trigger an update
+        media_data[0]["popularity"] = 9.9
+        media_data[1]["title"] = "Movie 2 Updated"
+        stats = await self._get_manager(media_data).refresh()
+        assert stats.media_count == 2
+        assert stats.skipped_count == 1
+
+    @pytest.mark.asyncio
+    async def test_refresh_full_parses_all(self):
+        media_data = [_movie_data(1, "Movie 1"), _movie_data(2, "Movie 2")]
+        await self._get_manager(media_data).refresh()
+        stats = await self._get_manager(media_data).refresh(incremental=False)
+        assert stats.media_count == 2
+        assert stats.skipped_count == 0
+
+    @pytest.mark.asyncio
+    async def test_refresh_stream_error_keeps_media(self):
+        media_data = [_movie_data(1, "Movie 1"), _movie_data(2, "Movie 2")]
+        await self._get_manager(media_data).refresh()
+        # Stream fails after the first media, nothing should be deleted
+        stats = await self._get_manager(media_data, fail_after=1).refresh()
+        assert stats.media_count == 0
+        with get_session() as session:
+            assert len(session.exec(select(Movie)).all()) == 2
+
+    @pytest.mark.asyncio
+    async def test_refresh_stream_error_monitors_new_media_later(self, monkeypatch):
+        # Save each media as it's received, so the first one is saved before the error
+        monkeypatch.setattr(connection_manager_module, "_UPSERT_BATCH_SIZE", 1)
+        media_data = [_movie_data(1, "Movie 1"), _movie_data(2, "Movie 2")]
+        monitor = MonitorType.MONITOR_NEW
+        await self._get_manager(media_data, fail_after=1, monitor=monitor).refresh()
+        stats = await self._get_manager(media_data, monitor=monitor).refresh()
+        assert stats.skipped_count == 0
+        with get_session() as session:
+            movies = session.exec(select(Movie)).all()
+            assert [movie.monitor for movie in movies] == [True, True]
+            assert not any(movie.status_pending for movie in movies)
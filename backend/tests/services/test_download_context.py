@@ -0,0 +1,43 @@
+from core.download.video import DownloadContext
+
+
+class TestDownloadContext:
+    def test_progress_hook(self):
+        updates = []
+        context = DownloadContext("url", on_progress=lambda c: updates.append(c.status))
+        context.progress_hook(
+            {
+                "status": "downloading",
+                "downloaded_bytes": 50,
+                "total_bytes": 200,
+                "_percent_str": "25.0%",
+                "_total_bytes_str": "200B",
+            }
+        )
+        assert context.percent == 25.0
+        context.progress_hook(
+            {
+                "status": "finished",
+                "filename": "/tmp/video.webm",
+                "elapsed": 1.5,
+                "_total_bytes_str": "200B",
+            }
+        )
+        assert context.filepath == "/tmp/video.webm"
+        assert updates == ["downloading", "finished"]
+
+    def test_contexts_are_isolated(self):
+        context_1 = DownloadContext("url_1")
+        context_2 = DownloadContext("url_2")
+        context_1.postprocessor_hook({"postprocessor": "Merger", "status": "started"})
+        context_1.postprocessor_hook(
+            {
+                "postprocessor": "Merger",
+                "status": "finished",
+                "info_dict": {"filepath": "/tmp/video_1.mkv"},
+            }
+        )
+        assert context_1.filepath == "/tmp/video_1.mkv"
+        assert context_1.postprocessors["Merger"].status == "finished"
+        assert context_2.filepath == ""
+        assert context_2.postprocessors == {}
@@ -0,0 +1,54 @@
+import pytest
+from sqlmodel import delete
+
+from core.base.database.manager.download import DownloadQueueDatabaseManager
+from core.base.database.models.download import DownloadQueue
+from core.base.database.utils.engine import get_session
+import core.tasks.download_trailers as download_trailers_module
+from core.tasks.download_trailers import download_trailer_by_id
+
+
+class TestDownloadTrailerById:
+
+    @pytest.fixture(autouse=True)
+    def media_fixture(self, monkeypatch):
+        class MovieDatabaseManager:
+            def read(self, media_id: int):
+                return type(
+                    "MovieRead",
+                    (),
+                    {
+                        "id": media_id,
+                        "title": "Dune",
+                        "year": 2021,
+                        "folder_path": "/movies/Dune",
+                        "youtube_trailer_id": None,
+                    },
+                )
+
+        self.jobs = []
+        monkeypatch.setattr(
+            download_trailers_module, "MovieDatabaseManager", MovieDatabaseManager
+        )
+        monkeypatch.setattr(
+            download_trailers_module.scheduler,
+            "add_job",
+            lambda **kwargs: self.jobs.append(kwargs),
+        )
+        with get_session() as session:
+            session.exec(delete(DownloadQueue))  # type: ignore
+            session.commit()
+
+    def test_download_trailer_by_id_queues_yt_id(self):
+        msg = download_trailer_by_id(1, True, "abc")
+        assert msg.startswith("Trailer download started")
+        queue_items = DownloadQueueDatabaseManager().read_all()
+        assert [item.yt_id for item in queue_items] == ["abc"]
+        assert self.jobs[0]["args"] == (queue_items[0].id, "Dune")
+
+    def test_download_trailer_by_id_in_progress(self):
+        download_trailer_by_id(1, True)
+        assert DownloadQueueDatabaseManager().claim_next() is not None
+        msg = download_trailer_by_id(1, True, "abc")
+        assert msg.startswith("Trailer download already in progress")
+        assert len(self.jobs) == 1
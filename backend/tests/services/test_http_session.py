@@ -0,0 +1,33 @@
+import pytest
+
+from core.base.http_session import close_session, get_session
+from core.tasks.schedules import run_async
+
+
+class TestHTTPSession:
+    @pytest.mark.asyncio
+    async def test_session_reused(self):
+        session = get_session()
+        assert get_session() is session
+        await close_session()
+        assert session.closed
+
+    @pytest.mark.asyncio
+    async def test_session_recreated_after_close(self):
+        session = get_session()
+        await close_session()
+        new_session = get_session()
+        assert new_session is not session
+        assert not new_session.closed
+        await close_session()
+
+    def test_run_async_closes_session_on_error(self):
+        sessions = []
+
+        async def failing_task():
+            sessions.append(get_session())
+            raise ValueError("Task failed")
+
+        with pytest.raises(ValueError):
+            run_async(failing_task)
+        assert sessions[0].closed
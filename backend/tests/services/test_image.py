@@ -0,0 +1,172 @@
+from io import BytesIO
+import os
+
+from aioresponses import aioresponses
+from PIL import Image
+import pytest
+
+from core.base.database.models.helpers import ImageSourceDC, MediaImage
+from core.base.http_session import close_session
+import core.download.image as image_module
+from core.download.image import (
+    FANART,
+    POSTER,
+    download_image,
+    get_store_path,
+    refresh_media_images,
+    remove_unreferenced_images,
+    resize_image,
+    store_image,
+)
+
+
+def _image_bytes(size: tuple[int, int], mode: str = "RGB", format: str = "JPEG"):
+    image_file = BytesIO()
+    Image.new(mode, size, "red").save(image_file, format=format)
+    return image_file.getvalue()
+
+
+class TestImage:
+
+    @pytest.fixture(autouse=True)
+    def store_fixture(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(image_module, "IMAGES_PATH", f"{tmp_path}/")
+        monkeypatch.setattr(image_module, "STORE_PATH", f"{tmp_path}/store/")
+
+    def test_resize_image_jpeg(self, tmp_path):
+        source_path = tmp_path / "fanart.part"
+        source_path.write_bytes(_image_bytes((3840, 2160)))
+        with Image.open(BytesIO(resize_image(str(source_path), FANART))) as image:
+            assert image.format == "JPEG"
+            assert image.size == FANART
+
+    def test_resize_image_png_with_alpha(self, tmp_path):
+        source_path = tmp_path / "poster.part"
+        source_path.write_bytes(_image_bytes((600, 900), "RGBA", "PNG"))
+        with Image.open(BytesIO(resize_image(str(source_path), POSTER))) as image:
+            assert image.format == "JPEG"
+            assert image.mode == "RGB"
+            assert image.size == POSTER
+
+    def test_store_image_deduplicates(self):
+        image_data = _image_bytes((300, 450))
+        content_hash = store_image(image_data)
+        assert store_image(image_data) == content_hash
+        image_path = get_store_path(content_hash)
+        assert os.listdir(os.path.dirname(image_path)) == [f"{content_hash}.jpg"]
+        with open(image_path, "rb") as file:
+            assert file.read() == image_data
+
+    def test_store_image_reuse_updates_mtime(self):
+        image_data = _image_bytes((300, 450))
+        image_path = get_store_path(store_image(image_data))
+        os.utime(image_path, (0, 0))
+        store_image(image_data)
+        # Reused images must not be removed by a concurrent cleanup
+        assert remove_unreferenced_images(set()) == []
+        assert os.path.exists(image_path)
+
+    @pytest.mark.asyncio
+    async def test_download_image_streams_to_file(self, tmp_path):
+        url = "http://example.com/poster.jpg"
+        image_data = _image_bytes((300, 450))
+        file_path = tmp_path / "poster.part"
+        with aioresponses() as mock:
+            mock.get(url, status=200, body=image_data)
+            validators = await download_image(url, str(file_path))
+        await close_session()
+        assert file_path.read_bytes() == image_data
+        assert validators == (None, None)
+
+    @pytest.mark.asyncio
+    async def test_download_image_not_modified(self, tmp_path):
+        url = "http://example.com/poster.jpg"
+        file_path = tmp_path / "poster.part"
+        known_source = ImageSourceDC("hash", '"v1"', "Wed, 01 Jan 2025 00:00:00 GMT")
+        with aioresponses() as mock:
+            mock.get(url, status=304)
+            assert await download_image(url, str(file_path), known_source) is None
+            request = next(iter(mock.requests.values()))[0]
+        await close_session()
+        assert request.kwargs["headers"] == {
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": "Wed, 01 Jan 2025 00:00:00 GMT",
+        }
+        assert not file_path.exists()
+
+    @pytest.mark.asyncio
+    async def test_refresh_media_images_downloads_once(self):
+        url_1 = "http://example.com/poster1.jpg"
+        url_2 = "http://mirror.example.com/poster1.jpg"
+        media_list = [
+            MediaImage(1, True, url_1, None),
+            MediaImage(2, True, url_1, None),
+            MediaImage(3, True, url_2, None),
+        ]
+        image_data = _image_bytes((600, 900))
+        with aioresponses() as mock:
+            # Each URL can only be requested once
+            mock.get(url_1, status=200, body=image_data)
+            mock.get(url_2, status=200, body=image_data)
+            new_sources = await refresh_media_images(media_list, {})
+        await close_session()
+        # Same content from different URLs is stored once
+        assert set(new_sources) == {(url_1, True), (url_2, True)}
+        content_hashes = {source.content_hash for source in new_sources.values()}
+        assert len(content_hashes) == 1
+        image_path = get_store_path(content_hashes.pop())
+        assert all(media.image_path == image_path for media in media_list)
+
+        # Known images are not downloaded again
+        media_list = [MediaImage(4, True, url_1, None)]
+        with aioresponses():
+            assert await refresh_media_images(media_list, new_sources) == {}
+        await close_session()
+        assert media_list[0].image_path == image_path
+
+    @pytest.mark.asyncio
+    async def test_refresh_media_images_revalidates(self):
+        url_1 = "http://example.com/poster1.jpg"
+        url_2 = "http://example.com/poster2.jpg"
+        known_sources = {
+            (url, True): ImageSourceDC(store_image(_image_bytes((300, 450))), '"v1"')
+            for url in (url_1, url_2)
+        }
+        media_list = [
+            MediaImage(1, True, url_1, None),
+            MediaImage(2, True, url_2, None),
+        ]
+        with aioresponses() as mock:
+            mock.get(url_1, status=304)
+            mock.get(
+                url_2,
+                status=200,
+                body=_image_bytes((600, 900), "L"),
+                headers={"ETag": '"v2"'},
+            )
+            new_sources = await refresh_media_images(
+                media_list, known_sources, revalidate=True
+            )
+        await close_session()
+        # Only the changed image is downloaded again
+        assert list(new_sources) == [(url_2, True)]
+        assert new_sources[(url_2, True)].etag == '"v2"'
+        assert media_list[0].image_path == get_store_path(
+            known_sources[(url_1, True)].content_hash
+        )
+        assert media_list[1].image_path == get_store_path(
+            new_sources[(url_2, True)].content_hash
+        )
+
+    def test_remove_unreferenced_images(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(image_module, "_CLEANUP_GRACE_SECONDS", -60)
+        used_hash = store_image(_image_bytes((300, 450)))
+        unused_hash = store_image(_image_bytes((300, 450), "L"))
+        legacy_path = tmp_path / "movies" / "posters" / "legacy.jpg"
+        legacy_path.parent.mkdir(parents=True)
+        legacy_path.write_bytes(b"legacy")
+        removed_hashes = remove_unreferenced_images({get_store_path(used_hash)})
+        assert removed_hashes == [unused_hash]
+        assert os.path.exists(get_store_path(used_hash))
+        assert not os.path.exists(get_store_path(unused_hash))
+        assert not legacy_path.exists()
@@ -0,0 +1,79 @@
+import errno
+import os
+import time
+
+import core.download.staging as staging_module
+from core.download.staging import (
+    _get_filesystem_root,
+    get_staging_dir,
+    place_file,
+    remove_stale_files,
+)
+
+
+class TestStaging:
+
+    def test_get_staging_dir_same_filesystem(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(
+            staging_module.tempfile, "gettempdir", lambda: str(tmp_path)
+        )
+        # Media folder doesn't need to exist yet
+        assert get_staging_dir(str(tmp_path / "Movies" / "Movie (2021)")) == str(
+            tmp_path
+        )
+
+    def test_get_filesystem_root(self, tmp_path):
+        root = _get_filesystem_root(str(tmp_path))
+        assert str(tmp_path).startswith(root)
+        assert os.stat(root).st_dev == os.stat(tmp_path).st_dev
+        parent = os.path.dirname(root)
+        assert parent == root or os.stat(parent).st_dev != os.stat(root).st_dev
+
+    def test_place_file(self, tmp_path):
+        src_path = tmp_path / "movie-1-trailer.mkv"
+        src_path.write_text("trailer")
+        dst_path = tmp_path / "Movie - Trailer-trailer.mkv"
+        place_file(str(src_path), str(dst_path))
+        assert not src_path.exists()
+        assert dst_path.read_text() == "trailer"
+
+    def test_place_file_other_filesystem(self, tmp_path, monkeypatch):
+        src_path = tmp_path / "movie-1-trailer.mkv"
+        src_path.write_text("trailer")
+        dst_folder = tmp_path / "Movie"
+        dst_folder.mkdir()
+        os_replace = os.replace
+
+        def replace(src: str, dst: str):
+            # Fail the first rename, like it's across filesystems
+            if src == str(src_path):
+                raise OSError(errno.EXDEV, "Invalid cross-device link")
+            os_replace(src, dst)
+
+        monkeypatch.setattr(staging_module.os, "replace", replace)
+        place_file(str(src_path), str(dst_folder / "Movie - Trailer-trailer.mkv"))
+        assert not src_path.exists()
+        assert os.listdir(dst_folder) == ["Movie - Trailer-trailer.mkv"]
+
+    def test_remove_stale_files(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(staging_module.tempfile, "gettempdir", lambda: "/none")
+        old_time = time.time() - staging_module.STALE_FILE_AGE - 60
+        stale_path = tmp_path / "movie-1-trailer.f137.mp4.part"
+        stale_path.write_text("partial")
+        os.utime(stale_path, (old_time, old_time))
+        active_path = tmp_path / "movie-2-trailer.mp4.part"
+        active_path.write_text("partial")
+        assert remove_stale_files(str(tmp_path)) == 1
+        assert not stale_path.exists()
+        assert active_path.exists()
+
+    def test_remove_stale_files_temp_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(
+            staging_module.tempfile, "gettempdir", lambda: str(tmp_path)
+        )
+        old_time = time.time() - staging_module.STALE_FILE_AGE - 60
+        for name in ("series-1-trailer.webm.part", "other-app.tmp"):
+            (tmp_path / name).write_text("partial")
+            os.utime(tmp_path / name, (old_time, old_time))
+        assert remove_stale_files(str(tmp_path)) == 1
+        assert os.listdir(tmp_path) == ["other-app.tmp"]
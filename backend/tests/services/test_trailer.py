@@ -0,0 +1,130 @@
+import pytest
+from sqlmodel import delete
+
+from core.base.database.models.trailer_search import TrailerSearch
+from core.base.database.utils.engine import get_session
+import core.download.trailer as trailer_module
+from core.base.database.manager.trailer_search import TrailerSearchDatabaseManager
+from core.base.database.models.helpers import MediaTrailer
+from core.download.trailer import (
+    _get_search_key,
+    _is_video_unavailable,
+    _rank_search_results,
+    _search_yt_for_trailer,
+    download_trailer,
+)
+from core.download.video import DownloadContext
+
+
+class TestTrailerSearch:
+
+    @pytest.fixture(autouse=True)
+    def search_fixture(self, monkeypatch):
+        with get_session() as session:
+            session.exec(delete(TrailerSearch))  # type: ignore
+            session.commit()
+        self.search_count = 0
+
+        def search_youtube(title: str, is_movie: bool, year: int | None = None):
+            self.search_count += 1
+            return ["id_1", "id_2"] if title != "Missing" else []
+
+        monkeypatch.setattr(trailer_module, "_search_youtube", search_youtube)
+
+    def test_get_search_key(self):
+        assert _get_search_key("Spider-Man: No Way Home", True, 2021) == (
+            "movie:spider man no way home:2021"
+        )
+        assert _get_search_key(" spider man  no way home ", True, 2021) == (
+            "movie:spider man no way home:2021"
+        )
+        assert _get_search_key("Dark", False) == "series:dark:"
+
+    def test_search_cached(self):
+        assert _search_yt_for_trailer("Dune", True, 2021) == "id_1"
+        # Retry picks the next candidate without searching again
+        assert _search_yt_for_trailer("Dune", True, 2021, ["id_1"]) == "id_2"
+        assert _search_yt_for_trailer("Dune", True, 2021, ["id_1", "id_2"]) is None
+        assert self.search_count == 1
+
+    def test_search_negative_cached(self):
+        assert _search_yt_for_trailer("Missing", True) is None
+        assert _search_yt_for_trailer("Missing", True) is None
+        assert self.search_count == 1
+
+    def test_rank_search_results(self):
+        results = [
+            {
+                "id": "review",
+                "title": "Dune Trailer Reaction & Review",
+                "duration": 1200,
+            },
+            {"id": "long", "title": "Dune (2021) - Full Interview", "duration": 3600},
+            {"id": "other", "title": "Dune Part Two Trailer", "duration": 150},
+            {
+                "id": "official",
+                "title": "DUNE | Official Trailer (2021)",
+                "duration": 180,
+                "channel": "Warner Bros. Pictures",
+                "channel_is_verified": True,
+            },
+            {"id": "teaser", "title": "Dune - Teaser", "duration": None},
+            None,
+        ]
+        assert _rank_search_results(results, "Dune", 2021) == [
+            "official",
+            "other",
+            "teaser",
+            "long",
+            "review",
+        ]
+
+    def test_rank_search_results_keywords_whole_words(self):
+        results = [
+            {"id": "preview", "title": "Dune: Part Two | Official Preview"},
+            {"id": "review", "title": "Dune: Part Two Review"},
+        ]
+        assert _rank_search_results(results, "Dune: Part Two") == ["preview", "review"]
+        # Keywords in the media title are not penalized
+        results = [
+            {"id": "trailer", "title": "Chain Reaction (1996) Official Trailer"},
+            {"id": "other", "title": "Chain Trailer"},
+        ]
+        assert _rank_search_results(results, "Chain Reaction", 1996) == [
+            "trailer",
+            "other",
+        ]
+
+    def test_is_video_unavailable(self):
+        assert _is_video_unavailable("ERROR: [youtube] id_1: Video unavailable")
+        assert _is_video_unavailable(
+            "ERROR: [youtube] id_1: Private video. Sign in if you've been granted access"
+        )
+        assert _is_video_unavailable(
+            "ERROR: [youtube] id_1: Sign in to confirm your age."
+        )
+        assert not _is_video_unavailable(
+            "ERROR: [youtube] id_1: Sign in to confirm you’re not a bot."
+        )
+        assert not _is_video_unavailable("ERROR: unable to download video data: 503")
+        assert not _is_video_unavailable("")
+
+    @pytest.mark.parametrize(
+        "error, cached_ids",
+        [
+            ("ERROR: [youtube] id_1: Video unavailable", ["id_2"]),
+            ("ERROR: unable to download video data: HTTP Error 429", ["id_1", "id_2"]),
+        ],
+    )
+    def test_download_trailer_discards_unavailable(
+        self, error, cached_ids, tmp_path, monkeypatch
+    ):
+        def download_video(url: str, file_path: str, context: DownloadContext):
+            context.error = error
+            return ""
+
+        monkeypatch.setattr(trailer_module, "download_video", download_video)
+        media = MediaTrailer(1, "Dune", 2021, None, str(tmp_path))
+        assert download_trailer(media, True, retry_count=0) is None
+        search_key = _get_search_key("Dune", True, 2021)
+        assert TrailerSearchDatabaseManager().read(search_key) == cached_ids
@@ -0,0 +1,63 @@
+import pytest
+
+from config.settings import app_settings
+import core.download.transcode as transcode_module
+from core.download.transcode import (
+    _get_priority_command,
+    run_ffmpeg,
+    shutdown_transcode_executor,
+    submit_transcode,
+)
+
+
+class TestTranscode:
+
+    @pytest.fixture(autouse=True)
+    def ffmpeg_fixture(self, tmp_path, monkeypatch):
+        # Fake ffmpeg, writes its arguments to the output file (last argument)
+        ffmpeg_path = tmp_path / "ffmpeg"
+        ffmpeg_path.write_text(
+            '#!/bin/sh\nfor arg; do out="$arg"; done\necho "$@" > "$out"\n'
+        )
+        ffmpeg_path.chmod(0o755)
+        monkeypatch.setattr(transcode_module, "FFMPEG_PATH", str(ffmpeg_path))
+        monkeypatch.setattr(app_settings, "_transcode_threads", 2)
+        monkeypatch.setattr(app_settings, "_transcode_nice", 10)
+        monkeypatch.setattr(app_settings, "_transcode_ionice_class", 2)
+        monkeypatch.setattr(app_settings, "_transcode_ionice_level", 7)
+        yield
+        shutdown_transcode_executor()
+
+    def test_get_priority_command(self, monkeypatch):
+        command = _get_priority_command()
+        assert command[1:3] == ["-n", "10"]
+        assert command[4:] == ["-c", "2", "-n", "7"]
+        monkeypatch.setattr(app_settings, "_transcode_nice", 0)
+        monkeypatch.setattr(app_settings, "_transcode_ionice_class", 3)
+        assert _get_priority_command()[1:] == ["-c", "3"]
+
+    def test_remux_without_priority(self, tmp_path):
+        video_path = tmp_path / "video.mp4"
+        video_path.write_text("video")
+        assert run_ffmpeg(str(video_path), ["-c", "copy"], transcode=False)
+        arguments = video_path.read_text().split()
+        assert arguments[-3:-1] == ["-c", "copy"]
+        assert "-threads" not in arguments
+        assert not (tmp_path / "video.temp.mp4").exists()
+
+    def test_submit_transcode(self, tmp_path):
+        video_path = tmp_path / "video.mp4"
+        video_path.write_text("video")
+        future = submit_transcode(
+            run_ffmpeg, str(video_path), ["-c:v", "libx264"], transcode=True
+        )
+        assert future.result()
+        arguments = video_path.read_text().split()
+        assert arguments[-5:-1] == ["-c:v", "libx264", "-threads", "2"]
+
+    def test_run_ffmpeg_failed(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(transcode_module, "FFMPEG_PATH", "/bin/false")
+        video_path = tmp_path / "video.mp4"
+        video_path.write_text("video")
+        assert not run_ffmpeg(str(video_path), ["-c", "copy"], transcode=False)
+        assert video_path.read_text() == "video"
@@ -0,0 +1,49 @@
+import pytest
+
+from config.settings import app_settings
+from core.download.video import (
+    _get_convert_options,
+    _get_format_sort,
+    _needs_transcode,
+)
+
+
+class TestVideoConvert:
+
+    @pytest.fixture(autouse=True)
+    def settings_fixture(self, monkeypatch):
+        # Set private attributes, setters would save the settings to .env file
+        monkeypatch.setattr(app_settings, "_trailer_resolution", 1080)
+        monkeypatch.setattr(app_settings, "_trailer_video_format", "h264")
+        monkeypatch.setattr(app_settings, "_trailer_audio_format", "aac")
+        monkeypatch.setattr(app_settings, "_trailer_web_optimized", False)
+
+    def test_get_format_sort(self):
+        assert _get_format_sort() == ["res:1080", "vcodec:h264", "acodec:aac"]
+
+    def test_remux_when_codecs_match(self):
+        assert not _needs_transcode("avc1.640028", "mp4a.40.2")
+        assert _get_convert_options("avc1.640028", "mp4a.40.2") == [
+            "-c:v",
+            "copy",
+            "-c:a",
+            "copy",
+        ]
+
+    def test_transcode_only_mismatched_streams(self):
+        assert _needs_transcode("avc1.640028", "opus")
+        assert _get_convert_options("avc1.640028", "opus") == [
+            "-c:v",
+            "copy",
+            "-c:a",
+            "aac",
+            "-b:a",
+            "128k",
+        ]
+        assert _get_convert_options("vp09.00.40.08", None)[:2] == ["-c:v", "libx264"]
+
+    def test_web_optimized(self, monkeypatch):
+        monkeypatch.setattr(app_settings, "_trailer_web_optimized", True)
+        options = _get_convert_options("avc1.640028", "mp4a.40.2")
+        assert options[-2:] == ["-movflags", "+faststart"]
+        assert "-tune" not in options
@@ -7,6 +7,7 @@ export interface ScheduledTask {
     last_run_duration: number;
     last_run_start: Date;
     last_run_status: string;
+    last_run_details: { [key: string]: any }[];
     next_run: Date;
 }
 